@@ -0,0 +1,102 @@
+# bench/bench_distribution.py
+#
+# Score distributions: markmentum.distribution (np.digitize + one bincount for
+# the universe and every category) vs reading the five Score_Bin,TickerCount
+# exports, and vs pd.cut + value_counts per category on a synthetic universe
+# of --size rows. Checks that every binned card equals its export. Builds
+# data/_facts first if it is missing or stale.
+#   python bench/bench_distribution.py [--size 1000000] [--rounds 20]
+
+import argparse
+import statistics
+import sys
+import time
+from pathlib import Path
+
+APP_DIR = Path(__file__).resolve().parent.parent
+DATA_DIR = APP_DIR / "data"
+sys.path.insert(0, str(APP_DIR))
+
+import numpy as np  # noqa: E402
+import pandas as pd  # noqa: E402
+
+from markmentum import distribution, facts, registry  # noqa: E402
+from markmentum.snapshot import snapshot_version  # noqa: E402
+from markmentum.store import read_table  # noqa: E402
+
+
+# -------------------------
+# Timing
+# -------------------------
+def _ms(fn, rounds: int) -> float:
+    times = []
+    for _ in range(rounds):
+        t0 = time.perf_counter()
+        fn()
+        times.append((time.perf_counter() - t0) * 1e3)
+    return statistics.median(times)
+
+def bench_cards(snapshot: str, rounds: int) -> None:
+    ids = list(distribution.DISTRIBUTIONS)
+    for n in ids:
+        old = read_table(DATA_DIR / f"qry_graph_data_{n}.csv")
+        assert old.equals(distribution.distribution(n, DATA_DIR, snapshot)), f"card {n} differs"
+    t_old = _ms(lambda: [read_table(DATA_DIR / f"qry_graph_data_{n}.csv") for n in ids], rounds)
+    t_cold = _ms(lambda: [distribution.bin_table.__wrapped__(m, DATA_DIR, snapshot)
+                          for m in distribution.DISTRIBUTIONS.values()], rounds)
+    t_warm = _ms(lambda: [distribution.distribution(n, DATA_DIR, snapshot) for n in ids], rounds)
+    print(f"{len(ids)} cards   exports {t_old:>7.2f} ms   binned cold {t_cold:>7.2f} ms   warm {t_warm:>6.2f} ms"
+          f"   (cold includes every category)")
+
+def bench_categories(size: int, rounds: int) -> None:
+    rng = np.random.default_rng(0)
+    values = np.round(rng.normal(0.0, 60.0, size))
+    cats = pd.Categorical(rng.integers(0, 40, size).astype(str))
+    frame = pd.DataFrame({"Category": cats, "v": values})
+    edges = [-np.inf, *distribution.SCORE_EDGES, np.inf]
+
+    def legacy():
+        out = {}
+        for c in frame["Category"].cat.categories:
+            sub = frame.loc[frame["Category"] == c, "v"]
+            out[c] = pd.cut(sub, edges, right=False, labels=distribution.SCORE_BINS).value_counts(sort=False)
+        return out
+
+    def binned():
+        nb = len(distribution.SCORE_BINS)
+        codes = frame["Category"].cat.codes.to_numpy().astype(np.intp)
+        flat = np.bincount(codes * nb + np.digitize(values, distribution.SCORE_EDGES), minlength=40 * nb)
+        return flat.reshape(-1, nb)
+
+    old = legacy()
+    new = binned()
+    for i, c in enumerate(frame["Category"].cat.categories):
+        assert (old[c].to_numpy() == new[i]).all(), f"category {c} differs"
+    t_old, t_new = _ms(legacy, rounds), _ms(binned, rounds)
+    print(f"synthetic {size:,} rows × 40 categories   cut+value_counts {t_old:>8.2f} ms   "
+          f"bincount {t_new:>7.2f} ms   {t_old / t_new:>5.1f}x")
+
+
+def main() -> int:
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--size", type=int, default=1_000_000)
+    ap.add_argument("--rounds", type=int, default=20)
+    args = ap.parse_args()
+
+    # outside `streamlit run` st.cache_resource hands out a new registry per call: pin one
+    reg = registry.FrameRegistry(1 << 30)
+    registry.get_registry = lambda: reg
+
+    snapshot = snapshot_version(DATA_DIR)
+    if facts.read_facts(DATA_DIR, snapshot, []) is None:
+        t0 = time.perf_counter()
+        n_t, n_c = facts.write_facts(DATA_DIR)
+        print(f"built facts: {n_t} tickers × {n_c} columns in {(time.perf_counter() - t0) * 1e3:.0f} ms")
+
+    bench_cards(snapshot, args.rounds)
+    bench_categories(args.size, max(3, args.rounds // 4))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,98 @@
+# bench/bench_facts.py
+#
+# Cross-sectional page loads: one projection of the latest-snapshot fact table
+# (markmentum.facts) vs what the Sharpe Rank / Markmentum / Directional Trends /
+# Performance pages did per cache miss – read 1–4 exports, sort + drop_duplicates
+# to the latest row per ticker, and merge the WTD / MTD / QTD files on Ticker.
+# Builds data/_facts first if it is missing or stale.
+#   python bench/bench_facts.py [--rounds 20]
+
+import argparse
+import statistics
+import sys
+import time
+from pathlib import Path
+
+APP_DIR = Path(__file__).resolve().parent.parent
+DATA_DIR = APP_DIR / "data"
+sys.path.insert(0, str(APP_DIR))
+
+import pandas as pd  # noqa: E402
+
+from markmentum import facts  # noqa: E402
+from markmentum.snapshot import snapshot_version  # noqa: E402
+from markmentum.store import read_table  # noqa: E402
+
+# page -> (base export, base columns, [(delta export, delta column), ...])
+PAGES = {
+    "sharpe rank": ("qry_graph_data_48.csv",
+                    ["Ticker", "Ticker_name", "Category", "Date", "Sharpe_Rank", "previous_Sharpe_Rank",
+                     "Sharpe_Rank_daily_change"],
+                    [("qry_graph_data_49.csv", "Sharpe_Rank_wtd_change"),
+                     ("qry_graph_data_50.csv", "Sharpe_Rank_mtd_change"),
+                     ("qry_graph_data_51.csv", "Sharpe_Rank_qtd_change")]),
+    "markmentum":  ("model_score_day_change.csv",
+                    ["Ticker", "Ticker_name", "Category", "Date", "model_score", "previous_model_score",
+                     "model_score_daily_change"],
+                    [("model_score_wtd_change.csv", "model_score_wtd_change"),
+                     ("model_score_mtd_change.csv", "model_score_mtd_change"),
+                     ("model_score_qtd_change.csv", "model_score_qtd_change")]),
+    "trends":      ("qry_graph_data_88.csv",
+                    ["Date", "Ticker", "Ticker_name", "Category", "st_trend", "mt_trend", "lt_trend",
+                     "st_trend_change", "mt_trend_change", "lt_trend_change"], []),
+    "performance": ("ticker_data.csv",
+                    ["Ticker", "Ticker_name", "Category", "Date", "Close", "day_pct_change", "week_pct_change",
+                     "month_pct_change", "quarter_pct_change"], []),
+}
+
+
+# -------------------------
+# Previous page code
+# -------------------------
+def legacy(base: str, cols: list[str], deltas: list) -> pd.DataFrame:
+    df = read_table(DATA_DIR / base, columns=cols)
+    df["_dt"] = pd.to_datetime(df["Date"], errors="coerce")
+    df = df.sort_values(["Ticker", "_dt"], ascending=[True, False]).drop_duplicates(subset=["Ticker"], keep="first")
+    for name, col in deltas:
+        add = read_table(DATA_DIR / name, columns=["Ticker", col])
+        add[col] = pd.to_numeric(add[col], errors="coerce")
+        df = df.merge(add.drop_duplicates("Ticker", keep="first"), on="Ticker", how="left")
+    return df
+
+
+# -------------------------
+# Timing
+# -------------------------
+def _ms(fn, rounds: int) -> float:
+    times = []
+    for _ in range(rounds):
+        t0 = time.perf_counter()
+        fn()
+        times.append((time.perf_counter() - t0) * 1e3)
+    return statistics.median(times)
+
+
+def main() -> int:
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--rounds", type=int, default=20)
+    args = ap.parse_args()
+
+    snapshot = snapshot_version(DATA_DIR)
+    if facts.read_facts(DATA_DIR, snapshot, []) is None:
+        t0 = time.perf_counter()
+        n_t, n_c = facts.write_facts(DATA_DIR)
+        print(f"built facts: {n_t} tickers × {n_c} columns in {(time.perf_counter() - t0) * 1e3:.0f} ms")
+
+    for page, (base, cols, deltas) in PAGES.items():
+        want = [*cols[1:], *(c for _, c in deltas)]
+        old = legacy(base, cols, deltas)
+        new = facts.read_facts(DATA_DIR, snapshot, want)
+        assert len(old) == len(new), f"{page}: {len(old)} vs {len(new)} tickers"
+        t_old = _ms(lambda: legacy(base, cols, deltas), args.rounds)
+        t_new = _ms(lambda: facts.read_facts(DATA_DIR, snapshot, want), args.rounds)
+        print(f"{page:<12} {1 + len(deltas)} exports {t_old:>8.2f} ms   facts {t_new:>7.2f} ms   {t_old / t_new:>5.1f}x")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,153 @@
+# bench/bench_heatmap.py
+#
+# Per-ticker heatmap on the Performance / Sharpe Rank / Markmentum pages:
+# markmentum.heatmap (vectorised melt + robust scales + normalise, cached per
+# snapshot, one cached spec per category) vs the previous page code, which
+# melted the universe, took groupby().apply robust scales, normalised the
+# category with apply(axis=1) and rebuilt the Altair chart on every rerun.
+# "switch" is a category change on a warm cache. Checks that both give the
+# same normalised cells. Runs on today's universe and on --size rows.
+#   python bench/bench_heatmap.py [--size 20000] [--rounds 10]
+
+import argparse
+import statistics
+import sys
+import time
+from pathlib import Path
+
+APP_DIR = Path(__file__).resolve().parent.parent
+DATA_DIR = APP_DIR / "data"
+sys.path.insert(0, str(APP_DIR))
+
+import altair as alt  # noqa: E402
+import numpy as np  # noqa: E402
+import pandas as pd  # noqa: E402
+
+from markmentum import heatmap  # noqa: E402
+from markmentum.registry import FrameRegistry  # noqa: E402
+from markmentum.store import read_table  # noqa: E402
+
+PERF_TF = {"day_pct_change": "Daily", "week_pct_change": "WTD",
+           "month_pct_change": "MTD", "quarter_pct_change": "QTD"}
+TOOLTIP = [alt.Tooltip("Ticker:N"), alt.Tooltip("Timeframe:N"), alt.Tooltip("Pct:Q", title="% Δ", format=",.2f")]
+
+
+# -------------------------
+# Inputs
+# -------------------------
+def today() -> pd.DataFrame:
+    df = read_table(DATA_DIR / "ticker_data.csv", columns=["Ticker", "Ticker_name", "Category", *PERF_TF])
+    for c in PERF_TF:
+        df[c] = pd.to_numeric(df[c], errors="coerce") * 100.0
+    return df
+
+def scaled(df: pd.DataFrame, size: int) -> pd.DataFrame:
+    # more categories of today's size (Altair caps a chart at 5,000 rows)
+    reps = -(-size // len(df))
+    out = pd.concat([df] * reps, ignore_index=True).iloc[:size].copy()
+    rep = (out.index // len(df)).astype(str)
+    out["Ticker"] = out["Ticker"].astype(str) + rep
+    out["Category"] = out["Category"].astype(str) + rep
+    return out
+
+
+# -------------------------
+# Previous page code
+# -------------------------
+def _robust_vmax(series, q=0.98, floor=1.0, step=1.0):
+    s = pd.to_numeric(series, errors="coerce").abs().dropna()
+    if s.empty:
+        return floor
+    vmax = float(np.quantile(s, q))
+    return max(floor, np.ceil(vmax / step) * step)
+
+def legacy(perf: pd.DataFrame, sel: str) -> tuple[pd.DataFrame, dict]:
+    tlong_all = perf.melt(id_vars=["Ticker", "Ticker_name", "Category"], value_vars=list(PERF_TF),
+                          var_name="tf_raw", value_name="Pct")
+    tlong_all["Timeframe"] = tlong_all["tf_raw"].map(PERF_TF)
+    tlong_all.drop(columns=["tf_raw"], inplace=True)
+    vmax_univ_tf = tlong_all.groupby("Timeframe")["Pct"].apply(_robust_vmax).to_dict()
+    tlong_sel = tlong_all.loc[tlong_all["Category"] == sel].copy()
+    tickers_order = sorted(tlong_sel["Ticker"].dropna().unique().tolist())
+    tlong_sel["norm"] = tlong_sel.apply(
+        lambda r: np.clip(r["Pct"] / (vmax_univ_tf.get(r["Timeframe"], 1.0) or 1.0), -1, 1), axis=1)
+    spec = (alt.Chart(tlong_sel).mark_rect()
+            .encode(x=alt.X("Timeframe:N", sort=list(PERF_TF.values())), y=alt.Y("Ticker:N", sort=tickers_order),
+                    color=alt.Color("norm:Q", scale=alt.Scale(scheme="blueorange", domain=[-1, 0, 1])),
+                    tooltip=TOOLTIP)
+            .properties(width=420, height=max(360, 22 * len(tickers_order) + 24)).to_dict())
+    return tlong_sel, spec
+
+
+# -------------------------
+# markmentum.heatmap
+# -------------------------
+def universe(perf: pd.DataFrame) -> pd.DataFrame:
+    tlong = heatmap.melt(perf, ["Ticker", "Ticker_name", "Category"], PERF_TF, PERF_TF.values(), value_name="Pct")
+    tlong["norm"] = heatmap.normalize(tlong, heatmap.robust_scales(perf, PERF_TF, PERF_TF.values()), "Pct")
+    return tlong
+
+def engine(reg: FrameRegistry, perf: pd.DataFrame, sel: str, snapshot: str):
+    def build():
+        tlong_all = reg.get(("heatmap", "bench", "universe", snapshot), lambda: universe(perf), snapshot=snapshot)
+        tlong_sel = tlong_all.loc[tlong_all["Category"].to_numpy() == sel]
+        tickers_order = sorted(tlong_sel["Ticker"].dropna().unique().tolist())
+        return tlong_sel, heatmap.heatmap_spec(
+            tlong_sel, y="Ticker", y_sort=tickers_order, x_sort=PERF_TF.values(), legend_title="",
+            tooltip=TOOLTIP, width=420, height=max(360, 22 * len(tickers_order) + 24))
+    return reg.get(("heatmap", "bench", ("category", sel), snapshot), build, snapshot=snapshot)
+
+
+# -------------------------
+# Timing
+# -------------------------
+def _check(perf: pd.DataFrame, sel: str) -> None:
+    old, _ = legacy(perf, sel)
+    new, _ = engine(FrameRegistry(1 << 30), perf, sel, "check")
+    a = old.sort_values(["Ticker", "Timeframe"])["norm"].to_numpy(dtype=float)
+    b = new.assign(Timeframe=new["Timeframe"].astype(str)).sort_values(["Ticker", "Timeframe"])["norm"].to_numpy()
+    assert np.allclose(a, b, equal_nan=True), "normalised cells differ"
+
+def _ms(fn, rounds: int) -> float:
+    times = []
+    for _ in range(rounds):
+        t0 = time.perf_counter()
+        fn()
+        times.append((time.perf_counter() - t0) * 1e3)
+    return statistics.median(times)
+
+def bench(label: str, perf: pd.DataFrame, rounds: int) -> None:
+    cats = perf["Category"].dropna().unique().tolist()
+    _check(perf, cats[0])
+    print(f"{label}: {len(perf):,} tickers, {len(cats)} categories")
+
+    t_old = _ms(lambda: [legacy(perf, c) for c in cats], rounds) / len(cats)
+
+    def cold():
+        # empty registry: the universe and every spec are rebuilt
+        reg = FrameRegistry(1 << 30)
+        for c in cats:
+            engine(reg, perf, c, "cold")
+    t_cold = _ms(cold, rounds) / len(cats)
+    warm = FrameRegistry(1 << 30)
+    for c in cats:
+        engine(warm, perf, c, "warm")
+    t_warm = _ms(lambda: [engine(warm, perf, c, "warm") for c in cats], rounds) / len(cats)
+    print(f"  per category   previous {t_old:>9.2f} ms   engine cold {t_cold:>8.2f} ms   "
+          f"switch {t_warm * 1e3:>8.1f} µs   {t_old / t_cold:>5.1f}x cold")
+
+
+def main() -> int:
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--size", type=int, default=20_000)
+    ap.add_argument("--rounds", type=int, default=10)
+    args = ap.parse_args()
+
+    perf = today()
+    bench("today", perf, args.rounds)
+    bench("synthetic", scaled(perf, args.size), max(2, args.rounds // 4))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,94 @@
+# bench/bench_leaders.py
+#
+# Leader / laggard boards: markmentum.leaders (np.argpartition top-k over the
+# fact table, memoised per snapshot) vs reading the pre-exported 10-row CSV
+# for every board, and top_k() vs a full stable sort + head on a synthetic
+# universe of --size rows. Checks that every universe board picks the same
+# tickers as its export. Builds data/_facts first if it is missing or stale.
+#   python bench/bench_leaders.py [--size 1000000] [--rounds 20]
+
+import argparse
+import statistics
+import sys
+import time
+from pathlib import Path
+
+APP_DIR = Path(__file__).resolve().parent.parent
+DATA_DIR = APP_DIR / "data"
+sys.path.insert(0, str(APP_DIR))
+
+import numpy as np  # noqa: E402
+import pandas as pd  # noqa: E402
+
+from markmentum import facts, leaders, registry  # noqa: E402
+from markmentum.snapshot import snapshot_version  # noqa: E402
+from markmentum.store import read_table  # noqa: E402
+
+
+# -------------------------
+# Timing
+# -------------------------
+def _ms(fn, rounds: int) -> float:
+    times = []
+    for _ in range(rounds):
+        t0 = time.perf_counter()
+        fn()
+        times.append((time.perf_counter() - t0) * 1e3)
+    return statistics.median(times)
+
+def _check(ids, snapshot: str) -> None:
+    for n in ids:
+        old = read_table(DATA_DIR / f"qry_graph_data_{n}.csv")
+        new = leaders.board(n, DATA_DIR, snapshot)
+        assert list(old["Ticker"]) == list(new["Ticker"]), f"board {n}: tickers differ"
+
+def bench_boards(snapshot: str, rounds: int) -> None:
+    ids = [n for n, b in leaders.BOARDS.items()
+           if not b.ends and (DATA_DIR / f"qry_graph_data_{n}.csv").exists()]
+    _check(ids, snapshot)
+    t_old = _ms(lambda: [read_table(DATA_DIR / f"qry_graph_data_{n}.csv") for n in ids], rounds)
+    # cold = every board cut again from the memoised universe, warm = registry hit
+    t_cold = _ms(lambda: [leaders.board.__wrapped__(n, DATA_DIR, snapshot) for n in ids], rounds)
+    t_warm = _ms(lambda: [leaders.board(n, DATA_DIR, snapshot) for n in ids], rounds)
+    cats = facts.load_facts(DATA_DIR, snapshot, ["Category"])["Category"].dropna().unique().tolist()
+    t_cat = _ms(lambda: [leaders.board.__wrapped__(26, DATA_DIR, snapshot, 5, c) for c in cats], rounds) / len(cats)
+    print(f"{len(ids)} universe boards   exports {t_old:>8.2f} ms   engine cold {t_cold:>8.2f} ms   "
+          f"warm {t_warm:>6.2f} ms")
+    print(f"  top 5 by category (cold, not exported)   {t_cat:>7.2f} ms per category")
+
+def bench_top_k(size: int, rounds: int, k: int = 10) -> None:
+    rng = np.random.default_rng(0)
+    values = np.round(rng.normal(0.0, 0.05, size), 4)           # 4-dp like the exports: plenty of ties
+    values[rng.random(size) < 0.02] = np.nan
+    frame = pd.DataFrame({"v": values})
+    for largest in (True, False):
+        old = frame.sort_values("v", ascending=not largest, kind="stable").head(k).index.to_numpy()
+        assert (old == leaders.top_k(values, k, largest)).all(), "top_k differs from stable sort"
+    t_old = _ms(lambda: frame.sort_values("v", ascending=False, kind="stable").head(k), rounds)
+    t_new = _ms(lambda: leaders.top_k(values, k), rounds)
+    print(f"synthetic {size:,} rows   sort+head {t_old:>8.2f} ms   top_k {t_new:>7.2f} ms   {t_old / t_new:>5.1f}x")
+
+
+def main() -> int:
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--size", type=int, default=1_000_000)
+    ap.add_argument("--rounds", type=int, default=20)
+    args = ap.parse_args()
+
+    # outside `streamlit run` st.cache_resource hands out a new registry per call: pin one
+    reg = registry.FrameRegistry(1 << 30)
+    registry.get_registry = lambda: reg
+
+    snapshot = snapshot_version(DATA_DIR)
+    if facts.read_facts(DATA_DIR, snapshot, []) is None:
+        t0 = time.perf_counter()
+        n_t, n_c = facts.write_facts(DATA_DIR)
+        print(f"built facts: {n_t} tickers × {n_c} columns in {(time.perf_counter() - t0) * 1e3:.0f} ms")
+
+    bench_boards(snapshot, args.rounds)
+    bench_top_k(args.size, max(3, args.rounds // 4))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,93 @@
+# bench/bench_lttb.py
+#
+# Long Deep Dive histories: render + PNG encode time of the line charts
+# (ranges, lines, band, rank, dual) on synthetic daily histories of growing
+# depth – as before (every point, a tick every other Monday), with the date
+# ticks capped at graphs.MAX_X_TICKS, and capped + LTTB at --points. Checks that
+# every series' highest and lowest point survive the thinning.
+#   python bench/bench_lttb.py [--years 2 5 10 20] [--points 1500] [--rounds 3]
+
+import argparse
+import os
+import statistics
+import sys
+import time
+from pathlib import Path
+
+APP_DIR = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(APP_DIR))
+
+import numpy as np  # noqa: E402
+import pandas as pd  # noqa: E402
+
+from markmentum.chart_cache import encode  # noqa: E402
+from markmentum.downsample import downsample  # noqa: E402
+from markmentum import graphs  # noqa: E402
+from markmentum.graphs import GRAPHS, _thin, normalize, render_figure  # noqa: E402
+
+GIDS = (1, 2, 7, 9, 11)      # one graph per line kind
+
+
+# -------------------------
+# Timing
+# -------------------------
+def _ms(fn, rounds: int) -> float:
+    times = []
+    for _ in range(rounds):
+        t0 = time.perf_counter()
+        fn()
+        times.append((time.perf_counter() - t0) * 1e3)
+    return statistics.median(times)
+
+def synthetic(gid: int, years: int, seed: int = 0) -> pd.DataFrame:
+    """Export-shaped random walks for every column of graph gid, normalised like a real load."""
+    rng = np.random.default_rng(seed)
+    days = pd.bdate_range(end="2025-10-17", periods=252 * years)
+    raw = {"date": days, "ticker": "SYN"}
+    for name, aliases in GRAPHS[gid].columns:
+        if name in ("avg", "hi", "lo"):
+            raw[aliases[0]] = {"avg": 0.0, "hi": 10.0, "lo": -10.0}[name]
+        else:
+            raw[aliases[0]] = 100.0 + np.cumsum(rng.normal(0.0, 1.0, len(days)))
+    return normalize(GRAPHS[gid], pd.DataFrame(raw))
+
+def _render(gid: int, df: pd.DataFrame) -> bytes:
+    return encode(render_figure(GRAPHS[gid], df, "SYN"))
+
+def _check_peaks(gid: int, df: pd.DataFrame, points: int) -> None:
+    spec = GRAPHS[gid]
+    cols = [n for n, _ in spec.columns if n not in ("avg", "hi", "lo")]
+    thin = downsample(df, cols, points)
+    for c in cols:
+        assert thin[c].max() == df[c].max() and thin[c].min() == df[c].min(), f"g{gid} {c} lost a peak"
+
+
+def main() -> int:
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--years", type=int, nargs="+", default=[2, 5, 10, 20])
+    ap.add_argument("--points", type=int, default=1500)
+    ap.add_argument("--rounds", type=int, default=3)
+    args = ap.parse_args()
+
+    max_ticks = graphs.MAX_X_TICKS
+    print(f"{'graph':<40}{'years':>6}{'rows':>7}{'kept':>7}{'before ms':>11}{'ticks ms':>10}{'+ lttb ms':>11}{'speedup':>9}")
+    for gid in GIDS:
+        for years in args.years:
+            df = synthetic(gid, years)
+            _check_peaks(gid, df, args.points)
+            os.environ["MM_LTTB_POINTS"] = "0"
+            graphs.MAX_X_TICKS = 10 ** 9                    # previous cadence at any span
+            t_before = _ms(lambda: _render(gid, df), args.rounds)
+            graphs.MAX_X_TICKS = max_ticks
+            t_ticks = _ms(lambda: _render(gid, df), args.rounds)
+            os.environ["MM_LTTB_POINTS"] = str(args.points)
+            t_lttb = _ms(lambda: _render(gid, df), args.rounds)
+            kept = len(_thin(GRAPHS[gid], df))
+            title = f"{gid} {GRAPHS[gid].title} ({GRAPHS[gid].kind})"
+            print(f"{title:<40}{years:>6}{len(df):>7}{kept:>7}{t_before:>11.0f}{t_ticks:>10.0f}{t_lttb:>11.0f}"
+                  f"{t_before / t_lttb:>8.1f}x")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,109 @@
+# bench/bench_periods.py
+#
+# WTD / MTD / QTD Sharpe Rank changes: markmentum.periods (one searchsorted
+# over the ticker-major history for every period start) vs reading and merging
+# qry_graph_data_49/50/51, and vs a pandas "last row before the start per
+# ticker" (filter + groupby().last()) on a synthetic history of --tickers ×
+# --days rows. Checks that the engine matches the exports wherever the
+# history has the base session, and the pandas version everywhere.
+#   python bench/bench_periods.py [--tickers 5000] [--days 1260] [--rounds 10]
+
+import argparse
+import statistics
+import sys
+import time
+from pathlib import Path
+
+APP_DIR = Path(__file__).resolve().parent.parent
+DATA_DIR = APP_DIR / "data"
+sys.path.insert(0, str(APP_DIR))
+
+import numpy as np  # noqa: E402
+import pandas as pd  # noqa: E402
+
+from markmentum import facts, periods  # noqa: E402
+from markmentum.snapshot import snapshot_version  # noqa: E402
+from markmentum.store import read_table  # noqa: E402
+
+EXPORTS = {"wtd": "qry_graph_data_49.csv", "mtd": "qry_graph_data_50.csv", "qtd": "qry_graph_data_51.csv"}
+
+
+# -------------------------
+# Timing
+# -------------------------
+def _ms(fn, rounds: int) -> float:
+    times = []
+    for _ in range(rounds):
+        t0 = time.perf_counter()
+        fn()
+        times.append((time.perf_counter() - t0) * 1e3)
+    return statistics.median(times)
+
+def legacy_exports() -> pd.DataFrame:
+    df = None
+    for p, name in EXPORTS.items():
+        add = read_table(DATA_DIR / name, columns=["Ticker", f"Sharpe_Rank_{p}_change"])
+        df = add if df is None else df.merge(add, on="Ticker", how="left")
+    return df
+
+def bench_today(snapshot: str, rounds: int) -> None:
+    latest = facts.load_facts(DATA_DIR, snapshot, ["Date", "Sharpe_Rank"])
+    asof = latest["Date"].max()
+    hist = periods.load_history.__wrapped__(DATA_DIR, "Sharpe_Rank", snapshot)
+    new = periods.period_changes(hist, latest["Ticker"], latest["Sharpe_Rank"], asof, prefix="Sharpe_Rank")
+    old = legacy_exports().set_index("Ticker").loc[new["Ticker"]]
+    for p in periods.PERIODS:
+        c = f"Sharpe_Rank_{p}_change"
+        got = new[c].to_numpy()
+        ok = ~np.isnan(got)
+        assert np.allclose(got[ok].round(1), old[c].to_numpy()[ok]), f"{p} differs"
+    gaps = int(np.isnan(new["Sharpe_Rank_wtd_change"].to_numpy()).sum())
+
+    t_old = _ms(legacy_exports, rounds)
+    t_hist = _ms(lambda: periods.load_history.__wrapped__(DATA_DIR, "Sharpe_Rank", snapshot), max(2, rounds // 4))
+    t_new = _ms(lambda: periods.period_changes(hist, latest["Ticker"], latest["Sharpe_Rank"], asof,
+                                               prefix="Sharpe_Rank"), rounds)
+    custom = {"since FOMC": "2025-09-17", "ytd": "ytd", "1y": asof - pd.DateOffset(years=1)}
+    t_custom = _ms(lambda: periods.period_changes(hist, latest["Ticker"], latest["Sharpe_Rank"], asof, custom,
+                                                  prefix="Sharpe_Rank"), rounds)
+    print(f"today: {len(hist.tickers)} tickers, {len(hist.values):,} history rows ({gaps} without the WTD base session)")
+    print(f"  3 exports + merge {t_old:>7.2f} ms   history load (once per snapshot) {t_hist:>7.2f} ms   "
+          f"wtd/mtd/qtd {t_new:>6.2f} ms   3 custom periods {t_custom:>6.2f} ms")
+
+def bench_synthetic(n_tickers: int, n_days: int, rounds: int) -> None:
+    rng = np.random.default_rng(0)
+    days = pd.bdate_range(end="2025-10-17", periods=n_days)
+    frame = pd.DataFrame({
+        "Ticker": np.repeat([f"T{i:05d}" for i in range(n_tickers)], n_days),
+        "Date": np.tile(days.to_numpy(), n_tickers),
+        "Sharpe_Rank": np.round(rng.uniform(0, 100, n_tickers * n_days), 1),
+    })
+    hist = periods.build_history(frame, "Sharpe_Rank")
+    starts = [periods.period_start(days[-1], p) for p in periods.PERIODS]
+
+    def legacy():
+        return [frame.loc[frame["Date"] < s].groupby("Ticker")["Sharpe_Rank"].last() for s in starts]
+
+    old = legacy()
+    new = periods.base_values(hist, starts)
+    for j in range(len(starts)):
+        assert np.allclose(old[j].to_numpy(), new[j]), "base values differ"
+    t_old, t_new = _ms(legacy, rounds), _ms(lambda: periods.base_values(hist, starts), rounds)
+    print(f"synthetic: {n_tickers:,} tickers × {n_days:,} days   filter+groupby.last {t_old:>8.2f} ms   "
+          f"searchsorted {t_new:>7.2f} ms   {t_old / t_new:>5.1f}x")
+
+
+def main() -> int:
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--tickers", type=int, default=5000)
+    ap.add_argument("--days", type=int, default=1260)
+    ap.add_argument("--rounds", type=int, default=10)
+    args = ap.parse_args()
+
+    bench_today(snapshot_version(DATA_DIR), args.rounds)
+    bench_synthetic(args.tickers, args.days, max(2, args.rounds // 4))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,89 @@
+# bench/bench_prefetch.py
+#
+# Cold Deep Dive graph loads for one ticker: serial (one graph after another)
+# vs the prefetch pool (every graph started at once).
+#   python bench/bench_prefetch.py [--repeat 5] [--tickers A SPY ZTS] [--workers 8]
+#
+# Each measurement runs in a fresh interpreter; "store" reads the exports
+# through the columnar store / CSV index, "cube" slices the history cube.
+
+import argparse
+import json
+import os
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+APP_DIR = Path(__file__).resolve().parent.parent
+DATA_DIR = APP_DIR / "data"
+sys.path.insert(0, str(APP_DIR))
+
+
+# -------------------------
+# Worker (one per subprocess)
+# -------------------------
+def _work(source: str, mode: str, ticker: str) -> None:
+    from markmentum import bundle
+    from markmentum.cube import open_cube
+    from markmentum.graphs import GRAPH_SPECS, graph_scales, load_graph_frame
+    from markmentum.prefetch import prefetch_graph_frames
+    from markmentum.registry import FrameRegistry
+    from markmentum.snapshot import snapshot_version
+
+    snapshot = snapshot_version(DATA_DIR)
+    scales = graph_scales(DATA_DIR, snapshot)   # resolved once per process in the app too
+    cube = open_cube(DATA_DIR, snapshot) if source == "cube" else None
+
+    t0 = time.perf_counter()
+    if mode == "serial":
+        # the page before prefetch: bundle, then each graph in page order
+        meta = bundle.bundle_meta(DATA_DIR)
+        parts = frozenset(meta.get("parts", [])) if meta else frozenset()
+        tb = bundle.read_bundle(DATA_DIR, ticker, snapshot) if parts else None
+        frames = {spec.gid: load_graph_frame(DATA_DIR, spec, ticker, scales, cube, tb, parts)
+                  for spec in GRAPH_SPECS}
+    else:
+        futs = prefetch_graph_frames(FrameRegistry(1 << 30), DATA_DIR, ticker, snapshot, history_cube=cube)
+        frames = {gid: f.result() for gid, f in futs.items()}
+    dt = time.perf_counter() - t0
+    print(json.dumps({"graphs": len(frames), "rows": sum(len(f) for f in frames.values()), "sec": dt}))
+
+
+# -------------------------
+# Driver
+# -------------------------
+def _run(source: str, mode: str, ticker: str, repeat: int, workers: int) -> dict:
+    runs = []
+    env = {**os.environ, "MM_PREFETCH_WORKERS": str(workers)}
+    for _ in range(repeat):
+        out = subprocess.run([sys.executable, __file__, "--worker", source, mode, ticker],
+                             check=True, capture_output=True, text=True,
+                             env=env).stdout
+        runs.append(json.loads(out.strip().splitlines()[-1]))
+    runs.sort(key=lambda r: r["sec"])
+    return runs[len(runs) // 2]  # median run
+
+def main() -> int:
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--repeat", type=int, default=5)
+    ap.add_argument("--tickers", nargs="+", default=["A", "SPY", "ZTS"])
+    ap.add_argument("--workers", type=int, default=8)
+    ap.add_argument("--worker", nargs=3, metavar=("SOURCE", "MODE", "TICKER"), help=argparse.SUPPRESS)
+    args = ap.parse_args()
+
+    if args.worker:
+        _work(*args.worker)
+        return 0
+
+    print(f"{'ticker':<8}{'source':<8}{'mode':<10}{'graphs':>7}{'rows':>8}{'cold ms':>10}")
+    for t in args.tickers:
+        for source in ("store", "cube"):
+            for mode in ("serial", "prefetch"):
+                r = _run(source, mode, t, args.repeat, args.workers)
+                print(f"{t:<8}{source:<8}{mode:<10}{r['graphs']:>7}{r['rows']:>8}{r['sec']*1000:>10.1f}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,96 @@
+# bench/bench_regimes.py
+#
+# Trend regime labels: markmentum.regimes.regime_labels (one np.select over
+# the arrays) vs the page's previous per-row m2_label on today's universe and
+# on a synthetic --size rows, checking that both give the same labels; plus
+# the one-pass regime history + per-category counts over
+# qry_graph_data_22/23/24 (what the ingest `regimes` stage writes).
+#   python bench/bench_regimes.py [--size 1000000] [--rounds 10]
+
+import argparse
+import statistics
+import sys
+import time
+from pathlib import Path
+
+APP_DIR = Path(__file__).resolve().parent.parent
+DATA_DIR = APP_DIR / "data"
+sys.path.insert(0, str(APP_DIR))
+
+import numpy as np  # noqa: E402
+import pandas as pd  # noqa: E402
+
+from markmentum import regimes  # noqa: E402
+from markmentum.store import read_table  # noqa: E402
+
+TREND_COLS = ["st_trend", "mt_trend", "lt_trend", "st_trend_change", "mt_trend_change"]
+
+
+# -------------------------
+# Previous page code
+# -------------------------
+def m2_label(st, mt, lt, stc, mtc):
+    vals = [st, mt, lt, stc, mtc]
+    if any(pd.isna(v) for v in vals):
+        return "Insufficient data"
+    try:
+        st, mt, lt, stc, mtc = map(float, vals)
+    except Exception:
+        return "Insufficient data"
+
+    if st < mt < lt and stc > 0 and mtc > 0:
+        return "Bullish Alignment · Improving"
+    if st > mt > lt:
+        return "Bearish Alignment"
+    if st < mt < lt and (stc <= 0 or mtc <= 0):
+        return "Bullish Alignment · Waiting"
+    return "Converging / Mixed"
+
+def legacy(df: pd.DataFrame) -> list[str]:
+    return [m2_label(*r) for r in zip(*(df[c] for c in TREND_COLS))]
+
+
+# -------------------------
+# Timing
+# -------------------------
+def _ms(fn, rounds: int) -> float:
+    times = []
+    for _ in range(rounds):
+        t0 = time.perf_counter()
+        fn()
+        times.append((time.perf_counter() - t0) * 1e3)
+    return statistics.median(times)
+
+def bench_labels(label: str, df: pd.DataFrame, rounds: int) -> None:
+    new = lambda: regimes.regime_labels(*(df[c] for c in TREND_COLS))  # noqa: E731
+    assert list(new()) == legacy(df), "labels differ"
+    t_old, t_new = _ms(lambda: legacy(df), rounds), _ms(new, rounds)
+    print(f"{label:<10} {len(df):>9,} rows   m2_label {t_old:>9.2f} ms   np.select {t_new:>7.2f} ms   "
+          f"{t_old / t_new:>6.1f}x")
+
+def synthetic(size: int) -> pd.DataFrame:
+    rng = np.random.default_rng(0)
+    arr = np.round(rng.normal(0.0, 0.02, (size, len(TREND_COLS))), 3)
+    arr[rng.random(arr.shape) < 0.01] = np.nan
+    return pd.DataFrame(arr, columns=TREND_COLS)
+
+
+def main() -> int:
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--size", type=int, default=1_000_000)
+    ap.add_argument("--rounds", type=int, default=10)
+    args = ap.parse_args()
+
+    bench_labels("today", read_table(DATA_DIR / "qry_graph_data_88.csv"), args.rounds)
+    bench_labels("synthetic", synthetic(args.size), max(2, args.rounds // 4))
+
+    t0 = time.perf_counter()
+    hist, counts, used = regimes.build_history(DATA_DIR)
+    dt = (time.perf_counter() - t0) * 1e3
+    print(f"history    series {'/'.join(used) or '-'}: {len(hist):,} ticker-dates, "
+          f"{len(counts):,} category-days in {dt:.0f} ms")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
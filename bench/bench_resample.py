@@ -0,0 +1,145 @@
+# bench/bench_resample.py
+#
+# Period bars: markmentum.resample (one reduceat pass over the ticker-major
+# history for every ticker) vs pandas groupby + resample per frequency.
+# Today's drop has no daily exports, so the quarterly bars come from the
+# monthly exports (19 / 21). The synthetic run writes --tickers × --days daily
+# exports (13 / 15) to a temp dir, checks every weekly / monthly / quarterly
+# bar and band against pandas, and compares what the Deep Dive has to parse:
+# the four weekly / monthly exports (16 / 18 / 19 / 21) vs the resampled files.
+#   python bench/bench_resample.py [--tickers 600] [--days 1260] [--rounds 5]
+
+import argparse
+import statistics
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+APP_DIR = Path(__file__).resolve().parent.parent
+DATA_DIR = APP_DIR / "data"
+sys.path.insert(0, str(APP_DIR))
+
+import numpy as np  # noqa: E402
+import pandas as pd  # noqa: E402
+
+from markmentum import resample  # noqa: E402
+from markmentum.snapshot import snapshot_version  # noqa: E402
+from markmentum.store import read_table  # noqa: E402
+
+
+# -------------------------
+# Timing
+# -------------------------
+def _ms(fn, rounds: int) -> float:
+    times = []
+    for _ in range(rounds):
+        t0 = time.perf_counter()
+        fn()
+        times.append((time.perf_counter() - t0) * 1e3)
+    return statistics.median(times)
+
+def legacy(daily: pd.DataFrame, freq: str) -> pd.DataFrame:
+    # pandas: bucket each ticker's days, compound returns, add volumes
+    key = daily["Date"].dt.to_period({"weekly": "W-SUN", "monthly": "M", "quarterly": "Q"}[freq])
+    g = daily.assign(key=key, gross=1.0 + daily["return"]).groupby(["Ticker", "key"], sort=True)
+    out = g.agg(Date=("Date", "first"), gross=("gross", "prod"), volume=("volume", "sum")).reset_index()
+    if freq != "weekly":
+        out["Date"] = out["key"].dt.start_time
+    out["return"] = out.pop("gross") - 1.0
+    return out[["Ticker", "Date", "return", "volume"]]
+
+def _check(bars: pd.DataFrame, band: pd.DataFrame, daily: pd.DataFrame, freq: str) -> None:
+    old = legacy(daily, freq)
+    new = bars.loc[bars["Freq"] == freq]
+    assert (new["Date"].to_numpy() == old["Date"].to_numpy()).all(), f"{freq} dates differ"
+    for m in resample.METRICS:
+        assert np.allclose(new[m].to_numpy(), old[m].to_numpy()), f"{freq} {m} differs"
+        stats = old.groupby("Ticker")[m].agg(["mean", "std"])
+        got = band.loc[band["Freq"] == freq]
+        assert np.allclose(got[f"{m}_avg"].to_numpy(), stats["mean"].to_numpy()), f"{freq} {m} avg differs"
+        assert np.allclose(got[f"{m}_hi"].to_numpy(), (stats["mean"] + stats["std"]).to_numpy()), f"{freq} {m} hi differs"
+
+
+# -------------------------
+# Runs
+# -------------------------
+def bench_today(rounds: int) -> None:
+    t_build = _ms(lambda: resample.build_bars(DATA_DIR), rounds)
+    bars, band, info = resample.build_bars(DATA_DIR)
+    if not info:
+        print("today: no return / volume history in the drop")
+        return
+    b = resample.load_bars(DATA_DIR, snapshot_version(DATA_DIR))
+    ticker = str(bars["Ticker"].iloc[0])
+    t_slice = _ms(lambda: b.graph_frame(26, ticker), rounds * 20)
+    print(f"today: {info['source']} source -> {', '.join(info['freqs'])}   {len(bars):,} bars   "
+          f"build {t_build:>7.2f} ms   one ticker's quarterly returns {t_slice:>6.3f} ms")
+
+def bench_synthetic(n_tickers: int, n_days: int, rounds: int) -> None:
+    rng = np.random.default_rng(0)
+    days = pd.bdate_range(end="2025-10-17", periods=n_days)
+    tickers = [f"T{i:04d}" for i in range(n_tickers)]
+    daily = pd.DataFrame({
+        "Ticker": np.repeat(tickers, n_days),
+        "Date": np.tile(days.to_numpy(), n_tickers),
+        "return": np.round(rng.normal(0.0005, 0.015, n_tickers * n_days), 4),
+        "volume": np.round(rng.lognormal(3.0, 0.4, n_tickers * n_days), 1),
+    })
+    with tempfile.TemporaryDirectory() as tmp:
+        d = Path(tmp)
+        for n, col, src in ((13, "daily_return_pct", "return"), (15, "daily_volume", "volume")):
+            daily[["Date", "Ticker", src]].rename(columns={src: col}).to_csv(
+                d / f"qry_graph_data_{n}.csv", index=False, date_format="%Y-%m-%d")
+        # the exports the resampler replaces, in their shape (value + constant band columns)
+        for n, freq, metric in ((16, "weekly", "return"), (18, "weekly", "volume"),
+                                (19, "monthly", "return"), (21, "monthly", "volume")):
+            old = legacy(daily, freq)
+            stats = old.groupby("Ticker")[metric].agg(["mean", "std"])
+            value, avg, hi, lo = resample.graph_columns(freq, metric)
+            mean = old["Ticker"].map(stats["mean"])
+            sd = old["Ticker"].map(stats["std"])
+            pd.DataFrame({"Date": old["Date"], "Ticker": old["Ticker"], value: old[metric], avg: mean,
+                          hi: mean + sd, lo: mean - sd}).round(4).to_csv(
+                d / f"qry_graph_data_{n}.csv", index=False, date_format="%Y-%m-%d")
+
+        bars, band, info = resample.build_bars(d)
+        assert info["source"] == "daily"
+        for freq in resample.FREQS:
+            _check(bars, band, daily, freq)
+
+        codes = np.repeat(np.arange(n_tickers), n_days)
+        day_no = np.asarray(daily["Date"].values, dtype="datetime64[D]").astype(np.int64)
+        values = {m: daily[m].to_numpy() for m in resample.METRICS}
+        t_old = _ms(lambda: [legacy(daily, f) for f in resample.FREQS], rounds)
+        t_new = _ms(lambda: [resample.resample(codes, day_no, values, f) for f in resample.FREQS], rounds)
+        t_build = _ms(lambda: resample.build_bars(d), rounds)
+        print(f"synthetic: {n_tickers:,} tickers × {n_days:,} days, 3 frequencies   "
+              f"pandas groupby {t_old:>8.1f} ms   reduceat {t_new:>7.1f} ms   {t_old / t_new:>5.1f}x   "
+              f"(build_bars incl. CSV read + bands {t_build:>7.1f} ms)")
+
+        resample.write_bars(d)
+        exports = [d / f"qry_graph_data_{n}.csv" for n in (16, 18, 19, 21)]
+        files = list(resample.resampled_paths(d)[:2])
+        size_old = sum(p.stat().st_size for p in exports) / 1e6
+        size_new = sum(p.stat().st_size for p in files) / 1e6
+        t_parse_old = _ms(lambda: [read_table(p) for p in exports], rounds)
+        t_parse_new = _ms(lambda: resample.read_bars(d, snapshot_version(d)), rounds)
+        print(f"  weekly + monthly exports {size_old:>6.1f} MB, parse {t_parse_old:>7.1f} ms   "
+              f"resampled (+ quarterly) {size_new:>6.1f} MB, open {t_parse_new:>7.1f} ms")
+
+
+def main() -> int:
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--tickers", type=int, default=600)
+    ap.add_argument("--days", type=int, default=1260)
+    ap.add_argument("--rounds", type=int, default=5)
+    args = ap.parse_args()
+
+    bench_today(args.rounds)
+    bench_synthetic(args.tickers, args.days, max(2, args.rounds // 2))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
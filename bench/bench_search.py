@@ -0,0 +1,95 @@
+# bench/bench_search.py
+#
+# Ticker / name search: markmentum.search.TickerSearch vs the pandas
+# str.lower().str.contains filter the pages used, at today's universe
+# (ticker_data.csv) and at a synthetic universe of 20k instruments.
+#   python bench/bench_search.py [--size 20000] [--rounds 20]
+
+import argparse
+import random
+import statistics
+import string
+import sys
+import time
+from pathlib import Path
+
+APP_DIR = Path(__file__).resolve().parent.parent
+DATA_DIR = APP_DIR / "data"
+sys.path.insert(0, str(APP_DIR))
+
+import pandas as pd  # noqa: E402
+
+from markmentum.search import TickerSearch  # noqa: E402
+from markmentum.store import read_table  # noqa: E402
+
+QUERIES = ["a", "sp", "aapl", "spy", "apple", "micro", "bank of", "ishares", "s&p 500",
+           "technologies", "microsft", "nvdia", "berkshre", "zzzz"]
+
+
+# -------------------------
+# Universes
+# -------------------------
+def today() -> pd.DataFrame:
+    df = read_table(DATA_DIR / "ticker_data.csv", columns=["Ticker", "Ticker_name"])
+    return df.dropna().reset_index(drop=True)
+
+def synthetic(base: pd.DataFrame, size: int, seed: int = 0) -> pd.DataFrame:
+    # today's universe plus made-up instruments built from today's name words
+    rng = random.Random(seed)
+    words = sorted({w for n in base["Ticker_name"].astype(str) for w in n.upper().split() if len(w) > 2})
+    tickers, names = list(base["Ticker"].astype(str)), list(base["Ticker_name"].astype(str))
+    seen = set(tickers)
+    while len(tickers) < size:
+        t = "".join(rng.choices(string.ascii_uppercase, k=rng.randint(2, 5)))
+        if t in seen:
+            continue
+        seen.add(t)
+        tickers.append(t)
+        names.append(" ".join(rng.sample(words, rng.randint(2, 4))))
+    return pd.DataFrame({"Ticker": tickers, "Ticker_name": names})
+
+
+# -------------------------
+# Timing
+# -------------------------
+def _pandas_filter(df: pd.DataFrame, q: str) -> pd.DataFrame:
+    ql = q.strip().lower()
+    return df[df["Ticker"].str.lower().str.contains(ql, na=False, regex=False)
+              | df["Ticker_name"].str.lower().str.contains(ql, na=False, regex=False)]
+
+def _per_query_us(fn, rounds: int) -> tuple[float, float]:
+    times = []
+    for _ in range(rounds):
+        for q in QUERIES:
+            t0 = time.perf_counter()
+            fn(q)
+            times.append((time.perf_counter() - t0) * 1e6)
+    times.sort()
+    return statistics.median(times), times[int(len(times) * 0.99) - 1]
+
+def bench(label: str, df: pd.DataFrame, rounds: int) -> None:
+    t0 = time.perf_counter()
+    ix = TickerSearch.from_frame(df)
+    build_ms = (time.perf_counter() - t0) * 1e3
+    print(f"{label}: {len(df):,} instruments, index built in {build_ms:.0f} ms")
+    for name, fn in (("pandas str.contains", lambda q: _pandas_filter(df, q)),
+                     ("index, top 10", lambda q: ix.search(q, limit=10)),
+                     ("index, all hits", lambda q: ix.search(q))):
+        p50, p99 = _per_query_us(fn, rounds)
+        print(f"  {name:<22}{p50:>10.1f} µs p50{p99:>10.1f} µs p99")
+
+
+def main() -> int:
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--size", type=int, default=20_000)
+    ap.add_argument("--rounds", type=int, default=20)
+    args = ap.parse_args()
+
+    base = today()
+    bench("today", base, args.rounds)
+    bench("synthetic", synthetic(base, args.size), args.rounds)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
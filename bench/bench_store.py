@@ -0,0 +1,141 @@
+# bench/bench_store.py
+#
+# Cold-load time and RSS: today's CSV path vs the columnar store.
+#   python -m markmentum.ingest          # build data/_index, _store, _cube first
+#   python bench/bench_store.py [--repeat 5]
+#
+# Every measurement runs in a fresh interpreter, so nothing is warm in-process
+# (the OS page cache is, which favours the CSV path if anything). Last, the
+# history files whose ticker and avg / hi / lo bands the store keeps once per
+# ticker: bytes a reader maps with them split off vs repeated on every row.
+
+import argparse
+import json
+import resource
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+APP_DIR = Path(__file__).resolve().parent.parent
+DATA_DIR = APP_DIR / "data"
+sys.path.insert(0, str(APP_DIR))
+
+DEEP_DIVE_TICKERS = ["A", "SPY", "ZTS"]
+
+
+def _rss_mb() -> float:
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024.0  # KiB on Linux
+
+
+# -------------------------
+# Workers (one per subprocess)
+# -------------------------
+def _work_tables(mode: str) -> None:
+    # the cross-sectional pages: every export read in full once
+    import pandas as pd
+    from markmentum import store
+
+    files = sorted(DATA_DIR.glob("*.csv"))
+    rss0 = _rss_mb()
+    t0 = time.perf_counter()
+    rows = 0
+    for p in files:
+        df = pd.read_csv(p) if mode == "csv" else store.read_table(p)
+        rows += len(df)
+    dt = time.perf_counter() - t0
+    print(json.dumps({"files": len(files), "rows": rows, "sec": dt, "rss_mb": _rss_mb() - rss0}))
+
+def _work_deep_dive(mode: str) -> None:
+    # Deep Dive: one ticker from each history file (qry_graph_data_01..25)
+    from markmentum import csv_index, store
+    from markmentum.cube import open_cube
+    from markmentum.snapshot import snapshot_version
+
+    if mode == "cube":
+        # series in the cube come from the memmap, the rest from the store
+        cube = open_cube(DATA_DIR, snapshot_version(DATA_DIR))
+        by_name = {f"qry_graph_data_{n:02d}.csv": f"g{n}" for n in range(1, 25)}
+
+        def _cube_rows(p, t):
+            part = by_name.get(p.name)
+            if cube is not None and part and cube.has_part(part):
+                return cube.part_frame(part, t)
+            return store.read_ticker_rows(p, t)
+
+    files = [DATA_DIR / f"qry_graph_data_{n:02d}.csv" for n in range(1, 26)]
+    files = [p for p in files if p.exists()]
+    rss0 = _rss_mb()
+    t0 = time.perf_counter()
+    rows = 0
+    for t in DEEP_DIVE_TICKERS:
+        for p in files:
+            if mode == "scan":
+                df = csv_index._scan_ticker_rows(p, t)
+            elif mode == "index":
+                df = csv_index.read_ticker_rows(p, t)
+            elif mode == "cube":
+                df = _cube_rows(p, t)
+            else:
+                df = store.read_ticker_rows(p, t)
+            rows += len(df)
+    dt = time.perf_counter() - t0
+    print(json.dumps({"files": len(files) * len(DEEP_DIVE_TICKERS), "rows": rows, "sec": dt,
+                      "rss_mb": _rss_mb() - rss0}))
+
+
+def _bands_report() -> None:
+    from markmentum import store
+
+    print(f"\n{'history file':<28}{'rows':>8}{'split':>7}{'wide MB':>9}{'narrow MB':>11}{'saved':>7}")
+    total_wide = total_narrow = 0
+    for p in sorted(DATA_DIR.glob("*.csv")):
+        meta = store.store_meta(p)
+        if not meta or not meta.get("per_ticker"):
+            continue
+        narrow = store.feather.read_table(store.columnar_path(p), memory_map=True)
+        side = store.feather.read_table(store.bands_path(p), memory_map=True)
+        wide = store._read_feather(p, meta)                     # repeated on every row
+        n_narrow = narrow.nbytes + side.nbytes
+        total_wide += wide.nbytes
+        total_narrow += n_narrow
+        print(f"{p.name:<28}{wide.num_rows:>8}{len(meta['per_ticker']):>7}{wide.nbytes / 1e6:>9.2f}"
+              f"{n_narrow / 1e6:>11.2f}{1 - n_narrow / wide.nbytes:>7.0%}")
+    if total_wide:
+        print(f"{'total':<43}{total_wide / 1e6:>9.2f}{total_narrow / 1e6:>11.2f}{1 - total_narrow / total_wide:>7.0%}")
+
+
+# -------------------------
+# Driver
+# -------------------------
+def _run(kind: str, mode: str, repeat: int) -> dict:
+    runs = []
+    for _ in range(repeat):
+        out = subprocess.run([sys.executable, __file__, "--worker", kind, mode],
+                             check=True, capture_output=True, text=True).stdout
+        runs.append(json.loads(out.strip().splitlines()[-1]))
+    runs.sort(key=lambda r: r["sec"])
+    return runs[len(runs) // 2]  # median run
+
+def main() -> int:
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--repeat", type=int, default=5)
+    ap.add_argument("--worker", nargs=2, metavar=("KIND", "MODE"), help=argparse.SUPPRESS)
+    args = ap.parse_args()
+
+    if args.worker:
+        kind, mode = args.worker
+        (_work_tables if kind == "tables" else _work_deep_dive)(mode)
+        return 0
+
+    print(f"{'workload':<28}{'mode':<10}{'reads':>7}{'rows':>10}{'cold ms':>10}{'ΔRSS MB':>10}")
+    for kind, modes in (("tables", ("csv", "store")), ("deep_dive", ("scan", "index", "store", "cube"))):
+        for mode in modes:
+            r = _run(kind, mode, args.repeat)
+            print(f"{kind:<28}{mode:<10}{r['files']:>7}{r['rows']:>10}{r['sec']*1000:>10.1f}{r['rss_mb']:>10.1f}")
+    _bands_report()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
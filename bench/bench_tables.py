@@ -0,0 +1,244 @@
+# bench/bench_tables.py
+#
+# Card tables: markmentum.tables (column formatters + single-pass HTML) and
+# markmentum.tints (column colour scales) vs the per-row code the pages used –
+# iterrows() + f-strings for the Filters / Signals style cards,
+# DataFrame.to_html() with per-value .map() formatters for the Morning Compass,
+# and one tint function call per cell for the heatmaps. Runs on today's
+# 635-row universe and on a synthetic universe of --size rows.
+#   python bench/bench_tables.py [--size 20000] [--rounds 20]
+
+import argparse
+import statistics
+import sys
+import time
+from pathlib import Path
+from urllib.parse import quote_plus
+
+APP_DIR = Path(__file__).resolve().parent.parent
+DATA_DIR = APP_DIR / "data"
+sys.path.insert(0, str(APP_DIR))
+
+import pandas as pd  # noqa: E402
+
+from markmentum.store import read_table  # noqa: E402
+from markmentum.tables import (Column, card_html, column_values, escape_text, fmt_int,  # noqa: E402
+                               fmt_number, fmt_percent, frame_table_html, table_html, ticker_links)
+from markmentum.tints import Band, Banded, diverging, tint_cells  # noqa: E402
+
+COMPASS_COLS = {"ret": "daily_Return", "pr_low": "day_pr_low", "pr_high": "day_pr_high", "rr": "day_rr_ratio"}
+PERF_COLS = ["day_pct_change", "week_pct_change", "month_pct_change", "quarter_pct_change"]
+MM_BADGE = Banded(edges=(-100, -25, 25, 100), upper=(False, True, False, True),
+                  bands=(Band("rgba(185,28,28,0.35)"), Band("rgba(239,68,68,0.28)"), Band("rgba(229,231,235,1.00)"),
+                         Band("rgba(16,185,129,0.28)"), Band("rgba(6,95,70,0.35)")))
+
+
+# -------------------------
+# Inputs
+# -------------------------
+def today() -> tuple[pd.DataFrame, pd.DataFrame]:
+    cards = read_table(DATA_DIR / "ticker_data.csv")
+    compass = read_table(DATA_DIR / "qry_graph_data_76.csv")
+    return cards, compass
+
+def scaled(df: pd.DataFrame, size: int) -> pd.DataFrame:
+    # repeat today's rows with made-up tickers until size rows
+    reps = -(-size // len(df))
+    out = pd.concat([df] * reps, ignore_index=True).iloc[:size].copy()
+    out["Ticker"] = out["Ticker"].astype(str) + (out.index // len(df)).astype(str)
+    return out
+
+
+# -------------------------
+# Previous page code
+# -------------------------
+def _mk_ticker_link(ticker: str) -> str:
+    t = (ticker or "").strip().upper()
+    if not t:
+        return ""
+    return (f'<a href="?page=Deep%20Dive&ticker={quote_plus(t)}" target="_self" rel="noopener" '
+            f'style="text-decoration:none; font-weight:600;">{t}</a>')
+
+def _legacy_pct(val):
+    try:
+        return f"{float(val) * 100:,.1f}%"
+    except Exception:
+        return "—"
+
+def legacy_card(df: pd.DataFrame) -> str:
+    rows = []
+    for _, r in df.iterrows():
+        rows.append(f"""
+<tr>
+  <td class="company">{r.get("Ticker_name", "")}</td>
+  <td class="center" style="width:74px">{_mk_ticker_link(r.get("Ticker", ""))}</td>
+  <td style="min-width:25ch">{r.get("Category", "")}</td>
+  <td class="right" style="width:90px">{_legacy_pct(r.get("day_pct_change"))}</td>
+</tr>""")
+    return f"""
+<div class="card">
+  <h3>Title</h3>
+  <table class="tbl">
+    <thead>
+      <tr>
+        <th style="min-width:42ch">Company</th>
+        <th style="width:74px" class="col-ticker">Ticker</th>
+        <th style="min-width:25ch">Category</th>
+        <th style="width:90px" class="right col-value">% Change</th>
+      </tr>
+    </thead>
+    <tbody>
+      {''.join(rows)}
+    </tbody>
+  </table>
+</div>
+"""
+
+def _legacy_num(x, nd=2):
+    try:
+        if pd.isna(x): return ""
+        return f"{float(x):,.{nd}f}"
+    except Exception:
+        return ""
+
+def _legacy_pct2(x, nd=2):
+    try:
+        if pd.isna(x): return ""
+        return f"{float(x)*100:,.{nd}f}%"
+    except Exception:
+        return ""
+
+def _legacy_int(x):
+    try:
+        if pd.isna(x): return ""
+        return f"{int(round(float(x))):,}"
+    except Exception:
+        return ""
+
+def _legacy_badge(x):
+    if pd.isna(x):
+        return ""
+    v = float(x)
+    if v <= -100:
+        bg = "rgba(185,28,28,0.35)"
+    elif v < -25:
+        bg = "rgba(239,68,68,0.28)"
+    elif v <= 25:
+        bg = "rgba(229,231,235,1.00)"
+    elif v < 100:
+        bg = "rgba(16,185,129,0.28)"
+    else:
+        bg = "rgba(6,95,70,0.35)"
+    return f'<span style="display:block; background:{bg}; padding:0 4px; border-radius:2px;">{int(round(v)):,}</span>'
+
+def _legacy_divergent(val, vmax, nd=1, label_scale=1.0, suffix=""):
+    if val is None or pd.isna(val) or vmax is None or vmax <= 0:
+        return ""
+    s = min(abs(float(val)) / float(vmax), 1.0)
+    alpha = 0.12 + 0.28 * s
+    if val > 0:
+        bg = f"rgba(16,185,129,{alpha:.3f})"
+    elif val < 0:
+        bg = f"rgba(239,68,68,{alpha:.3f})"
+    else:
+        bg = "transparent"
+    return (f'<span style="display:block; background:{bg}; padding:0 4px; border-radius:2px;">'
+            f'{float(val) * label_scale:,.{nd}f}{suffix}</span>')
+
+def legacy_compass(d: pd.DataFrame) -> str:
+    cols = COMPASS_COLS
+    d = d.copy()
+    d["Ticker"] = d["Ticker"].apply(_mk_ticker_link)
+    card = pd.DataFrame({
+        "Name":           d["Ticker_name"],
+        "Ticker":         d["Ticker"],
+        "Close":          d["Close"].map(lambda v: _legacy_num(v, 2)),
+        "% Change":       d[cols["ret"]].map(lambda v: _legacy_pct2(v, 2)),
+        "Probable Low":   d[cols["pr_low"]].map(lambda v: _legacy_num(v, 2)),
+        "Probable High":  d[cols["pr_high"]].map(lambda v: _legacy_num(v, 2)),
+        "Risk / Reward":  d[cols["rr"]].map(lambda v: _legacy_divergent(v, 3.0)),
+        "MM Score":       d["model_score"].map(_legacy_badge),
+        "MM Score Change":d["model_score_delta"].map(_legacy_int),
+    })
+    html = card.to_html(index=False, classes="tbl", escape=False, border=0)
+    html = html.replace('class="dataframe tbl"', 'class="tbl"')
+    colgroup = '<colgroup><col class="col-name"><col><col><col><col><col><col><col><col></colgroup>'
+    return html.replace('<table class="tbl">', f'<table class="tbl">{colgroup}', 1)
+
+def legacy_heatmap(d: pd.DataFrame) -> str:
+    vmax = {c: d[c].abs().max(skipna=True) or 0.0 for c in PERF_COLS}
+    render = pd.DataFrame({"Name": d["Ticker_name"], "Ticker": d["Ticker"].map(_mk_ticker_link),
+                           **{c: [_legacy_divergent(v, vmax[c], 2, 100.0, "%") for v in d[c]] for c in PERF_COLS}})
+    html = render.to_html(index=False, classes="tbl", escape=False, border=0)
+    return html.replace('class="dataframe tbl"', 'class="tbl"')
+
+
+# -------------------------
+# markmentum.tables + markmentum.tints
+# -------------------------
+def new_card(df: pd.DataFrame) -> str:
+    table = table_html([
+        Column("Company", escape_text(column_values(df, "Ticker_name")), td_class="company", th_style="min-width:42ch"),
+        Column("Ticker", ticker_links(column_values(df, "Ticker")), td_class="center", td_style="width:74px",
+               th_class="col-ticker", th_style="width:74px"),
+        Column("Category", escape_text(column_values(df, "Category")), td_style="min-width:25ch", th_style="min-width:25ch"),
+        Column("% Change", fmt_percent(df["day_pct_change"], 1, na="—"), td_class="right", td_style="width:90px",
+               th_class="right col-value", th_style="width:90px"),
+    ])
+    return card_html("Title", table)
+
+def new_compass(d: pd.DataFrame) -> str:
+    cols = COMPASS_COLS
+    return table_html([
+        Column("Name",            escape_text(d["Ticker_name"]), col_class="col-name"),
+        Column("Ticker",          ticker_links(d["Ticker"])),
+        Column("Close",           fmt_number(d["Close"])),
+        Column("% Change",        fmt_percent(d[cols["ret"]])),
+        Column("Probable Low",    fmt_number(d[cols["pr_low"]])),
+        Column("Probable High",   fmt_number(d[cols["pr_high"]])),
+        Column("Risk / Reward",   tint_cells(d[cols["rr"]], diverging(3.0), fmt_number(d[cols["rr"]], 1))),
+        Column("MM Score",        tint_cells(d["model_score"], MM_BADGE, fmt_int(d["model_score"]))),
+        Column("MM Score Change", fmt_int(d["model_score_delta"])),
+    ])
+
+def new_heatmap(d: pd.DataFrame) -> str:
+    render = pd.DataFrame({"Name": d["Ticker_name"], "Ticker": ticker_links(d["Ticker"]),
+                           **{c: tint_cells(d[c], diverging(d[c].abs().max(skipna=True) or 0.0), fmt_percent(d[c]))
+                              for c in PERF_COLS}})
+    return frame_table_html(render, col_classes=["col-name-wide", "col-ticker-nar"] + ["col-num-lg"] * 4)
+
+
+# -------------------------
+# Timing
+# -------------------------
+def _ms(fn, df, rounds: int) -> float:
+    times = []
+    for _ in range(rounds):
+        t0 = time.perf_counter()
+        fn(df)
+        times.append((time.perf_counter() - t0) * 1e3)
+    return statistics.median(times)
+
+def bench(label: str, cards: pd.DataFrame, compass: pd.DataFrame, rounds: int) -> None:
+    print(f"{label}: {len(cards):,} rows")
+    for name, old, new, df in (("card (4 cols)", legacy_card, new_card, cards),
+                               ("compass (9 cols)", legacy_compass, new_compass, compass),
+                               ("heatmap (6 cols)", legacy_heatmap, new_heatmap, cards)):
+        t_old, t_new = _ms(old, df, rounds), _ms(new, df, rounds)
+        print(f"  {name:<18}previous {t_old:>9.2f} ms   tables {t_new:>8.2f} ms   {t_old / t_new:>5.1f}x")
+
+
+def main() -> int:
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--size", type=int, default=20_000)
+    ap.add_argument("--rounds", type=int, default=20)
+    args = ap.parse_args()
+
+    cards, compass = today()
+    bench("today", cards, compass, args.rounds)
+    bench("synthetic", scaled(cards, args.size), scaled(compass, args.size), max(3, args.rounds // 4))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
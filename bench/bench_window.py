@@ -0,0 +1,95 @@
+# bench/bench_window.py
+#
+# Deep Dive range windows: markmentum.window.apply_window_with_gutter (one
+# searchsorted on the frame's sorted DatetimeIndex, an iloc view, preset starts
+# cached per end date) vs the previous to_datetime + boolean mask + copy, for
+# every graph × range of a few tickers and on --years of synthetic daily
+# history. Checks that both keep the same rows.
+#   python bench/bench_window.py [--years 10] [--rounds 20]
+
+import argparse
+import statistics
+import sys
+import time
+from pathlib import Path
+
+APP_DIR = Path(__file__).resolve().parent.parent
+DATA_DIR = APP_DIR / "data"
+sys.path.insert(0, str(APP_DIR))
+
+import numpy as np  # noqa: E402
+import pandas as pd  # noqa: E402
+
+from markmentum.graphs import GRAPHS, load_graph_frames, normalize  # noqa: E402
+from markmentum.snapshot import snapshot_version  # noqa: E402
+from markmentum.window import RANGE_OPTIONS, apply_window_with_gutter, range_start  # noqa: E402
+
+TICKERS = ["SPY", "AAPL", "ZTS"]
+
+
+# -------------------------
+# Previous code
+# -------------------------
+def legacy_window(df: pd.DataFrame, label: str, date_col: str = "date", gutter_days: int = 5) -> pd.DataFrame:
+    if df.empty:
+        return df
+    end = pd.to_datetime(df[date_col]).max()
+    start_raw = range_start(end, label)
+    if start_raw is None:
+        start = df[date_col].min() - pd.Timedelta(days=gutter_days)
+        end = end + pd.Timedelta(days=gutter_days)
+    else:
+        start = max(df[date_col].min(), start_raw - pd.Timedelta(days=gutter_days))
+        end   = end + pd.Timedelta(days=gutter_days)
+    m = (df[date_col] >= start) & (df[date_col] <= end)
+    return df.loc[m].copy()
+
+
+# -------------------------
+# Timing
+# -------------------------
+def _ms(fn, rounds: int) -> float:
+    times = []
+    for _ in range(rounds):
+        t0 = time.perf_counter()
+        fn()
+        times.append((time.perf_counter() - t0) * 1e3)
+    return statistics.median(times)
+
+def _same(frames: list, label: str) -> None:
+    for df in frames:
+        old, new = legacy_window(df, label), apply_window_with_gutter(df, label)
+        assert old.reset_index(drop=True).equals(new.reset_index(drop=True)), f"{label} window differs"
+
+def bench_frames(name: str, frames: list, rounds: int) -> None:
+    for label in RANGE_OPTIONS:
+        _same(frames, label)
+    # one range switch: every graph re-windowed for the new range
+    t_old = _ms(lambda: [legacy_window(df, r) for r in RANGE_OPTIONS for df in frames], rounds)
+    t_new = _ms(lambda: [apply_window_with_gutter(df, r) for r in RANGE_OPTIONS for df in frames], rounds)
+    n = len(frames) * len(RANGE_OPTIONS)
+    print(f"{name:<44} mask + copy {t_old / n * 1e3:>8.1f} µs   searchsorted view {t_new / n * 1e3:>6.1f} µs"
+          f"   {t_old / t_new:>5.1f}x   (per graph × range)")
+
+
+def main() -> int:
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--years", type=int, default=10)
+    ap.add_argument("--rounds", type=int, default=20)
+    args = ap.parse_args()
+
+    snapshot = snapshot_version(DATA_DIR)
+    frames = [df for t in TICKERS for df in load_graph_frames(DATA_DIR, t, snapshot).values() if not df.empty]
+    bench_frames(f"today: {len(frames)} graph frames ({len(TICKERS)} tickers)", frames, args.rounds)
+
+    rng = np.random.default_rng(0)
+    days = pd.bdate_range(end="2025-10-17", periods=252 * args.years)
+    raw = pd.DataFrame({"date": days, "ticker": "SYN", "weekly_range": rng.uniform(5, 20, len(days)),
+                        "weekly_range_avg": 12.0, "weekly_range_hi": 19.0, "weekly_range_lo": 5.0})
+    synth = [normalize(GRAPHS[17], raw)] * 24
+    bench_frames(f"synthetic: 24 graphs × {len(days):,} daily rows", synth, max(3, args.rounds // 4))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,79 @@
+# bench/stress_render.py
+#
+# Concurrency stress test for markmentum.graphs: the same charts rendered on many
+# threads at once must be byte-identical to a serial render. Any shared
+# matplotlib state (pyplot's current figure, rcParams, a shared canvas) leaking
+# between renders shows up as a PNG hash mismatch.
+#   python bench/stress_render.py [--threads 16] [--rounds 4] [--tickers SPY QQQ ZTS]
+#
+# Exit status 1 when any render differs from its reference.
+
+import argparse
+import hashlib
+import random
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+APP_DIR = Path(__file__).resolve().parent.parent
+DATA_DIR = APP_DIR / "data"
+sys.path.insert(0, str(APP_DIR))
+
+from markmentum.chart_cache import encode  # noqa: E402
+from markmentum.graphs import GRAPHS, load_graph_frames, render_figure  # noqa: E402
+from markmentum.snapshot import snapshot_version  # noqa: E402
+from markmentum.window import apply_window_with_gutter  # noqa: E402
+
+DEFAULT_TICKERS = ["SPY", "QQQ", "ZTS"]
+DEFAULT_RANGES = ["3M", "All"]
+
+
+def _render(task) -> str:
+    ticker, gid, rng, df = task
+    fig = render_figure(GRAPHS[gid], apply_window_with_gutter(df, rng), ticker)
+    return hashlib.sha1(encode(fig)).hexdigest()
+
+
+def main() -> int:
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--threads", type=int, default=16)
+    ap.add_argument("--rounds", type=int, default=4, help="times each chart is re-rendered concurrently")
+    ap.add_argument("--tickers", nargs="+", default=DEFAULT_TICKERS)
+    ap.add_argument("--ranges", nargs="+", default=DEFAULT_RANGES)
+    args = ap.parse_args()
+
+    snapshot = snapshot_version(DATA_DIR)
+    tasks = []
+    for t in args.tickers:
+        for gid, df in load_graph_frames(DATA_DIR, t, snapshot).items():
+            if not df.empty:
+                tasks += [(t, gid, rng, df) for rng in args.ranges]
+    if not tasks:
+        print("no chart data found", file=sys.stderr)
+        return 1
+
+    t0 = time.perf_counter()
+    reference = {task[:3]: _render(task) for task in tasks}
+    serial = time.perf_counter() - t0
+
+    # every chart several times, shuffled, so different graph kinds overlap
+    work = tasks * args.rounds
+    random.Random(0).shuffle(work)
+    t0 = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=args.threads) as pool:
+        hashes = list(pool.map(_render, work))
+    threaded = time.perf_counter() - t0
+
+    bad = [(task[:3], h) for task, h in zip(work, hashes) if h != reference[task[:3]]]
+    print(f"{len(tasks)} charts serial in {serial:.1f} s ({len(tasks) / serial:.1f} charts/s)")
+    print(f"{len(work)} renders on {args.threads} threads in {threaded:.1f} s "
+          f"({len(work) / threaded:.1f} charts/s)")
+    for (t, gid, rng), _ in bad[:20]:
+        print(f"  MISMATCH {t} g{gid} {rng}")
+    print(f"{len(bad)} mismatches" if bad else "all renders identical to the serial reference")
+    return 1 if bad else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,4 @@
+# markmentum – shared data helpers for the Streamlit pages
+#
+# The pages import from here (Streamlit puts the folder of 01_About.py on sys.path),
+# and the nightly ingest step runs as:  python -m markmentum.ingest
@@ -0,0 +1,144 @@
+# markmentum/bundle.py
+#
+# Pre-joined Deep Dive bundle: one small Feather file per ticker holding the
+# stat-box row and all 24 graph series, outer-joined on date.
+#   data/_bundle/<TICKER>.feather    columns: date, stats__<col>, g1__<col>, ..., g24__<col>
+#   data/_bundle/_meta.json          snapshot id the bundles were built from
+# Column names keep the lower-cased export names, so graph_frame() hands each
+# Deep Dive loader exactly what read_ticker_rows() would have returned.
+
+import json
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from markmentum import store
+from markmentum.snapshot import snapshot_version
+
+BUNDLE_DIRNAME = "_bundle"
+BUNDLE_VERSION = 1
+SEP = "__"
+
+# bundle part -> source export (FILE_STATS, FILE_G1..FILE_G24 in the Deep Dive)
+BUNDLE_PARTS = {"stats": "qry_graph_data_25.csv"}
+BUNDLE_PARTS.update({f"g{n}": f"qry_graph_data_{n:02d}.csv" for n in range(1, 25)})
+
+
+# -------------------------
+# Helpers
+# -------------------------
+def bundle_dir(data_dir: Path) -> Path:
+    return Path(data_dir) / BUNDLE_DIRNAME
+
+def _bundle_file(data_dir: Path, ticker: str) -> Path:
+    # tickers are plain symbols (BRK.B, BF-B …); keep the name filesystem-safe anyway
+    safe = "".join(ch if ch.isalnum() or ch in ".-_" else "_" for ch in str(ticker))
+    return bundle_dir(data_dir) / f"{safe}.feather"
+
+def _load_part(path: Path) -> pd.DataFrame:
+    df = store.read_table(path)
+    df.columns = [str(c).strip().lower() for c in df.columns]
+    if "ticker" not in df.columns or "date" not in df.columns:
+        return pd.DataFrame()
+    df["date"] = pd.to_datetime(df["date"], errors="coerce")
+    df["ticker"] = df["ticker"].astype(str)
+    return df.dropna(subset=["date"])
+
+
+# -------------------------
+# Ingest
+# -------------------------
+def build_bundles(data_dir: Path) -> int:
+    """
+    Write one bundle per ticker. Returns the number of bundles written
+    (0 when pyarrow is unavailable; the Deep Dive then reads the exports).
+    """
+    if store.pa is None:
+        return 0
+    data_dir = Path(data_dir)
+    out_dir = bundle_dir(data_dir)
+    out_dir.mkdir(parents=True, exist_ok=True)
+
+    # one (ticker, date)-indexed frame per part, columns prefixed with the part key
+    frames, keys = [], []
+    for key, name in BUNDLE_PARTS.items():
+        p = data_dir / name
+        if not p.exists():
+            continue
+        df = _load_part(p)
+        if df.empty:
+            continue
+        df = df.drop_duplicates(["ticker", "date"], keep="last").set_index(["ticker", "date"])
+        frames.append(df.add_prefix(f"{key}{SEP}"))
+        keys.append(key)
+    if not frames:
+        return 0
+
+    # join everything once, then cut the Arrow table into per-ticker slices
+    wide = pd.concat(frames, axis=1, join="outer").sort_index().reset_index()
+    table = store.pa.Table.from_pandas(wide, preserve_index=False)
+    tkr = wide["ticker"].to_numpy()
+    starts = np.flatnonzero(np.r_[True, tkr[1:] != tkr[:-1]])
+    ends = np.r_[starts[1:], len(tkr)]
+    for s_, e_ in zip(starts, ends):
+        fp = _bundle_file(data_dir, tkr[s_])
+        tmp = fp.with_suffix(".tmp")
+        store.feather.write_feather(table.slice(s_, e_ - s_).drop(["ticker"]), tmp, compression="zstd")
+        tmp.replace(fp)
+    tickers = tkr[starts]
+
+    # tickers gone from the exports: their old bundles must not outlive the snapshot stamp
+    written = {_bundle_file(data_dir, t).name for t in tickers}
+    for fp in out_dir.glob("*.feather"):
+        if fp.name not in written:
+            fp.unlink(missing_ok=True)
+
+    meta = {"version": BUNDLE_VERSION, "snapshot": snapshot_version(data_dir),
+            "parts": keys, "tickers": len(tickers)}
+    (out_dir / "_meta.json").write_text(json.dumps(meta), encoding="utf-8")
+    return len(tickers)
+
+
+# -------------------------
+# Load
+# -------------------------
+def bundle_meta(data_dir: Path) -> dict | None:
+    try:
+        meta = json.loads((bundle_dir(data_dir) / "_meta.json").read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        return None
+    return meta if meta.get("version") == BUNDLE_VERSION else None
+
+def read_bundle(data_dir: Path, ticker: str, snapshot: str) -> pd.DataFrame | None:
+    """
+    The ticker's bundle, or None when bundles are missing / built from another
+    snapshot (-> callers read the exports). Empty frame = ticker not in any export.
+    """
+    if store.pa is None:
+        return None
+    meta = bundle_meta(data_dir)
+    if meta is None or meta.get("snapshot") != snapshot:
+        return None
+    fp = _bundle_file(data_dir, ticker)
+    if not fp.exists():
+        return pd.DataFrame()
+    return store.feather.read_feather(fp, memory_map=True)
+
+def has_part(data_dir: Path, key: str) -> bool:
+    meta = bundle_meta(data_dir)
+    return meta is not None and key in meta.get("parts", [])
+
+def graph_frame(bundle: pd.DataFrame, key: str, ticker: str) -> pd.DataFrame:
+    """
+    One part of a bundle in export shape: date, ticker, <lower-cased columns>,
+    only the dates that part actually has.
+    """
+    prefix = f"{key}{SEP}"
+    cols = [c for c in bundle.columns if c.startswith(prefix)]
+    if bundle.empty or not cols:
+        return pd.DataFrame()
+    df = bundle[["date", *cols]].dropna(subset=cols, how="all")
+    df = df.rename(columns={c: c[len(prefix):] for c in cols}).reset_index(drop=True)
+    df.insert(1, "ticker", ticker)
+    return df
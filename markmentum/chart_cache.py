@@ -0,0 +1,206 @@
+# markmentum/chart_cache.py
+#
+# On-disk cache of rendered Deep Dive charts (encoded PNG / SVG bytes).
+#   data/_charts/<snapshot>/<TICKER>/g<gid>-<range>-<spec hash>.<fmt>
+# A chart is fully determined by (ticker, graph id, range label, snapshot) plus
+# the spec it was drawn from, so a hit is served without touching matplotlib.
+# Older snapshot directories are dropped when the snapshot now in data/ is first
+# written (a process still on the previous snapshot never prunes), and that
+# snapshot's charts are held under MM_CHART_CACHE_MB (default 512) by evicting
+# the least recently used (hits refresh the file mtime). The folder walks behind
+# both run outside the module lock, in one thread at a time. A failed cache write is
+# skipped: the chart is still served, just not cached.
+
+import hashlib
+import io
+import os
+import shutil
+import threading
+from pathlib import Path
+
+from markmentum.downsample import point_budget
+from markmentum.snapshot import snapshot_version
+
+CHART_DIRNAME = "_charts"
+CHART_VERSION = 1          # bump when markmentum.graphs drawing code changes
+DEFAULT_BUDGET_MB = 512
+
+# same encoding st.pyplot uses, so cached and live charts look identical
+SAVEFIG_OPTIONS = {"bbox_inches": "tight", "dpi": 200}
+
+_lock = threading.Lock()
+_bytes_memo: dict = {}     # cache root -> approximate bytes on disk
+_snapshot_memo: dict = {}  # cache root -> snapshot last written
+_busy: set = set()         # cache roots being pruned / scanned / evicted by some thread
+
+
+# -------------------------
+# Helpers
+# -------------------------
+def cache_root(data_dir: Path) -> Path:
+    return Path(data_dir) / CHART_DIRNAME
+
+def budget_bytes() -> int:
+    return int(float(os.environ.get("MM_CHART_CACHE_MB", DEFAULT_BUDGET_MB)) * 1024 * 1024)
+
+def spec_hash(spec) -> str:
+    # GraphSpec is a frozen dataclass: its repr covers every styling field; the
+    # LTTB point budget changes what long series look like, so it is part of the key
+    return hashlib.sha1(f"{CHART_VERSION}|{point_budget()}|{spec!r}".encode("utf-8")).hexdigest()[:10]
+
+def _safe(s: str) -> str:
+    return "".join(ch if ch.isalnum() or ch in ".-_" else "_" for ch in str(s))
+
+def ticker_dir(data_dir: Path, snapshot: str, ticker: str) -> Path:
+    return cache_root(data_dir) / _safe(snapshot) / _safe(ticker)
+
+def chart_path(data_dir: Path, snapshot: str, ticker: str, spec, range_label: str,
+               fmt: str = "png") -> Path:
+    name = f"g{spec.gid}-{_safe(range_label)}-{spec_hash(spec)}.{fmt}"
+    return ticker_dir(data_dir, snapshot, ticker) / name
+
+def encode(fig, fmt: str = "png") -> bytes:
+    buf = io.BytesIO()
+    fig.savefig(buf, format=fmt, **SAVEFIG_OPTIONS)
+    return buf.getvalue()
+
+def _disk_usage(root: Path) -> int:
+    total = 0
+    for p in root.rglob("*"):
+        try:
+            if p.is_file():
+                total += p.stat().st_size
+        except OSError:
+            pass   # removed by another process meanwhile
+    return total
+
+
+# -------------------------
+# Cache
+# -------------------------
+def get_chart(data_dir: Path, snapshot: str, ticker: str, spec, range_label: str,
+              fmt: str = "png") -> bytes | None:
+    p = chart_path(data_dir, snapshot, ticker, spec, range_label, fmt)
+    try:
+        data = p.read_bytes()
+    except OSError:
+        return None
+    try:
+        os.utime(p)   # LRU: a hit counts as a use
+    except OSError:
+        pass
+    return data
+
+def put_chart(data_dir: Path, snapshot: str, ticker: str, spec, range_label: str,
+              data: bytes, fmt: str = "png", evict: bool = True) -> Path | None:
+    """
+    Store one chart. None when the write failed (the cache is best effort).
+    evict=False leaves the budget to the caller (the pre-render keeps its whole set).
+    """
+    p = chart_path(data_dir, snapshot, ticker, spec, range_label, fmt)
+    # unique temp name: page sessions and pre-render workers write concurrently
+    tmp = p.with_name(f"{p.name}.{os.getpid()}.{threading.get_ident()}.tmp")
+    for attempt in range(2):
+        try:
+            p.parent.mkdir(parents=True, exist_ok=True)
+            tmp.write_bytes(data)
+            tmp.replace(p)
+            break
+        except OSError:
+            # directory pruned by another process meanwhile: once more, then give up
+            tmp.unlink(missing_ok=True)
+            if attempt:
+                return None
+    try:
+        _account(data_dir, snapshot, len(data), evict)
+    except OSError:
+        pass
+    return p
+
+def _account(data_dir: Path, snapshot: str, added: int, evict: bool = True) -> None:
+    # the lock only guards the memos; pruning, scanning and unlinking run outside
+    # it, in the one thread that claimed the root, so other writers never wait on a walk
+    root = cache_root(data_dir)
+    with _lock:
+        if root in _busy:
+            return   # another thread is scanning / evicting; its count is refreshed then
+        new_snapshot = _snapshot_memo.get(root) != snapshot
+        if new_snapshot:
+            _snapshot_memo[root] = snapshot
+        else:
+            _bytes_memo[root] += added
+        over = evict and not new_snapshot and _bytes_memo[root] > budget_bytes()
+        if not (new_snapshot or over):
+            return
+        _busy.add(root)
+    try:
+        snap_dir = root / _safe(snapshot)
+        if new_snapshot:
+            # first write of this process / of a new snapshot: old charts can never hit
+            _drop_other_snapshots(root, snapshot, data_dir)
+            total = sum(size for _, size, _ in _scan(snap_dir))
+            over = evict and total > budget_bytes()
+        if over:
+            total = _evict(snap_dir, int(budget_bytes() * 0.9))
+        with _lock:
+            _bytes_memo[root] = total
+    finally:
+        with _lock:
+            _busy.discard(root)
+
+def _drop_other_snapshots(root: Path, snapshot: str, data_dir: Path) -> None:
+    # snapshot ids are content hashes, not ordered: only the snapshot now in data/
+    # may prune, so a process still on the previous one can't wipe a new set
+    if snapshot_version(data_dir) != snapshot:
+        return
+    keep = _safe(snapshot)
+    for d in root.iterdir():
+        if d.is_dir() and d.name != keep:
+            shutil.rmtree(d, ignore_errors=True)
+
+def _scan(snap_dir: Path) -> list:
+    """(mtime_ns, size, path) of every finished chart of one snapshot."""
+    files = []
+    for p in snap_dir.rglob("*"):
+        if p.suffix in (".tmp", ".json"):
+            continue   # another writer's chart in flight / pre-render state, not a chart
+        try:
+            st_ = p.stat()
+        except OSError:
+            continue   # removed by another process meanwhile
+        if p.is_file():
+            files.append((st_.st_mtime_ns, st_.st_size, p))
+    return files
+
+def _evict(snap_dir: Path, target: int) -> int:
+    """Delete least recently used charts of one snapshot until it is under target bytes."""
+    files = _scan(snap_dir)
+    total = sum(f[1] for f in files)
+    for _, size, p in sorted(files, key=lambda f: f[0]):
+        if total <= target:
+            break
+        try:
+            p.unlink()
+            total -= size
+        except OSError:
+            pass
+    return total
+
+def cache_bytes(data_dir: Path) -> int:
+    """Bytes on disk under data/_charts (every snapshot)."""
+    root = cache_root(data_dir)
+    return _disk_usage(root) if root.is_dir() else 0
+
+def prune_snapshots(data_dir: Path, snapshot: str) -> None:
+    """Remove charts of every snapshot but this one (when it is still the data in data_dir)."""
+    root = cache_root(data_dir)
+    if root.is_dir():
+        with _lock:
+            _drop_other_snapshots(root, snapshot, data_dir)
+
+def clear_charts(data_dir: Path) -> None:
+    root = cache_root(data_dir)
+    with _lock:
+        shutil.rmtree(root, ignore_errors=True)
+        _bytes_memo.pop(root, None)
+        _snapshot_memo.pop(root, None)
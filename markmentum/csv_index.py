@@ -0,0 +1,172 @@
+# markmentum/csv_index.py
+#
+# Per-ticker byte-offset index for the history CSVs (qry_graph_data_NN.csv).
+# The exports are sorted by Ticker, so each ticker is one contiguous block of lines.
+# The index stores  ticker -> [offset, length]  so a loader can seek straight to the
+# block and parse only those rows instead of chunk-scanning the whole file.
+
+import csv
+import io
+import json
+from pathlib import Path
+
+import pandas as pd
+
+from markmentum.fileinfo import matches_source, source_stamp
+
+INDEX_DIRNAME = "_index"
+INDEX_VERSION = 2
+
+# validated indexes, keyed by (csv path, mtime_ns, size)
+_INDEX_MEMO: dict = {}
+
+
+# -------------------------
+# Helpers
+# -------------------------
+def index_path(csv_path: Path) -> Path:
+    csv_path = Path(csv_path)
+    return csv_path.parent / INDEX_DIRNAME / f"{csv_path.stem}.json"
+
+def _ticker_pos(header: bytes) -> int | None:
+    names = next(csv.reader([header.decode("utf-8-sig").rstrip("\r\n")]))
+    for i, name in enumerate(names):
+        if name.strip().lower() == "ticker":
+            return i
+    return None
+
+def _field(line: bytes, pos: int) -> str:
+    # fast path for the plain exports; csv module only when a quoted field shows up
+    if b'"' not in line:
+        parts = line.rstrip(b"\r\n").split(b",")
+        return parts[pos].decode("utf-8").strip() if pos < len(parts) else ""
+    row = next(csv.reader([line.decode("utf-8").rstrip("\r\n")]))
+    return row[pos].strip() if pos < len(row) else ""
+
+
+# -------------------------
+# Build / write
+# -------------------------
+def build_index(csv_path: Path) -> dict | None:
+    """
+    Scan one CSV and return its index dict, or None when the file has no Ticker
+    column or the tickers are not in contiguous blocks (unsorted export).
+      { "version", "source": {size, mtime_ns, sha1}, "header_len", "tickers": {T: [offset, length]} }
+    """
+    csv_path = Path(csv_path)
+    tickers: dict[str, list[int]] = {}
+    with open(csv_path, "rb") as f:
+        header = f.readline()
+        pos = _ticker_pos(header)
+        if pos is None:
+            return None
+        offset = len(header)
+        cur, start = None, offset
+        for line in f:
+            if line.strip():
+                t = _field(line, pos)
+                if t != cur:
+                    if cur is not None:
+                        tickers[cur] = [start, offset - start]
+                    if t in tickers:
+                        return None  # ticker seen twice -> not sorted
+                    cur, start = t, offset
+            offset += len(line)
+        if cur is not None:
+            tickers[cur] = [start, offset - start]
+
+    return {
+        "version": INDEX_VERSION,
+        "source": source_stamp(csv_path),
+        "header_len": len(header),
+        "tickers": tickers,
+    }
+
+def write_index(csv_path: Path) -> Path | None:
+    idx = build_index(csv_path)
+    out = index_path(csv_path)
+    if idx is None:
+        # drop any stale sidecar so loaders fall back to the scan
+        out.unlink(missing_ok=True)
+        return None
+    out.parent.mkdir(parents=True, exist_ok=True)
+    tmp = out.with_suffix(".tmp")
+    tmp.write_text(json.dumps(idx, separators=(",", ":")), encoding="utf-8")
+    tmp.replace(out)
+    return out
+
+
+# -------------------------
+# Load / read
+# -------------------------
+def load_index(csv_path: Path) -> dict | None:
+    """
+    Return the sidecar index for csv_path if it still matches the file, else None.
+    """
+    csv_path = Path(csv_path)
+    ip = index_path(csv_path)
+    try:
+        st_ = csv_path.stat()
+    except OSError:
+        return None
+    key = (str(csv_path), st_.st_mtime_ns, st_.st_size)
+    if key in _INDEX_MEMO:
+        return _INDEX_MEMO[key]
+
+    idx = None
+    try:
+        raw = json.loads(ip.read_text(encoding="utf-8"))
+        if raw.get("version") == INDEX_VERSION and matches_source(csv_path, raw.get("source")):
+            idx = raw
+    except (OSError, ValueError):
+        idx = None
+
+    _INDEX_MEMO[key] = idx
+    return idx
+
+def _scan_ticker_rows(csv_path: Path, ticker: str, usecols=None) -> pd.DataFrame:
+    # the original chunk scan, used when there is no (valid) index
+    out = []
+    for chunk in pd.read_csv(csv_path, chunksize=200000, usecols=usecols):
+        cols = {c.strip().lower(): c for c in chunk.columns}
+        tcol = cols.get("ticker")
+        m = (chunk[tcol] == ticker) if tcol else pd.Series(True, index=chunk.index)
+        if m.any():
+            out.append(chunk.loc[m])
+        elif out:
+            break
+    if not out:
+        return pd.DataFrame()
+    return pd.concat(out, ignore_index=True)
+
+def read_ticker_rows(csv_path: Path, ticker: str, usecols=None) -> pd.DataFrame:
+    """
+    Rows of csv_path for one ticker, columns stripped + lower-cased.
+    Seeks straight to the ticker's block when a valid index exists, otherwise
+    falls back to the chunk scan. Returns an empty frame when nothing matches.
+    """
+    csv_path = Path(csv_path)
+    if not csv_path.exists():
+        return pd.DataFrame()
+
+    idx = load_index(csv_path)
+    if idx is None:
+        df = _scan_ticker_rows(csv_path, ticker, usecols=usecols)
+    else:
+        span = idx["tickers"].get(str(ticker))
+        if span is None:
+            return pd.DataFrame()
+        with open(csv_path, "rb") as f:
+            header = f.read(idx["header_len"])
+            f.seek(span[0])
+            block = f.read(span[1])
+        df = pd.read_csv(io.BytesIO(header + block), usecols=usecols)
+        # belt and braces: keep only the ticker's rows even if the block is off
+        tcol = next((c for c in df.columns if str(c).strip().lower() == "ticker"), None)
+        if tcol is not None:
+            df = df.loc[df[tcol] == ticker].reset_index(drop=True)
+
+    if df.empty:
+        return pd.DataFrame()
+    df.columns = [str(c).strip().lower() for c in df.columns]
+    return df
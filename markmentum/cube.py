@@ -0,0 +1,153 @@
+# markmentum/cube.py
+#
+# Memory-mapped history cube: every numeric Deep Dive series packed into one
+# dense float32 array  ticker × date × metric, with lookup tables.
+#   data/_cube/cube.f32     raw float32, C-order, shape (n_tickers, n_dates, n_metrics)
+#   data/_cube/cube.json    tickers, dates (ISO), metrics ("g6:z-score rank", ...), shape, snapshot
+# np.memmap maps the file read-only, so every Streamlit worker process shares one
+# page-cache copy and a ticker's history is the O(1) slice cube[ticker_idx].
+# Missing observations are NaN (weekly / monthly series are sparse on the date axis).
+
+import json
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from markmentum import store
+from markmentum.bundle import BUNDLE_PARTS
+from markmentum.snapshot import snapshot_version
+
+CUBE_DIRNAME = "_cube"
+CUBE_VERSION = 1
+
+# per-date series only: the stat box is one row, graph 12 is a two-date scatter
+CUBE_PARTS = [k for k in BUNDLE_PARTS if k not in ("stats", "g12")]
+
+
+# -------------------------
+# Helpers
+# -------------------------
+def cube_paths(data_dir: Path) -> tuple[Path, Path]:
+    d = Path(data_dir) / CUBE_DIRNAME
+    return d / "cube.f32", d / "cube.json"
+
+def metric_name(part: str, col: str) -> str:
+    return f"{part}:{col}"
+
+def _load_numeric_part(path: Path) -> pd.DataFrame:
+    df = store.read_table(path)
+    df.columns = [str(c).strip().lower() for c in df.columns]
+    if "ticker" not in df.columns or "date" not in df.columns:
+        return pd.DataFrame()
+    df["date"] = pd.to_datetime(df["date"], errors="coerce").dt.normalize()
+    df["ticker"] = df["ticker"].astype(str)
+    df = df.dropna(subset=["date"])
+    keep = ["ticker", "date"] + [c for c in df.columns
+                                 if c not in ("ticker", "date") and pd.api.types.is_numeric_dtype(df[c])]
+    return df[keep]
+
+
+# -------------------------
+# Ingest
+# -------------------------
+def build_cube(data_dir: Path) -> tuple[int, int, int]:
+    """Write cube.f32 + cube.json. Returns the shape (0, 0, 0 when nothing to pack)."""
+    data_dir = Path(data_dir)
+    parts = {}
+    for key in CUBE_PARTS:
+        p = data_dir / BUNDLE_PARTS[key]
+        if p.exists():
+            df = _load_numeric_part(p)
+            if not df.empty and df.shape[1] > 2:
+                parts[key] = df
+    if not parts:
+        return (0, 0, 0)
+
+    tickers = np.array(sorted({t for df in parts.values() for t in df["ticker"].unique()}))
+    dates = np.array(sorted({d for df in parts.values() for d in df["date"].unique()}),
+                     dtype="datetime64[ns]")
+    metrics = [metric_name(k, c) for k, df in parts.items() for c in df.columns[2:]]
+    shape = (len(tickers), len(dates), len(metrics))
+
+    f32, meta_path = cube_paths(data_dir)
+    f32.parent.mkdir(parents=True, exist_ok=True)
+    tmp = f32.with_suffix(".tmp")
+    cube = np.memmap(tmp, dtype=np.float32, mode="w+", shape=shape)
+    cube[:] = np.nan
+
+    j = 0
+    for key, df in parts.items():
+        ti = np.searchsorted(tickers, df["ticker"].to_numpy())
+        di = np.searchsorted(dates, df["date"].to_numpy())
+        for c in df.columns[2:]:
+            cube[ti, di, j] = df[c].to_numpy(dtype=np.float32, na_value=np.nan)
+            j += 1
+    cube.flush()
+    del cube
+    tmp.replace(f32)
+
+    meta = {
+        "version": CUBE_VERSION,
+        "snapshot": snapshot_version(data_dir),
+        "shape": list(shape),
+        "tickers": tickers.tolist(),
+        "dates": [str(d)[:10] for d in dates.astype("datetime64[D]")],
+        "metrics": metrics,
+    }
+    meta_path.write_text(json.dumps(meta), encoding="utf-8")
+    return shape
+
+
+# -------------------------
+# Runtime
+# -------------------------
+class HistoryCube:
+    """Read-only view over cube.f32 with ticker / date / metric lookups."""
+
+    def __init__(self, f32: Path, meta: dict):
+        self.shape = tuple(meta["shape"])
+        self.data = np.memmap(f32, dtype=np.float32, mode="r", shape=self.shape)
+        self.tickers = {t: i for i, t in enumerate(meta["tickers"])}
+        self.metrics = {m: j for j, m in enumerate(meta["metrics"])}
+        self.dates = np.array(meta["dates"], dtype="datetime64[D]").astype("datetime64[ns]")
+
+    def has_part(self, part: str) -> bool:
+        prefix = f"{part}:"
+        return any(m.startswith(prefix) for m in self.metrics)
+
+    def series(self, ticker: str, metric: str) -> np.ndarray | None:
+        """One metric's full date axis for a ticker (a strided view, no copy)."""
+        i, j = self.tickers.get(ticker), self.metrics.get(metric)
+        if i is None or j is None:
+            return None
+        return self.data[i, :, j]
+
+    def part_frame(self, part: str, ticker: str) -> pd.DataFrame:
+        """
+        All metrics of one graph part for a ticker in export shape
+        (date, ticker, <lower-cased columns>), only dates with data.
+        """
+        prefix = f"{part}:"
+        cols = [(m[len(prefix):], j) for m, j in self.metrics.items() if m.startswith(prefix)]
+        i = self.tickers.get(ticker)
+        if i is None or not cols:
+            return pd.DataFrame()
+        block = self.data[i][:, [j for _, j in cols]]          # (n_dates, n_cols)
+        keep = ~np.isnan(block).all(axis=1)
+        df = pd.DataFrame(block[keep].astype(np.float64), columns=[c for c, _ in cols])
+        df.insert(0, "date", self.dates[keep])
+        df.insert(1, "ticker", ticker)
+        return df
+
+
+def open_cube(data_dir: Path, snapshot: str) -> HistoryCube | None:
+    """The cube for this snapshot, or None when missing / built from other data."""
+    f32, meta_path = cube_paths(data_dir)
+    try:
+        meta = json.loads(meta_path.read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        return None
+    if meta.get("version") != CUBE_VERSION or meta.get("snapshot") != snapshot or not f32.exists():
+        return None
+    return HistoryCube(f32, meta)
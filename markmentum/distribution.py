@@ -0,0 +1,87 @@
+# markmentum/distribution.py
+#
+# Markmentum score distributions for the Market Overview cards. The
+# "Markmentum Score Change Distribution" (72 / 57 / 63 / 69) and "Markmentum
+# Score Histogram" (31) cards used to read pre-exported Score_Bin,TickerCount
+# files; the counts are binned here from the fact table instead:
+#
+#   bin_counts()    np.digitize + np.bincount into the five score bins
+#   bin_table()     counts for the universe and every category in one
+#                   bincount, memoised per (metric, snapshot)
+#   distribution()  an export-shaped Score_Bin,TickerCount frame by export id,
+#                   optionally for one category
+#
+# Bins are closed on the left like the exports: -25 counts in "-25 to 25",
+# 100 in "Above 100". Empty bins are left out, as the exports' GROUP BY did.
+
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from markmentum import store
+from markmentum.facts import load_facts
+from markmentum.registry import shared_cache
+
+SCORE_EDGES = (-100.0, -25.0, 25.0, 100.0)
+SCORE_BINS = ("Below -100", "-100 to -25", "-25 to 25", "25 to 100", "Above 100")
+
+# export id -> binned fact-table column
+DISTRIBUTIONS = {
+    31: "model_score",                 # Daily score histogram
+    72: "model_score_daily_change",    # score change distribution by timeframe
+    57: "model_score_wtd_change",
+    63: "model_score_mtd_change",
+    69: "model_score_qtd_change",
+}
+
+
+# -------------------------
+# Core
+# -------------------------
+def bin_counts(values, edges=SCORE_EDGES) -> np.ndarray:
+    """Counts per bin (len(edges) + 1 bins, left-closed); NaN is not counted."""
+    v = np.asarray(values, dtype=float)
+    v = v[~np.isnan(v)]
+    return np.bincount(np.digitize(v, edges), minlength=len(edges) + 1)
+
+@shared_cache
+def bin_table(metric: str, data_dir: Path, snapshot: str) -> dict:
+    """{None: universe counts, category: counts} for one fact-table column."""
+    frame = load_facts(data_dir, snapshot, ["Category", metric])
+    if metric not in frame.columns:
+        return {}
+    values = frame[metric].to_numpy(dtype=float)
+    bins = np.digitize(values, SCORE_EDGES)
+    cat = frame["Category"].cat
+    codes = cat.codes.to_numpy().astype(np.intp)    # int8 codes would overflow below
+    keep = ~np.isnan(values) & (codes >= 0)
+    nb = len(SCORE_BINS)
+    flat = np.bincount(codes[keep] * nb + bins[keep], minlength=len(cat.categories) * nb)
+    out = {None: bin_counts(values)}
+    out.update({str(c): row for c, row in zip(cat.categories, flat.reshape(-1, nb))})
+    return out
+
+
+# -------------------------
+# Cards
+# -------------------------
+def counts_frame(counts) -> pd.DataFrame:
+    """Score_Bin, TickerCount rows for the non-empty bins."""
+    counts = np.asarray(counts)
+    nz = np.flatnonzero(counts)
+    return pd.DataFrame({"Score_Bin": np.asarray(SCORE_BINS, dtype=object)[nz], "TickerCount": counts[nz]})
+
+def distribution(n: int, data_dir: Path, snapshot: str, category: str | None = None) -> pd.DataFrame:
+    """
+    Distribution card n as Score_Bin, TickerCount (universe, or one category);
+    ids outside DISTRIBUTIONS are read from qry_graph_data_<n>.csv.
+    """
+    metric = DISTRIBUTIONS.get(n)
+    if metric is None:
+        p = Path(data_dir) / f"qry_graph_data_{n}.csv"
+        return store.read_table(p) if p.exists() else pd.DataFrame()
+    table = bin_table(metric, data_dir, snapshot)
+    if not table:
+        return pd.DataFrame()
+    return counts_frame(table.get(category, np.zeros(len(SCORE_BINS), dtype=np.intp)))
@@ -0,0 +1,84 @@
+# markmentum/downsample.py
+#
+# Largest-Triangle-Three-Buckets (LTTB) downsampling for the Deep Dive line
+# charts. A chart is about 1,500 pixels wide once saved; past that, more
+# points cost render time without changing what is drawn. LTTB keeps the
+# first and last point and, per bucket, the point spanning the largest
+# triangle with its neighbours – so peaks and troughs survive.
+#
+#   lttb()            indices to keep for one (x, y) series
+#   downsample()      rows of a graph frame to keep for several series (union)
+#   point_budget()    points per series: MM_LTTB_POINTS (default 1500, 0 = off)
+#
+# Frames at or under the budget pass through untouched, so charts only change
+# once a history grows past it.
+
+import os
+
+import numpy as np
+import pandas as pd
+
+DEFAULT_POINTS = 1500
+
+
+def point_budget() -> int:
+    """Points kept per series; 0 (or anything under 3) turns downsampling off."""
+    return max(0, int(os.environ.get("MM_LTTB_POINTS", DEFAULT_POINTS)))
+
+
+# -------------------------
+# Core
+# -------------------------
+def lttb(x: np.ndarray, y: np.ndarray, n_out: int) -> np.ndarray:
+    """
+    Sorted indices of the n_out points LTTB keeps from (x, y); x ascending,
+    no NaN. Every index when n_out >= len(x) or n_out < 3.
+    """
+    x = np.asarray(x, dtype=float)
+    y = np.asarray(y, dtype=float)
+    n = len(x)
+    if n_out >= n or n_out < 3:
+        return np.arange(n)
+    # n_out - 2 buckets over the inner points 1 .. n-2; the last one's neighbour is the final point
+    edges = np.linspace(1, n - 1, n_out - 1).astype(np.intp)
+    lo, sizes = edges[:-1], np.diff(edges)
+    # centroids of every bucket and of the final point do not depend on the picks:
+    # one reduceat; bucket i is compared against centroid i + 1
+    counts = np.diff(np.append(edges, n))
+    cx = (np.add.reduceat(x, edges) / counts)[1:]
+    cy = (np.add.reduceat(y, edges) / counts)[1:]
+    # buckets as rows of a padded matrix (padding repeats the bucket's first point)
+    col = np.arange(sizes.max())
+    pos = lo[:, None] + np.minimum(col[None, :], sizes[:, None] - 1)
+    bx, by = x[pos], y[pos]
+    out = np.empty(n_out, dtype=np.intp)
+    out[0], out[-1] = 0, n - 1
+    ax_, ay = x[0], y[0]
+    for i in range(n_out - 2):
+        # twice the triangle area (previous pick, candidate, next bucket's centroid)
+        area = np.abs((ax_ - cx[i]) * (by[i] - ay) - (ax_ - bx[i]) * (cy[i] - ay))
+        j = area.argmax()
+        out[i + 1] = pos[i, j]
+        ax_, ay = bx[i, j], by[i, j]
+    return out
+
+def downsample(df: pd.DataFrame, columns, budget: int, date_col: str = "date") -> pd.DataFrame:
+    """
+    Rows of df kept by LTTB on every column in `columns` (their union), about
+    `budget` points per column plus each column's highest and lowest point. df
+    as it is when it has no more rows than the budget.
+    """
+    if budget < 3 or len(df) <= budget:
+        return df
+    x = df[date_col].to_numpy(dtype="datetime64[ns]").astype(np.int64)
+    x = (x - x[0]) / 86_400e9                               # days: keeps the areas well scaled
+    keep = np.zeros(len(df), dtype=bool)
+    for c in columns:
+        y = df[c].to_numpy(dtype=float)
+        nan = np.isnan(y)
+        rows = np.flatnonzero(~nan)
+        keep[rows[lttb(x[rows], y[rows], budget)]] = True
+        if len(rows):                                       # LTTB favours, but does not promise, the extremes
+            keep[rows[[y[rows].argmax(), y[rows].argmin()]]] = True
+        keep |= nan & ~np.r_[False, nan[:-1]]              # first row of each gap: lines still break
+    return df.iloc[np.flatnonzero(keep)]
@@ -0,0 +1,172 @@
+# markmentum/facts.py
+#
+# Latest-snapshot fact table: one typed row per ticker for the as-of date,
+# joining every cross-sectional export the heatmap / leader pages read.
+#   data/_facts/facts.feather   Ticker, Ticker_name, Category, Exposure, Date, <metrics ...>
+#   data/_facts/_meta.json      version, snapshot, column -> source export
+#
+# Each export is cut to its latest row per ticker once, here, instead of every
+# page running sort_values().drop_duplicates("Ticker") and merging three to six
+# files per run. Ticker / Category / Exposure are categoricals; metric columns
+# keep their export names. When two exports carry the same column the first
+# one in FACT_SOURCES wins (the copies agree; previous_model_score and
+# previous_Sharpe_Rank therefore mean the previous *day*). Labels and Date are
+# filled from whichever export has the ticker.
+#
+# load_facts() is what the pages call: the Feather file when it matches the
+# snapshot, else the same frame built from the exports in memory.
+
+import json
+import threading
+from pathlib import Path
+
+import pandas as pd
+
+from markmentum import store
+from markmentum.snapshot import snapshot_version
+
+FACTS_DIRNAME = "_facts"
+FACTS_VERSION = 1
+
+KEY = "Ticker"
+LABEL_COLUMNS = ("Ticker_name", "Category", "Exposure", "Date")
+CATEGORICAL = ("Ticker", "Category", "Exposure")
+
+# join order = column precedence
+FACT_SOURCES = (
+    "ticker_data.csv",                 # Close, day/week/month/quarter_pct_change
+    "model_score.csv",                 # model_score
+    "model_score_day_change.csv",      # previous_model_score, model_score_daily_change
+    "model_score_wtd_change.csv",
+    "model_score_mtd_change.csv",
+    "model_score_qtd_change.csv",
+    "model_score_calc.csv",            # ranges, trends, Sharpe, prem/disc
+    "qry_graph_data_25.csv",           # stat box: Ivol, rvol, rating, up/down
+    "qry_graph_data_48.csv",           # Sharpe_Rank + daily change
+    "qry_graph_data_49.csv",           # Sharpe_Rank_wtd_change
+    "qry_graph_data_50.csv",           # Sharpe_Rank_mtd_change
+    "qry_graph_data_51.csv",           # Sharpe_Rank_qtd_change
+    "qry_graph_data_88.csv",           # st/mt/lt trend + changes
+    "market_read_day.csv",
+    "market_read_wtd.csv",
+    "market_read_mtd.csv",
+    "market_read_qtd.csv",
+)
+
+_lock = threading.Lock()
+_built: dict = {}          # (data dir, snapshot) -> in-memory fallback frame (last one only)
+
+
+# -------------------------
+# Helpers
+# -------------------------
+def facts_paths(data_dir: Path) -> tuple[Path, Path]:
+    d = Path(data_dir) / FACTS_DIRNAME
+    return d / "facts.feather", d / "_meta.json"
+
+def _latest_rows(path: Path) -> pd.DataFrame:
+    # one row per ticker: the latest Date (files without a Date keep their first row)
+    df = store.read_table(path)
+    if KEY not in df.columns or df.empty:
+        return pd.DataFrame()
+    df[KEY] = df[KEY].astype(str)
+    if "Date" in df.columns:
+        df["Date"] = pd.to_datetime(df["Date"], errors="coerce")
+        df = df.sort_values([KEY, "Date"], kind="stable", na_position="first")
+        df = df.drop_duplicates(KEY, keep="last")
+    else:
+        df = df.drop_duplicates(KEY, keep="first")
+    return df.set_index(KEY)
+
+def _wanted(available, columns) -> list[str]:
+    # Ticker first, then the requested columns that exist (unknown names are dropped)
+    have = set(available)
+    return [c for c in dict.fromkeys([KEY, *columns]) if c in have]
+
+
+# -------------------------
+# Build
+# -------------------------
+def build_frame(data_dir: Path) -> tuple[pd.DataFrame, dict]:
+    """The joined fact table and its column -> source map (empty when no export exists)."""
+    data_dir = Path(data_dir)
+    labels, parts, sources = None, [], {}
+    for name in FACT_SOURCES:
+        p = data_dir / name
+        if not p.exists():
+            continue
+        df = _latest_rows(p)
+        if df.empty:
+            continue
+        lab = df[[c for c in LABEL_COLUMNS if c in df.columns]]
+        labels = lab if labels is None else labels.combine_first(lab)
+        new = [c for c in df.columns if c not in LABEL_COLUMNS and c not in sources]
+        sources.update({c: name for c in new})
+        parts.append(df[new])
+    if labels is None:
+        return pd.DataFrame(), {}
+
+    labels = labels[[c for c in LABEL_COLUMNS if c in labels.columns]]
+    wide = pd.concat([labels, *parts], axis=1, join="outer").sort_index()
+    wide.index.name = KEY
+    wide = wide.reset_index()
+    for c in CATEGORICAL:
+        if c in wide.columns:
+            wide[c] = wide[c].astype("category")
+    return wide, sources
+
+def write_facts(data_dir: Path) -> tuple[int, int]:
+    """Write facts.feather + _meta.json. Returns (tickers, columns); (0, 0) without pyarrow."""
+    if store.pa is None:
+        return 0, 0
+    data_dir = Path(data_dir)
+    wide, sources = build_frame(data_dir)
+    if wide.empty:
+        return 0, 0
+    fp, meta_path = facts_paths(data_dir)
+    fp.parent.mkdir(parents=True, exist_ok=True)
+    tmp = fp.with_suffix(".tmp")
+    store.feather.write_feather(wide, tmp, compression="uncompressed")
+    tmp.replace(fp)
+    meta = {"version": FACTS_VERSION, "snapshot": snapshot_version(data_dir),
+            "tickers": len(wide), "sources": sources}
+    meta_path.write_text(json.dumps(meta), encoding="utf-8")
+    return len(wide), wide.shape[1]
+
+
+# -------------------------
+# Load
+# -------------------------
+def read_facts(data_dir: Path, snapshot: str, columns=None) -> pd.DataFrame | None:
+    """
+    The fact table (Ticker + the requested columns that exist), or None when the
+    file is missing / built from another snapshot.
+    """
+    if store.pa is None:
+        return None
+    fp, meta_path = facts_paths(data_dir)
+    try:
+        meta = json.loads(meta_path.read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        return None
+    if meta.get("version") != FACTS_VERSION or meta.get("snapshot") != snapshot or not fp.exists():
+        return None
+    table = store.feather.read_table(fp, memory_map=True)
+    if columns is not None:
+        table = table.select(_wanted(table.column_names, columns))
+    return table.to_pandas()
+
+def load_facts(data_dir: Path, snapshot: str, columns=None) -> pd.DataFrame:
+    """read_facts(), falling back to build_frame() (memoised per snapshot) when the file is not usable."""
+    df = read_facts(data_dir, snapshot, columns)
+    if df is not None:
+        return df
+    key = (str(Path(data_dir).resolve()), snapshot)
+    with _lock:
+        wide = _built.get(key)
+    if wide is None:
+        wide, _ = build_frame(data_dir)
+        with _lock:
+            _built.clear()
+            _built[key] = wide
+    return (wide if columns is None else wide[_wanted(wide.columns, columns)]).copy()
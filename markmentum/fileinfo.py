@@ -0,0 +1,42 @@
+# markmentum/fileinfo.py
+#
+# Source-file stamps for derived data. Every derived file records the size,
+# mtime and sha1 of the CSV it was built from, and is only trusted while the
+# CSV still matches. mtime changes on every git checkout, so on an mtime
+# mismatch we fall back to the content hash (once per file version, memoized).
+
+import hashlib
+from pathlib import Path
+
+# (path, mtime_ns, size) -> sha1
+_DIGEST_MEMO: dict = {}
+
+
+def file_digest(path: Path) -> str:
+    path = Path(path)
+    st_ = path.stat()
+    key = (str(path), st_.st_mtime_ns, st_.st_size)
+    if key not in _DIGEST_MEMO:
+        h = hashlib.sha1()
+        with open(path, "rb") as f:
+            for block in iter(lambda: f.read(1 << 20), b""):
+                h.update(block)
+        _DIGEST_MEMO[key] = h.hexdigest()
+    return _DIGEST_MEMO[key]
+
+def source_stamp(path: Path) -> dict:
+    st_ = Path(path).stat()
+    return {"size": st_.st_size, "mtime_ns": st_.st_mtime_ns, "sha1": file_digest(path)}
+
+def matches_source(path: Path, stamp: dict | None) -> bool:
+    if not stamp:
+        return False
+    try:
+        st_ = Path(path).stat()
+    except OSError:
+        return False
+    if stamp.get("size") != st_.st_size:
+        return False
+    if stamp.get("mtime_ns") == st_.st_mtime_ns:
+        return True
+    return stamp.get("sha1") == file_digest(path)
@@ -0,0 +1,537 @@
+# markmentum/graphs.py
+#
+# Deep Dive graph registry: every chart on the Deep Dive page is one GraphSpec
+# (source export, column aliases, scaling, chart kind, title), and one engine
+# loads, normalises and draws any of them.
+#
+#   load_graph_frames(data_dir, ticker, snapshot)   -> {gid: frame}, one pass per ticker
+#   render_figure(spec, df, ticker)                 -> matplotlib Figure (Agg canvas)
+#
+# Frames come from the resampled period bars (markmentum.resample) where they
+# cover the graph, else the history cube, else the ticker bundle, else the
+# export itself (same fallbacks as the rest of the Deep Dive). The quarterly
+# graphs (26 / 27) exist only as resampled bars. Canonical column names
+# are the spec's keys, so a renderer never looks at export spellings.
+#
+# Fraction-vs-percent: specs with scale="auto" used to check max(|x|) <= 1 on
+# every load. The ingest stage now decides once per export and records the factor
+# in data/_graphs.json; without it the factors are computed once per snapshot.
+#
+# Line charts are thinned with LTTB to MM_LTTB_POINTS per series before drawing
+# (markmentum.downsample), and date ticks widen past MAX_X_TICKS, so render time
+# stops growing with history depth.
+#
+# Drawing uses the object-oriented Figure + FigureCanvasAgg API only – no pyplot
+# figure manager, no per-render rcParams – so sessions on different Streamlit
+# threads can render at the same time. CHART_RC is applied once, on import.
+
+import json
+import math
+from dataclasses import dataclass
+from pathlib import Path
+
+import matplotlib
+import matplotlib.dates as mdates
+import numpy as np
+import pandas as pd
+from matplotlib.backends.backend_agg import FigureCanvasAgg
+from matplotlib.figure import Figure
+from matplotlib.lines import Line2D
+from matplotlib.ticker import PercentFormatter, StrMethodFormatter
+
+from markmentum import bundle, resample, store
+from markmentum.bundle import BUNDLE_PARTS
+from markmentum.cube import open_cube
+from markmentum.downsample import downsample, point_budget
+
+SCALES_NAME = "_graphs.json"
+SCALES_VERSION = 1
+
+EXCEL_BLUE   = "#4472C4"
+EXCEL_ORANGE = "#FFC000"
+EXCEL_GRAY   = "#A6A6A6"
+EXCEL_BLACK  = "#000000"
+
+# font stack of the Deep Dive charts (the page and the pre-render apply it)
+CHART_RC = {
+    "font.family": ["sans-serif"],
+    "font.sans-serif": ["Segoe UI", "Arial", "Helvetica", "DejaVu Sans", "Liberation Sans", "sans-serif"],
+}
+
+# process start-up: set once here, before any render thread reads rcParams
+matplotlib.rcParams.update(CHART_RC)
+
+# snapshot -> {part: factor}
+_SCALES_MEMO: dict = {}
+
+
+# -------------------------
+# Specs
+# -------------------------
+@dataclass(frozen=True)
+class GraphSpec:
+    gid: int
+    title: str                        # drawn as "<TICKER> – <title>"
+    kind: str                         # ranges | lines | band | bars | rank | dual | scatter
+    columns: tuple                    # ((canonical, (export aliases…)), …) – all required
+    empty: str = "No data."           # st.info text when the ticker has no rows
+    scale: object = None              # None | float | "auto" (fraction -> percent, decided at ingest)
+    scaled: tuple = ()                # canonical columns the scale applies to (default: all)
+    yfmt: str | None = None           # "percent" | StrMethodFormatter pattern | None
+    locator: str = "biweekly"         # biweekly | monthly | quarterly
+    label: str = ""                   # legend label of the main series (band / lines)
+    series: tuple = ()                # lines: ((column, label, color), …)
+    line_width: float = 1.6
+    avg_color: str = "black"
+    avg_width: float = 1.6
+    bar_width: float = 1.0
+    band_ylim: bool = False           # y-limits cover the bands too
+    watermark: bool = True
+
+    @property
+    def part(self) -> str:
+        return f"g{self.gid}"
+
+    @property
+    def export_columns(self) -> list[str]:
+        """date + every alias: the projection a load asks the store for."""
+        return ["date", *(a for _, aliases in self.columns for a in aliases)]
+
+    @property
+    def source(self) -> str:
+        return BUNDLE_PARTS.get(self.part, "")      # "" for resampled-only graphs
+
+
+def _band(value: tuple, avg: tuple, hi: tuple, lo: tuple) -> tuple:
+    return (("value", value), ("avg", avg), ("hi", hi), ("lo", lo))
+
+def _suffixed(stem: str, lo: str = "lo") -> tuple:
+    return _band((stem,), (f"{stem}_avg",), (f"{stem}_hi",), (f"{stem}_{lo}",))
+
+# informational charts (13–24) render smaller lines and no watermark
+_INFO = dict(line_width=1.2, avg_width=1.2, watermark=False)
+
+GRAPH_SPECS = [
+    GraphSpec(1, "Probable Ranges", "ranges",
+              (("close", ("close",)),
+               ("day_pr_low", ("day_pr_low",)), ("day_pr_high", ("day_pr_high",)),
+               ("week_pr_low", ("week_pr_low",)), ("week_pr_high", ("week_pr_high",)),
+               ("month_pr_low", ("month_pr_low",)), ("month_pr_high", ("month_pr_high",))),
+              empty="No data available for the selected ticker/timeframe."),
+    GraphSpec(2, "Trend Lines", "lines",
+              (("st", ("st_trend",)), ("mt", ("mt_trend",)), ("lt", ("lt_trend",))),
+              empty="No trend data.", scale="auto", yfmt="percent",
+              series=(("st", "Short Term", EXCEL_BLUE), ("mt", "Mid Term", EXCEL_ORANGE),
+                      ("lt", "Long Term", "black"))),
+    GraphSpec(3, "Probable Anchors", "lines",
+              (("close", ("close",)), ("mt_pb_anchor", ("mt_pb_anchor",)),
+               ("lt_pb_anchor", ("lt_pb_anchor",))),
+              empty="No anchor data.", yfmt="{x:,.0f}",
+              series=(("close", "Close", EXCEL_BLUE),
+                      ("mt_pb_anchor", "Mid Term Probable Anchor", EXCEL_ORANGE),
+                      ("lt_pb_anchor", "Long Term Probable Anchor", "black"))),
+    GraphSpec(4, "Price to Long Term Probable Anchor", "band", _suffixed("gap_lt"),
+              empty="No gap data.", yfmt="{x:,.2f}", label="Gap to LT Anchor", band_ylim=True),
+    GraphSpec(5, "30-Day Rvol Z-Score", "band",
+              _band(("z-score", "zscore"), ("z-score_avg", "zscore_avg"),
+                    ("z-score_hi", "zscore_hi"), ("z-score_lo", "zscore_lo")),
+              empty="No Z-Score data.", yfmt="{x:,.2f}", label="Z-Score"),
+    GraphSpec(6, "Z-Score Percentile Rank", "rank",
+              (("rank", ("z-score rank", "zscore rank", "zscore_rank", "z_rank", "rank")),),
+              empty="No percentile rank data.", scale="auto"),
+    GraphSpec(7, "Rvol 30-Day", "band", _suffixed("rvol", lo="low"),
+              empty="No rVol data.", scale="auto", yfmt="percent", label="Rvol 30d"),
+    GraphSpec(8, "30-Day Sharpe Ratio", "band",
+              _band(("sharpe_ratio", "sharpe"), ("sharpe_avg",), ("sharpe_hi",),
+                    ("sharpe_lo", "sharpe_low")),
+              empty="No Sharpe data.", yfmt="{x:,.2f}", label="Sharpe Ratio"),
+    GraphSpec(9, "Sharpe Ratio Percentile Rank", "rank",
+              (("rank", ("sharpe_rank", "sharpe percentile", "percentile", "rank")),),
+              empty="No Sharpe rank data.", scale="auto"),
+    GraphSpec(10, "Ivol Prem/Disc", "band",
+              _band(("prem_disc", "ivol_p/d", "ivol_pd"), ("prem_disc_avg", "ivol_avg"),
+                    ("prem_disc_hi", "ivol_hi"), ("prem_disc_lo", "ivol_lo", "ivol_low")),
+              empty="No Prem/Disc data.", scale="auto", yfmt="percent", label="Prem/Disc"),
+    GraphSpec(11, "MM Score", "dual",
+              (("score", ("model_score",)), ("close", ("close",))),
+              empty="No Signal Score data."),
+    GraphSpec(12, "Ivol/Rvol % Spreads", "scatter",
+              (("z", ("zscore",)), ("pd", ("prem_disc",))),
+              empty="No scatter data.", scale=100.0, scaled=("pd",), yfmt="percent"),
+    GraphSpec(13, "Daily Returns", "bars",
+              _band(("daily_return_pct",), ("daily_return_avg_pct",),
+                    ("daily_return_hi_pct",), ("daily_return_lo_pct",)),
+              empty="No Daily Returns data.", scale="auto", yfmt="percent", bar_width=1.0, **_INFO),
+    GraphSpec(14, "Daily Range", "band", _suffixed("daily_range"),
+              empty="No Daily Range data.", label="Range", **_INFO),
+    GraphSpec(15, "Daily Volume", "band", _suffixed("daily_volume"),
+              empty="No Daily Volume data.", label="Volume", **_INFO),
+    GraphSpec(16, "Weekly Returns", "bars",
+              _band(("weekly_return_pct",), ("weekly_return_avg_pct",),
+                    ("weekly_return_hi_pct",), ("weekly_return_lo_pct",)),
+              empty="No Weekly Returns data.", scale="auto", yfmt="percent", bar_width=5.0, **_INFO),
+    GraphSpec(17, "Weekly Range", "band", _suffixed("weekly_range"),
+              empty="No Weekly Range data.", label="Range", **_INFO),
+    GraphSpec(18, "Weekly Volume", "band", _suffixed("weekly_volume"),
+              empty="No Weekly Volume data.", label="Volume", **_INFO),
+    GraphSpec(19, "Monthly Returns", "bars", _suffixed("monthly_return"),
+              empty="No Monthly Returns data.", scale="auto", yfmt="percent", bar_width=20.0,
+              locator="monthly", **_INFO),
+    GraphSpec(20, "Monthly Range", "band", _suffixed("monthly_range"),
+              empty="No Monthly Range data.", label="Range", locator="monthly", **_INFO),
+    GraphSpec(21, "Monthly Volume", "band", _suffixed("monthly_volume"),
+              empty="No Monthly Volume data.", label="Volume", locator="monthly", **_INFO),
+    GraphSpec(26, "Quarterly Returns", "bars", _suffixed("quarterly_return"),
+              empty="No Quarterly Returns data.", scale=100.0, yfmt="percent", bar_width=60.0,
+              locator="quarterly", **_INFO),
+    GraphSpec(27, "Quarterly Volume", "band", _suffixed("quarterly_volume"),
+              empty="No Quarterly Volume data.", label="Volume", locator="quarterly", **_INFO),
+    GraphSpec(22, "Short Term Trend Line", "band",
+              _band(("st_trend",), ("st_avg",), ("st_hi",), ("st_lo",)),
+              empty="No Short-Term Trend data.", scale="auto", yfmt="percent", locator="monthly",
+              label="Short Term Trend Line", line_width=1.6, avg_color="gray", avg_width=1.2,
+              watermark=False),
+    GraphSpec(23, "Mid Term Trend Line", "band",
+              _band(("mt_trend",), ("mt_avg",), ("mt_hi",), ("mt_lo",)),
+              empty="No Mid-Term Trend data.", scale="auto", yfmt="percent", locator="monthly",
+              label="Mid Term Trend Line", line_width=1.6, avg_color="gray", avg_width=1.2,
+              watermark=False),
+    GraphSpec(24, "Long Term Trend Line", "band",
+              _band(("lt_trend",), ("lt_avg",), ("lt_hi",), ("lt_lo",)),
+              empty="No Long-Term Trend data.", scale="auto", yfmt="percent", locator="monthly",
+              label="Long Term Trend Line", line_width=1.6, avg_color="gray", avg_width=1.2,
+              watermark=False),
+]
+GRAPHS = {s.gid: s for s in GRAPH_SPECS}
+
+
+# -------------------------
+# Scaling (fraction -> percent), decided once per export
+# -------------------------
+def _resolve(spec: GraphSpec, columns) -> dict | None:
+    """export column -> canonical name, or None when a required column is missing."""
+    cols = set(columns)
+    out = {}
+    for name, aliases in spec.columns:
+        hit = next((a for a in aliases if a in cols), None)
+        if hit is None:
+            return None
+        out[hit] = name
+    return out
+
+def _detect_scale(spec: GraphSpec, path: Path) -> float:
+    df = store.read_table(path, columns=spec.export_columns)
+    df.columns = [str(c).strip().lower() for c in df.columns]
+    cols = _resolve(spec, df.columns)
+    if cols is None:
+        return 1.0
+    scaled = set(spec.scaled or [n for n, _ in spec.columns])
+    vals = np.abs(np.concatenate([pd.to_numeric(df[c], errors="coerce").to_numpy(dtype=float)
+                                  for c, n in cols.items() if n in scaled]))
+    vals = vals[np.isfinite(vals)]
+    # whole export at once: a few outliers above 1 must not flip a fraction series
+    return 100.0 if vals.size and np.quantile(vals, 0.99) <= 1.0 else 1.0
+
+def detect_scales(data_dir: Path) -> dict:
+    data_dir = Path(data_dir)
+    out = {}
+    for spec in GRAPH_SPECS:
+        if spec.scale == "auto" and spec.source and (data_dir / spec.source).exists():
+            out[spec.part] = _detect_scale(spec, data_dir / spec.source)
+    return out
+
+def write_scales(data_dir: Path, snapshot: str) -> dict:
+    scales = detect_scales(data_dir)
+    out = Path(data_dir) / SCALES_NAME
+    tmp = out.with_suffix(".tmp")
+    tmp.write_text(json.dumps({"version": SCALES_VERSION, "snapshot": snapshot, "scales": scales},
+                              indent=1), encoding="utf-8")
+    tmp.replace(out)
+    return scales
+
+def graph_scales(data_dir: Path, snapshot: str) -> dict:
+    """part -> factor for this snapshot (from ingest; computed once per process otherwise)."""
+    if snapshot in _SCALES_MEMO:
+        return _SCALES_MEMO[snapshot]
+    try:
+        doc = json.loads((Path(data_dir) / SCALES_NAME).read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        doc = {}
+    if doc.get("version") == SCALES_VERSION and doc.get("snapshot") == snapshot:
+        scales = doc["scales"]
+    else:
+        scales = detect_scales(data_dir)
+    _SCALES_MEMO[snapshot] = scales
+    return scales
+
+def _factor(spec: GraphSpec, scales: dict) -> float:
+    if spec.scale == "auto":
+        return float(scales.get(spec.part, 1.0))
+    return float(spec.scale) if spec.scale is not None else 1.0
+
+
+# -------------------------
+# Load
+# -------------------------
+def normalize(spec: GraphSpec, raw: pd.DataFrame, factor: float = 1.0) -> pd.DataFrame:
+    """
+    Export-shaped rows -> date + canonical numeric columns, sorted by date and
+    indexed by the dates (an unnamed DatetimeIndex: the range windows slice it).
+    """
+    if raw is None or raw.empty or "date" not in raw.columns:
+        return pd.DataFrame()
+    cols = _resolve(spec, raw.columns)
+    if cols is None:
+        return pd.DataFrame()
+    df = raw[["date", *cols]].rename(columns=cols)
+    df["date"] = pd.to_datetime(df["date"], errors="coerce")
+    for name, _ in spec.columns:
+        df[name] = pd.to_numeric(df[name], errors="coerce")
+    if factor != 1.0:
+        scaled = list(spec.scaled or [n for n, _ in spec.columns])
+        df[scaled] = df[scaled] * factor
+    df = df.dropna(subset=["date"]).sort_values("date")
+    df.index = pd.DatetimeIndex(df["date"].to_numpy())
+    return df
+
+def load_graph_frames(data_dir: Path, ticker: str, snapshot: str, specs=None,
+                      history_cube=None, ticker_bundle=None, bars=None) -> dict:
+    """
+    {gid: normalised frame} for one ticker. The bars, the cube, the bundle and its
+    meta are opened once for the whole batch; callers that cache them can pass them in.
+    """
+    data_dir = Path(data_dir)
+    specs = GRAPH_SPECS if specs is None else specs
+    scales = graph_scales(data_dir, snapshot)
+    if bars is None:
+        bars = resample.load_bars(data_dir, snapshot)
+    if history_cube is None:
+        history_cube = open_cube(data_dir, snapshot)
+    if ticker_bundle is None:
+        ticker_bundle = bundle.read_bundle(data_dir, ticker, snapshot)
+    meta = bundle.bundle_meta(data_dir) if ticker_bundle is not None else None
+    bundle_parts = set(meta.get("parts", [])) if meta else set()
+
+    return {spec.gid: load_graph_frame(data_dir, spec, ticker, scales, history_cube,
+                                       ticker_bundle, bundle_parts, bars)
+            for spec in specs}
+
+def load_graph_frame(data_dir: Path, spec: GraphSpec, ticker: str, scales: dict,
+                     history_cube=None, ticker_bundle=None, bundle_parts=frozenset(),
+                     bars=None) -> pd.DataFrame:
+    """One graph's normalised frame: resampled bars, else cube, else bundle part, else the export itself."""
+    data_dir = Path(data_dir)
+    if bars is not None and bars.has_graph(spec.gid):
+        # resampled returns are fractions whatever the export's scale was
+        factor = 100.0 if spec.scale == "auto" else _factor(spec, scales)
+        return normalize(spec, bars.graph_frame(spec.gid, ticker), factor)
+    if history_cube is not None and history_cube.has_part(spec.part):
+        raw = history_cube.part_frame(spec.part, ticker)
+    elif ticker_bundle is not None and spec.part in bundle_parts:
+        raw = bundle.graph_frame(ticker_bundle, spec.part, ticker)
+    elif spec.source and (data_dir / spec.source).exists():
+        raw = store.read_ticker_rows(data_dir / spec.source, ticker, columns=spec.export_columns)
+    else:
+        raw = pd.DataFrame()
+    return normalize(spec, raw, _factor(spec, scales))
+
+
+# -------------------------
+# Render
+# -------------------------
+def add_mpl_watermark(ax, text: str = "Markmentum", alpha: float = 0.12,
+                      rotation: int = 30, fontsize: int = 36):
+    """Faint diagonal watermark across a Matplotlib Axes."""
+    ax.text(0.5, 0.5, text, transform=ax.transAxes, ha="center", va="center",
+            rotation=rotation, color="gray", alpha=alpha, fontsize=fontsize,
+            zorder=0, clip_on=True)
+
+# tick labels are laid out one by one; past this many, the cadence widens so a
+# long history costs as much to draw as a short one (today's spans stay under it)
+MAX_X_TICKS = 40
+
+def _date_locator(df: pd.DataFrame, locator: str):
+    span = (df["date"].max() - df["date"].min()).days
+    if locator == "quarterly":
+        step = math.ceil(span / 91.3 / MAX_X_TICKS)
+        return (mdates.MonthLocator(bymonth=(1, 4, 7, 10)) if step <= 1
+                else mdates.YearLocator(base=math.ceil(step / 4)))
+    if locator == "monthly":
+        return mdates.MonthLocator(interval=max(1, math.ceil(span / 30.4 / MAX_X_TICKS)))
+    step = math.ceil(span / 14 / MAX_X_TICKS)
+    if step <= 1:
+        return mdates.WeekdayLocator(byweekday=mdates.MO, interval=2)
+    # WeekdayLocator's interval counts days; a weekly rule widens by whole fortnights
+    return mdates.RRuleLocator(mdates.rrulewrapper(mdates.WEEKLY, byweekday=mdates.MO, interval=2 * step))
+
+def _time_axis(ax, df: pd.DataFrame, locator: str) -> None:
+    ax.xaxis.set_major_locator(_date_locator(df, locator))
+    ax.xaxis.set_major_formatter(mdates.DateFormatter("%m/%d/%y"))
+    for label in ax.get_xticklabels():
+        label.set(rotation=90, ha="center", fontsize=7)
+    pad = pd.Timedelta(days=5)
+    ax.set_xlim(df["date"].min() - pad, df["date"].max() + pad)
+
+def _y_format(ax, yfmt: str | None) -> None:
+    if yfmt == "percent":
+        ax.yaxis.set_major_formatter(PercentFormatter(xmax=100))
+    elif yfmt:
+        ax.yaxis.set_major_formatter(StrMethodFormatter(yfmt))
+
+def _legend_below(ax, ncol: int, handles=None) -> None:
+    ax.legend(handles=handles, loc="upper center", bbox_to_anchor=(0.5, -0.22),
+              ncol=ncol, frameon=False, handlelength=2.8, fontsize=9)
+
+def _band_lines(ax, spec: GraphSpec, df: pd.DataFrame) -> None:
+    # flat reference lines from the first row (constant per ticker)
+    ax.axhline(y=df["avg"].iloc[0], color=spec.avg_color, linewidth=spec.avg_width, label="Avg")
+    ax.axhline(y=df["hi"].iloc[0],  color="red",   linewidth=1.2, label="High")
+    ax.axhline(y=df["lo"].iloc[0],  color="green", linewidth=1.2, label="Low")
+
+
+def _draw_ranges(fig, ax, spec, df, ticker):
+    fig.subplots_adjust(left=0.035, right=0.995, top=0.86, bottom=0.30)
+    fig.set_facecolor("white")
+    for lo, hi, color, lw in (("day_pr_low", "day_pr_high", EXCEL_GRAY, 1),
+                              ("week_pr_low", "week_pr_high", EXCEL_ORANGE, 1),
+                              ("month_pr_low", "month_pr_high", EXCEL_BLACK, 1.2)):
+        ax.plot(df["date"], df[lo], color=color, linewidth=lw)
+        ax.plot(df["date"], df[hi], color=color, linewidth=lw)
+    ax.plot(df["date"], df["close"], color=EXCEL_BLUE, linewidth=1.5)
+
+    ax.xaxis.set_major_locator(_date_locator(df, "biweekly"))
+    ax.xaxis.set_major_formatter(mdates.DateFormatter("%m/%d/%y"))
+    ax.tick_params(axis="x", labelrotation=90, labelsize=8)
+    pad = pd.Timedelta(days=5)
+    ax.set_xlim(df["date"].min() - pad, df["date"].max() + pad)
+
+    ax.set_title(f"{ticker} – {spec.title}", fontsize=14, pad=4)
+    ax.grid(True, axis="both", alpha=0.18)
+    ax.tick_params(axis="y", labelsize=10)
+    handles = [
+        Line2D([], [], color=EXCEL_BLUE,   lw=1.5, label="Close"),
+        Line2D([], [], color=EXCEL_GRAY,   lw=2,   label="Day PR"),
+        Line2D([], [], color=EXCEL_ORANGE, lw=2,   label="Week PR"),
+        Line2D([], [], color=EXCEL_BLACK,  lw=2,   label="Month PR"),
+    ]
+    ax.legend(handles=handles, loc="upper center", ncol=4, frameon=False, bbox_to_anchor=(0.5, -0.23))
+
+def _draw_lines(fig, ax, spec, df, ticker):
+    for col, label, color in spec.series:
+        ax.plot(df["date"], df[col], label=label, linewidth=spec.line_width, color=color)
+    _legend_below(ax, ncol=len(spec.series))
+
+def _draw_band(fig, ax, spec, df, ticker):
+    ax.plot(df["date"], df["value"], color=EXCEL_BLUE, linewidth=spec.line_width, label=spec.label)
+    _band_lines(ax, spec, df)
+    if spec.band_ylim:
+        yvals = np.concatenate([df[c].to_numpy(dtype=float) for c in ("value", "avg", "hi", "lo")])
+        y_min, y_max = float(np.nanmin(yvals)), float(np.nanmax(yvals))
+        if y_min == y_max:
+            y_min -= 1.0; y_max += 1.0
+        y_pad = 0.08 * (y_max - y_min)
+        ax.set_ylim(y_min - y_pad, y_max + y_pad)
+    _legend_below(ax, ncol=4)
+
+def _draw_bars(fig, ax, spec, df, ticker):
+    vals = df["value"].to_numpy(dtype=float)
+    colors = np.where(vals >= 0, "green", "red")
+    ax.bar(df["date"], vals, width=spec.bar_width, color=colors, linewidth=0)
+    _band_lines(ax, spec, df)
+    handles = [
+        Line2D([0], [0], color=spec.avg_color, linewidth=spec.avg_width, label="Avg"),
+        Line2D([0], [0], color="red",   linewidth=1.2, label="High"),
+        Line2D([0], [0], color="green", linewidth=1.2, label="Low"),
+    ]
+    _legend_below(ax, ncol=3, handles=handles)
+
+def _draw_rank(fig, ax, spec, df, ticker):
+    ax.plot(df["date"], df["rank"], color=EXCEL_BLUE, linewidth=spec.line_width)
+    ax.set_ylim(0, 100)
+
+def _draw_dual(fig, ax, spec, df, ticker):
+    ax.plot(df["date"], df["score"], color=EXCEL_BLUE, linewidth=1.6, label="MM Score")
+    ax.set_ylim(-105, 105)
+    ax2 = ax.twinx()
+    ax2.plot(df["date"], df["close"], color="black", linewidth=1.4, label="Close")
+    handles = [
+        Line2D([0], [0], color=EXCEL_BLUE, linewidth=1.6, label="MM Score"),
+        Line2D([0], [0], color="black",    linewidth=1.4, label="Close"),
+    ]
+    _legend_below(ax, ncol=2, handles=handles)
+
+def _draw_scatter(fig, ax, spec, df, ticker):
+    # two points: ~30d prior and latest; zero-centred limits so both always fit
+    older, latest = df.iloc[0], df.iloc[-1]
+    ax.scatter([older["z"]],  [older["pd"]],  s=70, color=EXCEL_BLUE, zorder=4)
+    ax.scatter([latest["z"]], [latest["pd"]], s=90, color=EXCEL_BLUE, zorder=5)
+    ax.set_xlabel("Z-Score")
+    ax.set_ylabel("Ivol Prem/(Disc)")
+
+    x_abs = max(5.0, abs(float(df["z"].min())), abs(float(df["z"].max()))) * 1.10
+    ax.set_xlim(-np.ceil(x_abs * 2) / 2.0, np.ceil(x_abs * 2) / 2.0)       # 0.5 steps
+    y_abs = max(100.0, abs(float(df["pd"].min())), abs(float(df["pd"].max()))) * 1.10
+    ax.set_ylim(-np.ceil(y_abs / 10.0) * 10.0, np.ceil(y_abs / 10.0) * 10.0)  # 10% steps
+    ax.axhline(0.0, color="black", linewidth=1.0, zorder=1)
+    ax.axvline(0.0, color="black", linewidth=1.0, zorder=1)
+
+    for row in (older, latest):
+        dt = pd.to_datetime(row["date"], errors="coerce")
+        ax.annotate(dt.strftime("%m/%d/%Y") if pd.notna(dt) else str(row["date"]),
+                    (row["z"], row["pd"]), xytext=(0, -12), textcoords="offset points",
+                    ha="center", va="top", fontsize=8, zorder=6,
+                    bbox=dict(boxstyle="round,pad=0.2", fc="white", ec="none", alpha=0.9))
+    for text, xy, color in (("Mean Reversion", (0.10, 0.90), "green"),
+                            ("Crowded Short",  (0.90, 0.90), "green"),
+                            ("Crowded Long",   (0.10, 0.10), "red"),
+                            ("Mean Reversion", (0.90, 0.10), "red")):
+        ax.text(xy[0], xy[1], text, transform=ax.transAxes, ha="center", va="center", fontsize=10,
+                bbox=dict(boxstyle="round,pad=0.3", fc="white", ec=color, lw=1.2), zorder=3)
+
+_DRAW = {
+    "ranges": _draw_ranges,
+    "lines": _draw_lines,
+    "band": _draw_band,
+    "bars": _draw_bars,
+    "rank": _draw_rank,
+    "dual": _draw_dual,
+    "scatter": _draw_scatter,
+}
+
+# kinds drawn as lines; bands' avg / hi / lo are constant and never thinned
+_LINE_KINDS = ("ranges", "lines", "band", "rank", "dual")
+
+def _thin(spec: GraphSpec, df: pd.DataFrame) -> pd.DataFrame:
+    if spec.kind not in _LINE_KINDS:
+        return df
+    cols = [n for n, _ in spec.columns if n not in ("avg", "hi", "lo")]
+    return downsample(df, cols, point_budget())
+
+def _new_figure(figsize, dpi=None):
+    # a bare Figure on its own Agg canvas: nothing registered in pyplot's global state
+    fig = Figure(figsize=figsize, dpi=dpi)
+    FigureCanvasAgg(fig)
+    return fig, fig.subplots()
+
+def render_figure(spec: GraphSpec, df: pd.DataFrame, ticker: str) -> Figure:
+    """Draw one graph from its (windowed) frame. Safe to call from several threads."""
+    df = _thin(spec, df)
+    if spec.kind == "ranges":
+        fig, ax = _new_figure((12, 5))
+        _draw_ranges(fig, ax, spec, df, ticker)
+        add_mpl_watermark(ax)
+        return fig
+
+    fig, ax = _new_figure((9.5, 3.9), dpi=150)
+    _DRAW[spec.kind](fig, ax, spec, df, ticker)
+    if spec.watermark:
+        add_mpl_watermark(ax)
+    ax.set_title(f"{ticker} – {spec.title}", fontsize=12, pad=6)
+    _y_format(ax, spec.yfmt)
+    ax.grid(True, linewidth=0.4, alpha=0.4)
+    if spec.kind == "scatter":
+        fig.subplots_adjust(bottom=0.18)
+    else:
+        _time_axis(ax, df, spec.locator)
+        fig.subplots_adjust(bottom=0.22 if spec.kind == "rank" else 0.30)
+    return fig
@@ -0,0 +1,121 @@
+# markmentum/heatmap.py
+#
+# Heatmap engine for the Performance, Sharpe Rank and Markmentum heatmap pages.
+# The pages used to melt the universe with DataFrame.melt, take one robust
+# |max| per timeframe through groupby().apply and normalise every cell with a
+# row-wise apply(axis=1) – on every rerun, including a plain category switch.
+#
+#   robust_scales()  per-timeframe robust |max| in one nanquantile over a 2-D array
+#   melt()           wide -> long with np.tile / ravel (Timeframe is categorical)
+#   normalize()      value / scale[timeframe] clipped to [-1, 1], vectorised
+#   heatmap_spec()   the pages' rect heatmap as a Vega-Lite dict
+#   cached()         keeps any of the above in the process-wide frame registry
+#                    under (page, part, snapshot)
+#
+# The pages cache the normalised universe once per snapshot and one spec per
+# (page, category, snapshot), and draw it with st.vega_lite_chart – a category
+# switch is then a dictionary lookup. Streamlit only reads the spec (it copies
+# the top-level dict before moving the datasets out), so sharing it is safe.
+
+import altair as alt
+import numpy as np
+import pandas as pd
+
+from markmentum.registry import get_registry
+
+TIMEFRAME = "Timeframe"
+
+
+# -------------------------
+# Scales
+# -------------------------
+def _ceil_floor(v, floor: float, step: float):
+    return np.maximum(floor, np.ceil(v / step) * step)
+
+def robust_vmax(values, q: float = 0.98, floor: float = 1.0, step: float = 1.0) -> float:
+    """Symmetric colour limit: q-quantile of |values| rounded up to step, at least floor."""
+    v = np.abs(pd.to_numeric(pd.Series(values, copy=False), errors="coerce").to_numpy(dtype=float))
+    v = v[~np.isnan(v)]
+    if v.size == 0:
+        return float(floor)
+    return float(_ceil_floor(np.quantile(v, q), floor, step))
+
+def robust_scales(wide: pd.DataFrame, value_cols, labels=None, *, q: float = 0.98, floor: float = 1.0,
+                  step: float = 1.0, caps: dict | None = None) -> dict:
+    """robust_vmax of every value column at once -> {label: vmax}; caps = {label: upper bound}."""
+    labels = list(labels or value_cols)
+    arr = np.abs(wide[list(value_cols)].apply(pd.to_numeric, errors="coerce").to_numpy(dtype=float))
+    empty = np.isnan(arr).all(axis=0) if len(arr) else np.ones(len(labels), dtype=bool)
+    with np.errstate(all="ignore"):
+        qv = np.nanquantile(np.where(empty, 0.0, arr), q, axis=0) if len(arr) else np.zeros(len(labels))
+    vmax = np.where(empty, floor, _ceil_floor(qv, floor, step))
+    out = {lab: float(v) for lab, v in zip(labels, vmax)}
+    for lab, cap in (caps or {}).items():
+        if lab in out:
+            out[lab] = min(float(cap), out[lab])
+    return out
+
+
+# -------------------------
+# Long frames
+# -------------------------
+def melt(wide: pd.DataFrame, id_cols, value_cols, labels=None, value_name: str = "Value") -> pd.DataFrame:
+    """
+    DataFrame.melt equivalent (same row order: column by column) with the
+    timeframe column as a Categorical of labels (default: the column names).
+    """
+    id_cols, value_cols = list(id_cols), list(value_cols)
+    labels = list(labels or value_cols)
+    n, k = len(wide), len(value_cols)
+    out = {c: np.tile(wide[c].to_numpy(), k) for c in id_cols}
+    out[TIMEFRAME] = pd.Categorical.from_codes(np.repeat(np.arange(k), n), categories=labels)
+    values = wide[value_cols].apply(pd.to_numeric, errors="coerce").to_numpy(dtype=float)
+    out[value_name] = values.ravel(order="F")
+    return pd.DataFrame(out)
+
+def normalize(long: pd.DataFrame, scales: dict, value_name: str = "Value") -> np.ndarray:
+    """value / scales[timeframe], clipped to [-1, 1]; NaN stays NaN."""
+    tf = long[TIMEFRAME].cat
+    vmax = np.array([scales.get(lab, 1.0) or 1.0 for lab in tf.categories], dtype=float)
+    return np.clip(long[value_name].to_numpy(dtype=float) / vmax[tf.codes], -1.0, 1.0)
+
+
+# -------------------------
+# Spec
+# -------------------------
+def heatmap_spec(long: pd.DataFrame, *, y: str, y_sort, x_sort, legend_title: str, tooltip,
+                 width: int, height: int, color: str = "norm", domain=(-1, 0, 1), domain_mid=None,
+                 label_limit: int = 240, x_label_padding: int | None = None) -> dict:
+    """Blue/orange rect heatmap (timeframes across, y rows down) as a Vega-Lite dict."""
+    fields = [y, TIMEFRAME, color] + [t.shorthand.split(":")[0] for t in tooltip]
+    data = long.loc[:, list(dict.fromkeys(fields))]
+    x_axis = dict(orient="top", title=None, labelAngle=0, labelColor="#1a1a1a", labelFontSize=12, labelFlush=False)
+    if x_label_padding is not None:
+        x_axis["labelPadding"] = x_label_padding
+    scale = dict(scheme="blueorange", domain=list(domain))
+    if domain_mid is not None:
+        scale["domainMid"] = domain_mid
+    chart = (
+        alt.Chart(data)
+        .mark_rect(stroke="#2b2f36", strokeWidth=0.6, strokeOpacity=0.95)
+        .encode(
+            x=alt.X(f"{TIMEFRAME}:N", sort=list(x_sort), axis=alt.Axis(**x_axis)),
+            y=alt.Y(f"{y}:N", sort=list(y_sort),
+                    axis=alt.Axis(title=None, labelColor="#1a1a1a", labelFlush=False, labelFontSize=12,
+                                  labelLimit=label_limit)),
+            color=alt.Color(f"{color}:Q", scale=alt.Scale(**scale),
+                            legend=alt.Legend(orient="bottom", title=legend_title, labelExpr="''")),
+            tooltip=list(tooltip),
+        )
+        .properties(width=width, height=height)
+        .configure_view(strokeWidth=0)
+    )
+    return chart.to_dict()
+
+
+# -------------------------
+# Cache
+# -------------------------
+def cached(page: str, part, snapshot: str, build):
+    """build() once per (page, part, snapshot) for the whole process; later calls are a lookup."""
+    return get_registry().get(("heatmap", page, part, snapshot), build, snapshot=snapshot)
@@ -0,0 +1,153 @@
+# markmentum/ingest.py
+#
+# Nightly ingest step – run after the CSV drop lands in data/:
+#     python -m markmentum.ingest                # all stages
+#     python -m markmentum.ingest --data-dir data --only index
+#
+# Each stage reads the raw exports and writes derived files next to them.
+# The pages fall back to the raw CSVs whenever a derived file is missing or stale.
+
+import argparse
+import sys
+import time
+from pathlib import Path
+
+from markmentum import bundle, csv_index, cube, facts, graphs, regimes, resample, snapshot, store
+
+APP_DIR = Path(__file__).resolve().parent.parent
+DATA_DIR = APP_DIR / "data"
+
+
+# -------------------------
+# Stages
+# -------------------------
+# Deep Dive inputs: FILE_G1..FILE_G24 + FILE_STATS (qry_graph_data_01..25)
+DEEP_DIVE_IDS = range(1, 26)
+
+def _deep_dive_files(data_dir: Path) -> list[Path]:
+    files = (data_dir / f"qry_graph_data_{n:02d}.csv" for n in DEEP_DIVE_IDS)
+    return [p for p in files if p.exists()]
+
+def stage_index(data_dir: Path) -> None:
+    """Byte-offset sidecar index for every ticker-sorted Deep Dive CSV."""
+    for p in _deep_dive_files(data_dir):
+        t0 = time.perf_counter()
+        out = csv_index.write_index(p)
+        dt = (time.perf_counter() - t0) * 1000
+        if out is None:
+            print(f"  index  {p.name:<24} skipped (no ticker column / not sorted)")
+        else:
+            print(f"  index  {p.name:<24} {dt:7.1f} ms")
+
+
+def stage_columnar(data_dir: Path) -> None:
+    """Typed Feather copy of every CSV export (read by markmentum.store)."""
+    if store.pa is None:
+        print("  columnar  skipped (pyarrow not installed)")
+        return
+    for p in sorted(data_dir.glob("*.csv")):
+        t0 = time.perf_counter()
+        store.write_columnar(p)
+        dt = (time.perf_counter() - t0) * 1000
+        print(f"  columnar  {p.name:<32} {dt:7.1f} ms")
+
+
+def stage_bundle(data_dir: Path) -> None:
+    """One pre-joined Deep Dive bundle per ticker (stat row + graphs 1-24 on date)."""
+    if store.pa is None:
+        print("  bundle  skipped (pyarrow not installed)")
+        return
+    t0 = time.perf_counter()
+    n = bundle.build_bundles(data_dir)
+    print(f"  bundle  {n} tickers in {time.perf_counter() - t0:.1f} s")
+
+
+def stage_cube(data_dir: Path) -> None:
+    """Memory-mapped float32 ticker × date × metric cube of the Deep Dive series."""
+    t0 = time.perf_counter()
+    n_t, n_d, n_m = cube.build_cube(data_dir)
+    print(f"  cube  {n_t} tickers × {n_d} dates × {n_m} metrics in {time.perf_counter() - t0:.1f} s")
+
+
+def stage_facts(data_dir: Path) -> None:
+    """Latest-snapshot fact table: one typed row per ticker across the cross-sectional exports."""
+    if store.pa is None:
+        print("  facts  skipped (pyarrow not installed)")
+        return
+    t0 = time.perf_counter()
+    n_t, n_c = facts.write_facts(data_dir)
+    print(f"  facts  {n_t} tickers × {n_c} columns in {(time.perf_counter() - t0) * 1000:.1f} ms")
+
+
+def stage_regimes(data_dir: Path) -> None:
+    """Trend regime per ticker per date (qry_graph_data_22-24) + counts per category per day."""
+    if store.pa is None:
+        print("  regimes  skipped (pyarrow not installed)")
+        return
+    t0 = time.perf_counter()
+    n_h, n_c = regimes.write_regimes(data_dir)
+    print(f"  regimes  {n_h} ticker-dates, {n_c} category-days in {(time.perf_counter() - t0) * 1000:.1f} ms")
+
+
+def stage_resample(data_dir: Path) -> None:
+    """Weekly / monthly / quarterly return + volume bars and bands from the finest history exported."""
+    if store.pa is None:
+        print("  resample  skipped (pyarrow not installed)")
+        return
+    t0 = time.perf_counter()
+    n, freqs = resample.write_bars(data_dir)
+    print(f"  resample  {n} bars ({', '.join(freqs) or '-'}) in {(time.perf_counter() - t0) * 1000:.1f} ms")
+
+
+def stage_graphs(data_dir: Path) -> None:
+    """Fraction-vs-percent factor per Deep Dive graph export (data/_graphs.json)."""
+    scales = graphs.write_scales(data_dir, snapshot.snapshot_version(data_dir))
+    pct = sorted(k for k, v in scales.items() if v != 1.0)
+    print(f"  graphs  {len(scales)} auto-scaled exports, ×100: {', '.join(pct) or '-'}")
+
+
+def stage_manifest(data_dir: Path) -> None:
+    """Content-hash manifest; its snapshot id keys every page cache."""
+    man = snapshot.write_manifest(data_dir)
+    print(f"  manifest  {len(man['files'])} files -> snapshot {man['snapshot']}")
+
+
+STAGES = {
+    "index": stage_index,
+    "columnar": stage_columnar,
+    "bundle": stage_bundle,
+    "cube": stage_cube,
+    "facts": stage_facts,
+    "regimes": stage_regimes,   # after facts: categories come from the fact table
+    "resample": stage_resample,
+    "graphs": stage_graphs,
+    "manifest": stage_manifest,   # last: publishes the new snapshot id
+}
+
+
+# -------------------------
+# CLI
+# -------------------------
+def main(argv=None) -> int:
+    ap = argparse.ArgumentParser(prog="python -m markmentum.ingest",
+                                 description="Build derived data files from the nightly CSV drop.")
+    ap.add_argument("--data-dir", type=Path, default=DATA_DIR)
+    ap.add_argument("--only", choices=sorted(STAGES), action="append",
+                    help="run only this stage (repeatable)")
+    args = ap.parse_args(argv)
+
+    data_dir = args.data_dir.resolve()
+    if not data_dir.is_dir():
+        print(f"data dir not found: {data_dir}", file=sys.stderr)
+        return 1
+
+    for name, fn in STAGES.items():
+        if args.only and name not in args.only:
+            continue
+        print(f"[{name}]")
+        fn(data_dir)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
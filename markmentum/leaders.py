@@ -0,0 +1,174 @@
+# markmentum/leaders.py
+#
+# Leaders / laggards engine. The Market Overview, Filters, Signals and Morning
+# Compass cards used to read one pre-exported 10-row CSV per board, timeframe
+# and direction (26–30, 32–35, 44–47, 52–71, 74–87). Every one of them is the
+# top or bottom k of a single column of the latest snapshot, so they are cut
+# here on demand instead:
+#
+#   top_k()    positions of the k largest / smallest values – np.argpartition
+#              for the threshold, then a sort of the few candidates only
+#   leaders()  the top-k rows of any frame for any metric, optionally inside
+#              one category
+#   board()    an export-shaped board by export id (BOARDS), memoised per
+#              snapshot in the process-wide frame registry; ids that are not
+#              a plain top-k (volume, derived filter scores, spreads,
+#              histograms) are read from the export as before
+#
+# Order matches a stable sort: ties keep the universe's row order, NaN never
+# ranks. Universe boards come from the fact table (markmentum.facts); the
+# Morning Compass boards cut the top and bottom five of its category export.
+
+from dataclasses import dataclass
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from markmentum import store
+from markmentum.facts import load_facts
+from markmentum.registry import shared_cache
+
+LABELS = ("Ticker", "Ticker_name", "Category", "Date")
+
+
+# -------------------------
+# Core
+# -------------------------
+def top_k(values, k: int, largest: bool = True) -> np.ndarray:
+    """Positions of the k largest (or smallest) non-NaN values, best first; ties in position order."""
+    v = np.asarray(values, dtype=float)
+    pos = np.flatnonzero(~np.isnan(v))
+    key = -v[pos] if largest else v[pos]
+    k = min(int(k), key.size)
+    if k <= 0:
+        return np.empty(0, dtype=np.intp)
+    if k < key.size:
+        kth = key[np.argpartition(key, k - 1)[k - 1]]
+        keep = key <= kth                  # the k best plus anything tied with the k-th
+        pos, key = pos[keep], key[keep]
+    return pos[np.lexsort((pos, key))[:k]]
+
+def _bottom_k(values, k: int) -> np.ndarray:
+    # the last k of a descending stable sort (ties in position order)
+    v = np.asarray(values, dtype=float)[::-1]
+    return (v.size - 1 - top_k(v, k, largest=False))[::-1]
+
+def leaders(frame: pd.DataFrame, metric: str, k: int = 10, largest: bool = True,
+            category: str | None = None) -> pd.DataFrame:
+    """Top-k rows of frame by metric (bottom-k with largest=False), optionally within one category."""
+    if frame.empty or metric not in frame.columns:
+        return frame.iloc[:0]
+    values = pd.to_numeric(frame[metric], errors="coerce").to_numpy(dtype=float)
+    if category is not None:
+        values = np.where(frame["Category"].astype(str).to_numpy() == category, values, np.nan)
+    return frame.iloc[top_k(values, k, largest)]
+
+
+# -------------------------
+# Boards
+# -------------------------
+@dataclass(frozen=True)
+class Board:
+    metric: str
+    largest: bool = True
+    value: str | None = None        # the export's name for the metric column
+    k: int = 10
+    scores: bool = False            # add current_ / previous_model_score (score-change boards)
+    source: str | None = None       # universe export (default: the fact table)
+    ends: bool = False              # top k/2 then bottom k/2, both descending (Morning Compass)
+
+def _change(metric: str, value: str, largest: bool) -> Board:
+    return Board(metric, largest, value, scores=True)
+
+def _compass(metric: str, source: str) -> Board:
+    return Board(metric, source=source, ends=True)
+
+BOARDS = {
+    # Market Overview
+    26: Board("day_pct_change", True, "daily_return_pct"),
+    27: Board("day_pct_change", False, "daily_return_pct"),
+    29: Board("model_score", True),
+    30: Board("model_score", False),
+    52: Board("week_pct_change", True, "wtd_return_pct"),
+    53: Board("week_pct_change", False, "wtd_return_pct"),
+    55: _change("model_score_wtd_change", "model_score_wtd_change", True),
+    56: _change("model_score_wtd_change", "model_score_wtd_change", False),
+    58: Board("month_pct_change", True, "mtd_return_pct"),
+    59: Board("month_pct_change", False, "mtd_return_pct"),
+    61: _change("model_score_mtd_change", "model_score_mtd_change", True),
+    62: _change("model_score_mtd_change", "model_score_mtd_change", False),
+    64: Board("quarter_pct_change", True, "qtd_return_pct"),
+    65: Board("quarter_pct_change", False, "qtd_return_pct"),
+    67: _change("model_score_qtd_change", "model_score_qtd_change", True),
+    68: _change("model_score_qtd_change", "model_score_qtd_change", False),
+    70: _change("model_score_daily_change", "model_score_day_change", True),
+    71: _change("model_score_daily_change", "model_score_day_change", False),
+    # Filters
+    32: Board("ST_Trend_Change", True),
+    33: Board("ST_Trend_Change", False),
+    34: Board("MT_Trend_Change", True),
+    35: Board("MT_Trend_Change", False),
+    # Signals (Sharpe_Rank: lower is better)
+    44: Board("Sharpe_Rank", False),
+    45: Board("Sharpe_Rank", True),
+    46: Board("change_pct", True),
+    47: Board("change_pct", False),
+    # Morning Compass: top / bottom five of the timeframe's category export
+    74: _compass("daily_Return", "qry_graph_data_76.csv"),
+    75: _compass("model_score", "qry_graph_data_76.csv"),
+    77: _compass("model_score_delta", "qry_graph_data_76.csv"),
+    79: _compass("weekly_Return", "qry_graph_data_81.csv"),
+    80: _compass("model_score", "qry_graph_data_81.csv"),
+    82: _compass("model_score_delta", "qry_graph_data_81.csv"),
+    84: _compass("monthly_Return", "qry_graph_data_86.csv"),
+    85: _compass("model_score", "qry_graph_data_86.csv"),
+    87: _compass("model_score_delta", "qry_graph_data_86.csv"),
+}
+
+def _export(data_dir: Path, name: str) -> pd.DataFrame:
+    p = Path(data_dir) / name
+    return store.read_table(p) if p.exists() else pd.DataFrame()
+
+@shared_cache
+def _source(data_dir: Path, name: str | None, snapshot: str) -> pd.DataFrame:
+    # the universe a board is cut from, read once per snapshot (None = fact table)
+    return load_facts(data_dir, snapshot) if name is None else _export(data_dir, name)
+
+def _universe_board(spec: Board, data_dir: Path, snapshot: str, k: int, category: str | None) -> pd.DataFrame:
+    frame = _source(data_dir, None, snapshot)
+    if spec.metric not in frame.columns or (spec.scores and "model_score" not in frame.columns):
+        return pd.DataFrame()
+    top = leaders(frame, spec.metric, k, spec.largest, category)
+    out = pd.DataFrame({c: top[c].astype(object).to_numpy() for c in LABELS[:3]})
+    out["Date"] = top["Date"].dt.strftime("%Y-%m-%d").to_numpy()
+    out[spec.value or spec.metric] = top[spec.metric].to_numpy()
+    if spec.scores:
+        out["current_model_score"] = top["model_score"].to_numpy()
+        out["previous_model_score"] = (top["model_score"] - top[spec.metric]).to_numpy()
+    return out
+
+def _ends_board(spec: Board, data_dir: Path, snapshot: str, k: int, category: str | None) -> pd.DataFrame:
+    frame = _source(data_dir, spec.source, snapshot)
+    if frame.empty or spec.metric not in frame.columns:
+        return pd.DataFrame()
+    values = pd.to_numeric(frame[spec.metric], errors="coerce").to_numpy(dtype=float)
+    if category is not None:
+        values = np.where(frame["Category"].astype(str).to_numpy() == category, values, np.nan)
+    half = k // 2
+    rows = np.concatenate([top_k(values, half), _bottom_k(values, half)])
+    return frame.iloc[rows].drop(columns="Category").reset_index(drop=True)
+
+@shared_cache
+def board(n: int, data_dir: Path, snapshot: str, k: int | None = None, category: str | None = None) -> pd.DataFrame:
+    """
+    Board n in its export's shape (k rows, default the export's size), cut from
+    the latest snapshot; ids outside BOARDS are read from qry_graph_data_<n>.csv.
+    """
+    spec = BOARDS.get(n)
+    if spec is None:
+        return _export(data_dir, f"qry_graph_data_{n}.csv")
+    k = spec.k if k is None else k
+    if spec.ends:
+        return _ends_board(spec, data_dir, snapshot, k, category)
+    return _universe_board(spec, data_dir, snapshot, k, category)
@@ -0,0 +1,140 @@
+# markmentum/periods.py
+#
+# Period-change engine: WTD / MTD / QTD (or any custom start) change of a
+# metric for the whole universe from its per-ticker history, instead of one
+# pre-computed export per period (qry_graph_data_49 / 50 / 51 for Sharpe Rank).
+#
+# A history is held ticker-major – one sorted (ticker, date) run of rows, a
+# ticker's rows found through offsets – so the base value of every ticker for
+# every period start is one np.searchsorted on a combined (ticker, day) key:
+#
+#   period_start()    Monday / first of month / first of quarter / year, or a date
+#   load_history()    the History of a metric, memoised per snapshot
+#   base_values()     each ticker's last value strictly before each start
+#   period_changes()  current - base for every period, one row per ticker
+#
+# The base is the close of the previous period – the value on the last
+# session before its first day, as in the exports. A ticker whose history
+# skips that session gets NaN (strict=False takes its latest earlier value
+# instead). The current value comes from the caller: the pages pass the
+# latest snapshot from the fact table, since a history export can lag it by
+# a day for a few tickers.
+
+from pathlib import Path
+from typing import NamedTuple
+
+import numpy as np
+import pandas as pd
+
+from markmentum import store
+from markmentum.registry import shared_cache
+
+PERIODS = ("wtd", "mtd", "qtd")
+
+# metric -> (history export, value column)
+HISTORIES = {
+    "Sharpe_Rank": ("qry_graph_data_09.csv", "Sharpe_Rank"),
+}
+
+
+_SPAN = np.int64(1) << 32    # (ticker, day) key = ticker index * _SPAN + day number
+
+
+class History(NamedTuple):
+    tickers: np.ndarray       # sorted ticker names (object)
+    offsets: np.ndarray       # rows of tickers[i] are offsets[i]:offsets[i + 1]
+    days: np.ndarray          # int64 day number per row, ascending within a ticker
+    values: np.ndarray        # float64 per row
+    keys: np.ndarray          # ascending (ticker, day) key per row
+    calendar: np.ndarray      # every session in the history, ascending
+
+
+# -------------------------
+# Period starts
+# -------------------------
+def period_start(asof, period) -> pd.Timestamp:
+    """First day of the wtd / mtd / qtd / ytd period containing asof; any other value is taken as a date."""
+    d = pd.Timestamp(asof).normalize()
+    if period == "wtd":
+        return d - pd.Timedelta(days=d.weekday())
+    if period == "mtd":
+        return d.replace(day=1)
+    if period == "qtd":
+        return d.replace(month=3 * ((d.month - 1) // 3) + 1, day=1)
+    if period == "ytd":
+        return d.replace(month=1, day=1)
+    return pd.Timestamp(period).normalize()
+
+def _day(ts) -> np.ndarray:
+    return np.asarray(pd.to_datetime(ts).values, dtype="datetime64[D]").astype(np.int64)
+
+
+# -------------------------
+# History
+# -------------------------
+def build_history(frame: pd.DataFrame, value: str, ticker: str = "Ticker", date: str = "Date") -> History:
+    """History from a long (ticker, date, value) frame; rows without a date or value are dropped."""
+    codes, tickers = pd.factorize(frame[ticker].astype(str), sort=True)
+    days = _day(pd.to_datetime(frame[date], errors="coerce"))
+    v = pd.to_numeric(frame[value], errors="coerce").to_numpy(dtype=float)
+    ok = (days != np.iinfo(np.int64).min) & ~np.isnan(v) & (codes >= 0)
+    keys = codes[ok].astype(np.int64) * _SPAN + days[ok]
+    order = np.argsort(keys, kind="stable")
+    keys, days, v = keys[order], days[ok][order], v[ok][order]
+    offsets = np.searchsorted(keys, np.arange(len(tickers) + 1, dtype=np.int64) * _SPAN).astype(np.int64)
+    return History(np.asarray(tickers, dtype=object), offsets, days, v, keys, np.unique(days))
+
+@shared_cache
+def load_history(data_dir: Path, metric: str, snapshot: str) -> History | None:
+    """The History of a metric in HISTORIES, or None when its export is missing."""
+    name, value = HISTORIES[metric]
+    p = Path(data_dir) / name
+    if not p.exists():
+        return None
+    df = store.read_table(p, columns=["Date", "Ticker", value])
+    if value not in df.columns:
+        return None
+    return build_history(df, value)
+
+
+# -------------------------
+# Changes
+# -------------------------
+def base_values(hist: History, starts, strict: bool = True) -> np.ndarray:
+    """
+    (len(starts), tickers) array: each ticker's last value dated before each
+    start. strict: only a value on the universe's last session before the
+    start counts (a ticker missing that row gets NaN rather than an older value).
+    """
+    starts = _day(pd.DatetimeIndex([pd.Timestamp(s) for s in starts]))
+    probe = np.arange(len(hist.tickers), dtype=np.int64)[None, :] * _SPAN + starts[:, None]
+    idx = np.searchsorted(hist.keys, probe, side="left") - 1
+    ok = idx >= hist.offsets[:-1][None, :]          # still inside the ticker's own rows
+    idx = np.clip(idx, 0, None)
+    if strict:
+        k = np.searchsorted(hist.calendar, starts, side="left") - 1
+        session = np.where(k >= 0, hist.calendar[np.clip(k, 0, None)], np.iinfo(np.int64).min)
+        ok &= hist.days[idx] == session[:, None]
+    return np.where(ok, hist.values[idx], np.nan)
+
+def period_changes(hist: History, tickers, current, asof, periods=PERIODS, prefix: str = "",
+                   strict: bool = True) -> pd.DataFrame:
+    """
+    One row per ticker: <prefix>_<period>_change = current - base for every period
+    (wtd / mtd / qtd / ytd or {label: start date}), plus the base as
+    previous_<prefix>_<period>. tickers / current are the latest snapshot.
+    """
+    labels = dict(periods) if isinstance(periods, dict) else {p: p for p in periods}
+    starts = [period_start(asof, p) for p in labels.values()]
+    tickers = pd.Series(tickers, copy=False).astype(str).to_numpy()
+    cur = pd.to_numeric(pd.Series(current, copy=False), errors="coerce").to_numpy(dtype=float)
+    base = np.full((len(starts), len(tickers)), np.nan)
+    if len(hist.tickers):
+        pos = np.clip(np.searchsorted(hist.tickers, tickers), 0, len(hist.tickers) - 1)
+        known = hist.tickers[pos] == tickers
+        base[:, known] = base_values(hist, starts, strict)[:, pos[known]]
+    out = {"Ticker": tickers}
+    for j, label in enumerate(labels):
+        out[f"{prefix}_{label}_change"] = cur - base[j]
+        out[f"previous_{prefix}_{label}"] = base[j]
+    return pd.DataFrame(out)
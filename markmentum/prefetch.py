@@ -0,0 +1,99 @@
+# markmentum/prefetch.py
+#
+# Deep Dive prefetch: as soon as the page knows the ticker, every graph load is
+# started at once on a bounded, process-wide thread pool and the renderers wait
+# on futures, so a cold ticker costs about the slowest single read rather than
+# the sum of them (file / pyarrow reads release the GIL).
+# Results land in the FrameRegistry: a warm ticker never touches the pool, and a
+# load already in flight for another session is joined instead of repeated.
+# Pool size: MM_PREFETCH_WORKERS (default 8).
+#
+# Workers never call Streamlit: the page resolves the registry, the history
+# cube and the resampled bars on the script thread and passes them in.
+
+import os
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
+from pathlib import Path
+
+from markmentum import bundle
+from markmentum.graphs import GRAPH_SPECS, graph_scales, load_graph_frame
+
+DEFAULT_WORKERS = 8
+
+_lock = threading.Lock()
+_pool: ThreadPoolExecutor | None = None
+_inflight: dict = {}       # registry key -> Future still loading
+
+
+# -------------------------
+# Pool
+# -------------------------
+def executor() -> ThreadPoolExecutor:
+    global _pool
+    with _lock:
+        if _pool is None:
+            workers = max(1, int(os.environ.get("MM_PREFETCH_WORKERS", DEFAULT_WORKERS)))
+            _pool = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="mm-prefetch")
+        return _pool
+
+def _done(obj) -> Future:
+    fut = Future()
+    fut.set_result(obj)
+    return fut
+
+def _forget(key, fut: Future) -> None:
+    with _lock:
+        if _inflight.get(key) is fut:
+            del _inflight[key]
+
+def submit(registry, key, loader, snapshot: str) -> Future:
+    """Future of registry.get(key, loader): already resolved on a hit, shared while in flight."""
+    found, obj = registry.peek(key)
+    if found:
+        return _done(obj)
+    pool = executor()
+    with _lock:
+        fut = _inflight.get(key)
+        if fut is not None:
+            return fut
+        fut = pool.submit(registry.get, key, loader, snapshot)
+        _inflight[key] = fut
+    fut.add_done_callback(lambda f: _forget(key, f))   # may run right here if already done
+    return fut
+
+
+# -------------------------
+# Deep Dive
+# -------------------------
+def ticker_bundle_future(registry, data_dir: Path, ticker: str, snapshot: str) -> Future:
+    """The ticker's bundle (or None) as a shared future – the stat box reads it too."""
+    return submit(registry, ("prefetch.bundle", str(data_dir), ticker, snapshot),
+                  lambda: bundle.read_bundle(data_dir, ticker, snapshot), snapshot)
+
+def prefetch_graph_frames(registry, data_dir: Path, ticker: str, snapshot: str,
+                          specs=None, history_cube=None, bars=None) -> dict:
+    """
+    Start every graph load for one ticker; returns {gid: Future of the normalised
+    frame}. Graphs served by the resampled bars or the cube are sliced on a worker
+    as well; graphs that come from the bundle wait on the bundle future, which is
+    submitted first.
+    """
+    data_dir = Path(data_dir)
+    specs = GRAPH_SPECS if specs is None else specs
+    scales = graph_scales(data_dir, snapshot)
+    meta = bundle.bundle_meta(data_dir)
+    bundle_parts = frozenset(meta.get("parts", [])) if meta else frozenset()
+    bundle_f = ticker_bundle_future(registry, data_dir, ticker, snapshot) if bundle_parts else None
+
+    def _load(spec):
+        # FIFO pool: the bundle read was queued before any graph that waits on it
+        sliced = ((bars is not None and bars.has_graph(spec.gid))
+                  or (history_cube is not None and history_cube.has_part(spec.part)))
+        tb = bundle_f.result() if bundle_f is not None and not sliced and spec.part in bundle_parts else None
+        return load_graph_frame(data_dir, spec, ticker, scales, history_cube,
+                                tb, bundle_parts, bars)
+
+    return {spec.gid: submit(registry, ("prefetch.graph", str(data_dir), ticker, spec.gid, snapshot),
+                             lambda spec=spec: _load(spec), snapshot)
+            for spec in specs}
@@ -0,0 +1,212 @@
+# markmentum/prerender.py
+#
+# Offline pre-render of the whole Deep Dive chart set into the chart cache –
+# run after the nightly ingest so the first visitor never waits on matplotlib:
+#     python -m markmentum.prerender                      # every ticker × graph × range
+#     python -m markmentum.prerender --workers 8 --tickers SPY QQQ
+#     python -m markmentum.prerender --full               # re-render unchanged tickers too
+#
+# One task per ticker on a process pool (rendering is CPU bound and holds the
+# GIL). Charts already in the cache for this snapshot are skipped, so an
+# interrupted run resumes where it stopped. Incremental: a first pass
+# fingerprints each ticker's input frames; tickers whose frames match the
+# previous snapshot's fingerprint get their charts moved over instead of being
+# re-rendered (before any new chart is written, since the first write of a new
+# snapshot clears the old one).
+#
+# Charts are written with eviction off: LRU eviction mid-run would delete the
+# run's own earlier output and defeat resume / carry-over. The projected size is
+# checked against MM_CHART_CACHE_MB up front and the real size at the end; a
+# full set needs a few GB (see README), and pages evict down to the budget.
+
+import argparse
+import hashlib
+import json
+import os
+import shutil
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from pathlib import Path
+
+import pandas as pd
+
+from markmentum import chart_cache, store
+from markmentum.graphs import GRAPH_SPECS, load_graph_frames, render_figure
+from markmentum.snapshot import snapshot_version
+from markmentum.window import RANGE_OPTIONS, apply_window_with_gutter
+
+APP_DIR = Path(__file__).resolve().parent.parent
+DATA_DIR = APP_DIR / "data"
+STATE_NAME = "_prerender.json"   # per snapshot dir: ticker -> input fingerprint
+EST_CHART_BYTES = 75_000         # mean PNG size of today's charts
+
+
+# -------------------------
+# Helpers
+# -------------------------
+def universe(data_dir: Path) -> list[str]:
+    """Tickers of the Deep Dive directory (stat-box export)."""
+    df = store.read_table(Path(data_dir) / "qry_graph_data_25.csv", columns=["ticker"])
+    if df.empty:
+        return []
+    df.columns = [str(c).lower() for c in df.columns]
+    return sorted(df["ticker"].dropna().astype(str).str.upper().unique())
+
+def fingerprint(frames: dict) -> str:
+    h = hashlib.sha1()
+    for gid in sorted(frames):
+        df = frames[gid]
+        h.update(f"{gid}|{len(df)}|{','.join(map(str, df.columns))}\n".encode("utf-8"))
+        if not df.empty:
+            h.update(pd.util.hash_pandas_object(df, index=False).to_numpy().tobytes())
+    return h.hexdigest()
+
+def _state_path(data_dir: Path, snapshot: str) -> Path:
+    return chart_cache.cache_root(data_dir) / snapshot / STATE_NAME
+
+def _load_state(path: Path) -> dict:
+    try:
+        return json.loads(path.read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        return {}
+
+def _save_state(path: Path, state: dict) -> None:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = path.with_suffix(".tmp")
+    tmp.write_text(json.dumps(state, indent=0, sort_keys=True), encoding="utf-8")
+    tmp.replace(path)
+
+def _previous_snapshot(data_dir: Path, snapshot: str) -> tuple[str | None, dict]:
+    # newest other snapshot dir that recorded fingerprints
+    root = chart_cache.cache_root(data_dir)
+    dirs = [d for d in root.iterdir() if d.is_dir() and d.name != snapshot] if root.exists() else []
+    for d in sorted(dirs, key=lambda d: d.stat().st_mtime, reverse=True):
+        state = _load_state(d / STATE_NAME)
+        if state:
+            return d.name, state
+    return None, {}
+
+
+# -------------------------
+# Worker
+# -------------------------
+def fingerprint_ticker(data_dir: Path, snapshot: str, ticker: str) -> tuple[str, str]:
+    return ticker, fingerprint(load_graph_frames(data_dir, ticker, snapshot))
+
+def render_ticker(data_dir: Path, snapshot: str, ticker: str, ranges) -> dict:
+    """Render every graph × range of one ticker not yet in the cache. Runs in a worker."""
+    t0 = time.perf_counter()
+    frames = load_graph_frames(data_dir, ticker, snapshot)
+    out = {"ticker": ticker, "fingerprint": fingerprint(frames), "rendered": 0, "cached": 0, "empty": 0}
+    for spec in GRAPH_SPECS:
+        df = frames.get(spec.gid)
+        if df is None or df.empty:
+            out["empty"] += len(ranges)
+            continue
+        for rng in ranges:
+            if chart_cache.chart_path(data_dir, snapshot, ticker, spec, rng).exists():
+                out["cached"] += 1
+                continue
+            fig = render_figure(spec, apply_window_with_gutter(df, rng), ticker)
+            chart_cache.put_chart(data_dir, snapshot, ticker, spec, rng, chart_cache.encode(fig), evict=False)
+            out["rendered"] += 1
+    out["sec"] = time.perf_counter() - t0
+    return out
+
+def carry_over(data_dir: Path, snapshot: str, prev_snapshot: str, tickers) -> int:
+    """Move unchanged tickers' charts from the previous snapshot. Returns files moved."""
+    moved = 0
+    for t in tickers:
+        src = chart_cache.ticker_dir(data_dir, prev_snapshot, t)
+        dst = chart_cache.ticker_dir(data_dir, snapshot, t)
+        if src.is_dir() and not dst.exists():
+            dst.parent.mkdir(parents=True, exist_ok=True)
+            shutil.move(str(src), str(dst))
+            moved += sum(1 for _ in dst.iterdir())
+    return moved
+
+def _mb(n: int) -> str:
+    return f"{n / (1024 * 1024):,.0f} MB"
+
+def check_budget(projected: int) -> None:
+    budget = chart_cache.budget_bytes()
+    if projected > budget:
+        print(f"warning: the chart set may need up to {_mb(projected)} but MM_CHART_CACHE_MB allows "
+              f"{_mb(budget)}; pages will evict pre-rendered charts down to the budget. "
+              f"Set MM_CHART_CACHE_MB to at least {projected // (1024 * 1024) + 1} for the app.",
+              file=sys.stderr)
+
+
+# -------------------------
+# CLI
+# -------------------------
+def main(argv=None) -> int:
+    ap = argparse.ArgumentParser(prog="python -m markmentum.prerender",
+                                 description="Pre-render every Deep Dive chart into data/_charts.")
+    ap.add_argument("--data-dir", type=Path, default=DATA_DIR)
+    ap.add_argument("--workers", type=int, default=os.cpu_count() or 1)
+    ap.add_argument("--tickers", nargs="+", help="only these tickers (default: whole universe)")
+    ap.add_argument("--ranges", nargs="+", default=RANGE_OPTIONS, choices=RANGE_OPTIONS)
+    ap.add_argument("--full", action="store_true",
+                    help="re-render every ticker (no carry-over from the previous snapshot)")
+    args = ap.parse_args(argv)
+
+    data_dir = args.data_dir.resolve()
+    if not data_dir.is_dir():
+        print(f"data dir not found: {data_dir}", file=sys.stderr)
+        return 1
+
+    snapshot = snapshot_version(data_dir)
+    tickers = [t.upper() for t in args.tickers] if args.tickers else universe(data_dir)
+    prev_snap, prev_state = (None, {}) if args.full else _previous_snapshot(data_dir, snapshot)
+    state_path = _state_path(data_dir, snapshot)
+    state = _load_state(state_path)
+
+    print(f"snapshot {snapshot}: {len(tickers)} tickers × {len(GRAPH_SPECS)} graphs × "
+          f"{len(args.ranges)} ranges on {args.workers} workers"
+          + (f" (carry-over from {prev_snap})" if prev_snap else ""))
+    # upper bound: graphs without data for a ticker render nothing
+    check_budget(len(tickers) * len(GRAPH_SPECS) * len(args.ranges) * EST_CHART_BYTES)
+
+    totals = {"rendered": 0, "cached": 0, "empty": 0}
+    carried = 0
+    t0 = time.perf_counter()
+    with ProcessPoolExecutor(max_workers=args.workers) as pool:
+        if prev_snap:
+            fps = dict(pool.map(fingerprint_ticker, [data_dir] * len(tickers),
+                                [snapshot] * len(tickers), tickers, chunksize=16))
+            same = [t for t in tickers if prev_state.get(t) == fps[t]]
+            carried = carry_over(data_dir, snapshot, prev_snap, same)
+            print(f"  {len(same)} unchanged tickers, {carried} charts carried over "
+                  f"({time.perf_counter() - t0:.1f} s)")
+
+        futs = [pool.submit(render_ticker, data_dir, snapshot, t, list(args.ranges)) for t in tickers]
+        for i, fut in enumerate(as_completed(futs), 1):
+            r = fut.result()
+            state[r["ticker"]] = r["fingerprint"]
+            for k in totals:
+                totals[k] += r[k]
+            if i % 25 == 0 or i == len(futs):
+                _save_state(state_path, state)   # progress survives an interrupted run
+                dt = time.perf_counter() - t0
+                print(f"  {i:>5}/{len(futs)} tickers  {totals['rendered']:>7} rendered  "
+                      f"{totals['rendered'] / dt:7.1f} charts/s")
+
+    chart_cache.prune_snapshots(data_dir, snapshot)
+    dt = time.perf_counter() - t0
+    print(f"done in {dt:.1f} s: {totals['rendered']} rendered, {totals['cached']} already cached, "
+          f"{carried} carried over, {totals['empty']} without data "
+          f"({totals['rendered'] / dt if dt else 0:.1f} charts/s, "
+          f"{len(tickers) / dt if dt else 0:.2f} tickers/s)")
+    used = chart_cache.cache_bytes(data_dir)
+    print(f"chart cache: {_mb(used)} of {_mb(chart_cache.budget_bytes())}")
+    if used > chart_cache.budget_bytes():
+        print(f"warning: the chart cache is over MM_CHART_CACHE_MB; the first page write will evict "
+              f"least recently used charts. Set MM_CHART_CACHE_MB to at least {used // (1024 * 1024) + 1}.",
+              file=sys.stderr)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
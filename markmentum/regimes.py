@@ -0,0 +1,212 @@
+# markmentum/regimes.py
+#
+# Trend regimes (the Directional Trends "Comment" column). The page labelled
+# one row at a time in Python – pd.isna / float() on five values per ticker.
+# Here the same rules run as one np.select over whole arrays:
+#
+#   regime_codes()   ST / MT / LT trend + ST / MT change arrays -> regime code
+#   regime_labels()  the same as label strings (what the page shows)
+#   build_history()  every ticker's regime over time from the trend histories
+#                    (qry_graph_data_22 / 23 / 24) plus regime counts per
+#                    category per day
+#
+# The history is written once per snapshot by the ingest `regimes` stage:
+#   data/_regimes/history.feather   Ticker, Date, st/mt/lt_trend, *_change, Regime
+#   data/_regimes/counts.feather    Date, Category, one count column per regime
+#   data/_regimes/_meta.json        version, snapshot, series used
+#
+# The three histories are sampled differently (ST daily, MT weekly, LT
+# monthly). Each ticker's dates are the union of its series' dates; every
+# series is carried forward to them (as of), and a change is the move since
+# that series' previous observation. A missing export leaves its series NaN,
+# which labels as "Insufficient data".
+
+import json
+import threading
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from markmentum import store
+from markmentum.facts import load_facts
+from markmentum.snapshot import snapshot_version
+
+REGIMES_DIRNAME = "_regimes"
+REGIMES_VERSION = 1
+
+INSUFFICIENT = "Insufficient data"
+REGIMES = (
+    INSUFFICIENT,
+    "Bullish Alignment · Improving",
+    "Bearish Alignment",
+    "Bullish Alignment · Waiting",
+    "Converging / Mixed",
+)
+
+# series -> (export, value column)
+TREND_HISTORY = {
+    "st": ("qry_graph_data_22.csv", "ST_Trend"),
+    "mt": ("qry_graph_data_23.csv", "MT_Trend"),
+    "lt": ("qry_graph_data_24.csv", "LT_Trend"),
+}
+
+_lock = threading.Lock()
+_built: dict = {}          # (data dir, snapshot) -> in-memory fallback (last one only)
+
+
+# -------------------------
+# Labels
+# -------------------------
+def _num(values) -> np.ndarray:
+    return pd.to_numeric(pd.Series(values, copy=False), errors="coerce").to_numpy(dtype=float)
+
+def regime_codes(st, mt, lt, stc, mtc) -> np.ndarray:
+    """Index into REGIMES for every row; any missing / non-numeric input is INSUFFICIENT (0)."""
+    st, mt, lt, stc, mtc = (_num(v) for v in (st, mt, lt, stc, mtc))
+    missing = np.isnan(st) | np.isnan(mt) | np.isnan(lt) | np.isnan(stc) | np.isnan(mtc)
+    bullish = (st < mt) & (mt < lt)
+    with np.errstate(invalid="ignore"):
+        codes = np.select(
+            [missing, bullish & (stc > 0) & (mtc > 0), (st > mt) & (mt > lt), bullish],
+            [0, 1, 2, 3],
+            default=4,
+        )
+    return codes.astype(np.int8)
+
+def regime_labels(st, mt, lt, stc, mtc) -> np.ndarray:
+    """Regime label per row (object array), same rules as the page's previous m2_label."""
+    return np.asarray(REGIMES, dtype=object)[regime_codes(st, mt, lt, stc, mtc)]
+
+
+# -------------------------
+# History
+# -------------------------
+def regimes_paths(data_dir: Path) -> tuple[Path, Path, Path]:
+    d = Path(data_dir) / REGIMES_DIRNAME
+    return d / "history.feather", d / "counts.feather", d / "_meta.json"
+
+def _series(data_dir: Path, name: str, value: str, prefix: str) -> pd.DataFrame | None:
+    # one trend history as Ticker, Date, <prefix>_trend, <prefix>_trend_change (sorted by ticker, date)
+    p = Path(data_dir) / name
+    if not p.exists():
+        return None
+    df = store.read_table(p, columns=["Date", "Ticker", value])
+    if value not in df.columns or df.empty:
+        return None
+    df["Ticker"] = df["Ticker"].astype(str)
+    df["Date"] = pd.to_datetime(df["Date"], errors="coerce")
+    df = (df.dropna(subset=["Date"]).sort_values(["Ticker", "Date"], kind="stable")
+            .drop_duplicates(["Ticker", "Date"], keep="last"))
+    v = _num(df[value])
+    t = df["Ticker"].to_numpy()
+    change = np.full_like(v, np.nan)
+    change[1:] = np.where(t[1:] == t[:-1], v[1:] - v[:-1], np.nan)
+    return pd.DataFrame({"Ticker": t, "Date": df["Date"].to_numpy(),
+                         f"{prefix}_trend": v, f"{prefix}_trend_change": change})
+
+def _counts(history: pd.DataFrame, categories: pd.Series) -> pd.DataFrame:
+    # tickers per (date, category, regime) in one bincount
+    cat = pd.Categorical(history["Ticker"].astype(str).map(categories))
+    dates, date_codes = np.unique(history["Date"].to_numpy(), return_inverse=True)
+    cat_codes = cat.codes.astype(np.intp)
+    keep = cat_codes >= 0
+    n_cat, n_reg = len(cat.categories), len(REGIMES)
+    key = (date_codes[keep] * n_cat + cat_codes[keep]) * n_reg + history["Regime"].cat.codes.to_numpy()[keep]
+    grid = np.bincount(key, minlength=len(dates) * n_cat * n_reg).reshape(len(dates) * n_cat, n_reg)
+    rows = np.flatnonzero(grid.sum(axis=1))
+    out = pd.DataFrame({
+        "Date": dates[rows // n_cat],
+        "Category": pd.Categorical.from_codes(rows % n_cat, categories=cat.categories),
+    })
+    for j, name in enumerate(REGIMES):
+        out[name] = grid[rows, j]
+    return out
+
+def build_history(data_dir: Path) -> tuple[pd.DataFrame, pd.DataFrame, list[str]]:
+    """(per-ticker regime history, regime counts per category per day, series used)."""
+    data_dir = Path(data_dir)
+    series = {k: _series(data_dir, name, value, k) for k, (name, value) in TREND_HISTORY.items()}
+    used = [k for k, s in series.items() if s is not None]
+    if not used:
+        return pd.DataFrame(), pd.DataFrame(), []
+
+    grid = (pd.concat([series[k][["Ticker", "Date"]] for k in used], ignore_index=True)
+              .drop_duplicates().sort_values("Date", kind="stable"))
+    for k in used:
+        grid = pd.merge_asof(grid, series[k].sort_values("Date", kind="stable"),
+                             on="Date", by="Ticker", direction="backward")
+    hist = grid.sort_values(["Ticker", "Date"], kind="stable").reset_index(drop=True)
+    trend_cols = [f"{k}_trend" for k in TREND_HISTORY] + [f"{k}_trend_change" for k in TREND_HISTORY]
+    hist = hist.reindex(columns=["Ticker", "Date", *trend_cols])     # absent series -> NaN
+    codes = regime_codes(hist["st_trend"], hist["mt_trend"], hist["lt_trend"],
+                         hist["st_trend_change"], hist["mt_trend_change"])
+    hist["Regime"] = pd.Categorical.from_codes(codes, categories=REGIMES)
+    hist["Ticker"] = hist["Ticker"].astype("category")
+
+    labels = load_facts(data_dir, snapshot_version(data_dir), ["Category"])
+    if "Category" in labels.columns:
+        categories = pd.Series(labels["Category"].astype(object).to_numpy(), index=labels["Ticker"].astype(str).to_numpy())
+    else:
+        categories = pd.Series(dtype=object)
+    return hist, _counts(hist, categories), used
+
+def write_regimes(data_dir: Path) -> tuple[int, int]:
+    """Write history / counts Feather + _meta.json. Returns (history rows, count rows); (0, 0) without pyarrow."""
+    if store.pa is None:
+        return 0, 0
+    data_dir = Path(data_dir)
+    hist, counts, used = build_history(data_dir)
+    if hist.empty:
+        return 0, 0
+    hp, cp, meta_path = regimes_paths(data_dir)
+    hp.parent.mkdir(parents=True, exist_ok=True)
+    for frame, path in ((hist, hp), (counts, cp)):
+        tmp = path.with_suffix(".tmp")
+        store.feather.write_feather(frame, tmp, compression="uncompressed")
+        tmp.replace(path)
+    meta = {"version": REGIMES_VERSION, "snapshot": snapshot_version(data_dir), "series": used}
+    meta_path.write_text(json.dumps(meta), encoding="utf-8")
+    return len(hist), len(counts)
+
+
+# -------------------------
+# Load
+# -------------------------
+def read_regimes(data_dir: Path, snapshot: str) -> tuple[pd.DataFrame, pd.DataFrame] | None:
+    """(history, counts), or None when the files are missing / built from another snapshot."""
+    if store.pa is None:
+        return None
+    hp, cp, meta_path = regimes_paths(data_dir)
+    try:
+        meta = json.loads(meta_path.read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        return None
+    if meta.get("version") != REGIMES_VERSION or meta.get("snapshot") != snapshot:
+        return None
+    if not (hp.exists() and cp.exists()):
+        return None
+    return (store.feather.read_table(hp, memory_map=True).to_pandas(),
+            store.feather.read_table(cp, memory_map=True).to_pandas())
+
+def load_regimes(data_dir: Path, snapshot: str) -> tuple[pd.DataFrame, pd.DataFrame]:
+    """read_regimes(), falling back to build_history() (memoised per snapshot) when the files are not usable."""
+    got = read_regimes(data_dir, snapshot)
+    if got is not None:
+        return got
+    key = (str(Path(data_dir).resolve()), snapshot)
+    with _lock:
+        built = _built.get(key)
+    if built is None:
+        hist, counts, _ = build_history(data_dir)
+        built = (hist, counts)
+        with _lock:
+            _built.clear()
+            _built[key] = built
+    return built[0].copy(), built[1].copy()
+
+def ticker_regimes(history: pd.DataFrame, ticker: str) -> pd.DataFrame:
+    """One ticker's rows of the regime history (Date ascending)."""
+    if history.empty:
+        return history
+    return history.loc[history["Ticker"].to_numpy() == ticker]
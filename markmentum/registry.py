@@ -0,0 +1,168 @@
+# markmentum/registry.py
+#
+# Process-wide registry of read-only DataFrames / numpy arrays.
+#
+# st.cache_data pickles every hit, so each session on each rerun gets its own
+# copy of the frame. Frames served from here are shared by all sessions instead:
+# the numpy buffers are flagged read-only, so a stray in-place write raises
+# rather than leaking into another session. Callers that need to mutate take a
+# .copy() (the windowing helpers already do).
+#
+# Entries are keyed by (function, args) – the args include the data snapshot, so
+# a new drop never serves old frames – and evicted LRU once the registry goes
+# over its memory budget (MM_CACHE_BUDGET_MB, default 512).
+
+import functools
+import inspect
+import os
+import threading
+from collections import OrderedDict
+
+import numpy as np
+import pandas as pd
+import streamlit as st
+
+DEFAULT_BUDGET_MB = 512
+
+
+# -------------------------
+# Helpers
+# -------------------------
+def _nbytes(obj) -> int:
+    if isinstance(obj, pd.DataFrame):
+        return int(obj.memory_usage(index=True, deep=True).sum())
+    if isinstance(obj, pd.Series):
+        return int(obj.memory_usage(index=True, deep=True))
+    if isinstance(obj, np.ndarray):
+        return int(obj.nbytes)
+    if isinstance(obj, (tuple, list)):
+        return sum(_nbytes(o) for o in obj)
+    if isinstance(obj, dict):
+        return sum(_nbytes(o) for o in obj.values())
+    return 0
+
+def freeze(obj):
+    """Flag the numpy buffers behind obj read-only (in place) and return obj."""
+    if isinstance(obj, np.ndarray):
+        obj.flags.writeable = False
+    elif isinstance(obj, (pd.DataFrame, pd.Series)):
+        mgr = getattr(obj, "_mgr", None)
+        for blk in getattr(mgr, "blocks", ()):
+            arr = getattr(blk.values, "_ndarray", blk.values)   # datetime blocks wrap an ndarray
+            if isinstance(arr, np.ndarray):
+                arr.flags.writeable = False
+    elif isinstance(obj, (tuple, list)):
+        for o in obj:
+            freeze(o)
+    elif isinstance(obj, dict):
+        for o in obj.values():
+            freeze(o)
+    return obj
+
+
+# -------------------------
+# Registry
+# -------------------------
+class FrameRegistry:
+    """LRU map of key -> frozen object with a byte budget. Thread-safe."""
+
+    def __init__(self, budget_bytes: int):
+        self.budget_bytes = int(budget_bytes)
+        self._items: OrderedDict = OrderedDict()   # key -> (obj, nbytes, snapshot)
+        self._bytes = 0
+        self._snapshot = None
+        self._lock = threading.Lock()
+        self.hits = self.misses = self.evictions = 0
+
+    def get(self, key, loader, snapshot: str | None = None):
+        with self._lock:
+            if snapshot is not None and snapshot != self._snapshot:
+                self._switch_snapshot(snapshot)
+            if key in self._items:
+                self._items.move_to_end(key)
+                self.hits += 1
+                return self._items[key][0]
+            self.misses += 1
+
+        # load outside the lock; two sessions racing on one key both load, first one wins
+        obj = loader()
+        size = _nbytes(obj)   # (before freezing: deep memory_usage needs writable buffers)
+        freeze(obj)
+
+        with self._lock:
+            if key in self._items:
+                return self._items[key][0]
+            if size > self.budget_bytes:
+                return obj   # too big to keep – serve it uncached
+            self._items[key] = (obj, size, snapshot)
+            self._bytes += size
+            while self._bytes > self.budget_bytes and len(self._items) > 1:
+                _, (_, old_size, _) = self._items.popitem(last=False)
+                self._bytes -= old_size
+                self.evictions += 1
+        return obj
+
+    def peek(self, key) -> tuple[bool, object]:
+        """(True, obj) when key is cached (counts as a hit), else (False, None). Never loads."""
+        with self._lock:
+            if key in self._items:
+                self._items.move_to_end(key)
+                self.hits += 1
+                return True, self._items[key][0]
+        return False, None
+
+    def _switch_snapshot(self, snapshot: str) -> None:
+        # new data landed: frames keyed by older snapshots can never hit again
+        if self._snapshot is not None:
+            for k in [k for k, v in self._items.items() if v[2] not in (None, snapshot)]:
+                self._bytes -= self._items.pop(k)[1]
+                self.evictions += 1
+        self._snapshot = snapshot
+
+    def clear(self) -> None:
+        with self._lock:
+            self._items.clear()
+            self._bytes = 0
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                "entries": len(self._items),
+                "bytes": self._bytes,
+                "budget_bytes": self.budget_bytes,
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "snapshot": self._snapshot,
+            }
+
+
+@st.cache_resource(show_spinner=False)
+def get_registry() -> FrameRegistry:
+    budget_mb = float(os.environ.get("MM_CACHE_BUDGET_MB", DEFAULT_BUDGET_MB))
+    return FrameRegistry(int(budget_mb * 1024 * 1024))
+
+
+# -------------------------
+# Decorator
+# -------------------------
+def shared_cache(fn):
+    """
+    Drop-in for @st.cache_data on loaders whose result is only read: one frozen
+    copy per (function, args) for the whole process. Args must be hashable; an
+    argument named `snapshot` ties the entry to that data snapshot.
+    """
+    sig = inspect.signature(fn)
+    has_snapshot = "snapshot" in sig.parameters
+    # the first line too: a page may define two loaders with one qualname in different blocks
+    ident = (fn.__code__.co_filename, fn.__qualname__, fn.__code__.co_firstlineno)
+
+    @functools.wraps(fn)
+    def wrapper(*args, **kwargs):
+        bound = sig.bind(*args, **kwargs)
+        bound.apply_defaults()
+        key = (ident, tuple(bound.arguments.items()))
+        snapshot = bound.arguments.get("snapshot") if has_snapshot else None
+        return get_registry().get(key, lambda: fn(*args, **kwargs), snapshot=snapshot)
+
+    return wrapper
@@ -0,0 +1,288 @@
+# markmentum/resample.py
+#
+# Period bars: weekly / monthly / quarterly return and volume bars plus their
+# avg / ±1σ bands, resampled from the finest history in the drop instead of
+# one pre-computed export per period (qry_graph_data_16 / 18 / 19 / 21):
+#
+#   period_buckets()  day numbers -> week / month / quarter bucket per row
+#   resample()        one pass over the ticker-major history for all tickers:
+#                     returns compound, volumes add (np.*.reduceat)
+#   bands()           per-ticker avg and avg ± 1 sample std of the bars
+#   build_bars()      every period coarser than the source, with bands
+#   load_bars()       the Bars for a snapshot (files, else built in memory)
+#
+# Source: the daily exports (13 returns, 15 volume) when the drop has them –
+# then weekly, monthly and quarterly bars are all derived – else the monthly
+# exports (19 / 21), which still give the quarterly bars. Written once per
+# snapshot by the ingest `resample` stage:
+#   data/_resampled/bars.feather    Ticker, Freq, Date, return, volume
+#   data/_resampled/bands.feather   Ticker, Freq, <metric>_avg / _hi / _lo
+#   data/_resampled/_meta.json      version, snapshot, source, freqs
+#
+# Weekly bars are dated on the week's first session (the exports' Tuesday
+# after a Monday holiday), monthly / quarterly bars on the period's first day.
+# Returns are fractions. Range bars need each period's high and low, which
+# no daily export carries: graphs 17 / 20 keep reading their exports.
+
+import json
+import threading
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from markmentum import store
+from markmentum.snapshot import snapshot_version
+
+RESAMPLED_DIRNAME = "_resampled"
+RESAMPLED_VERSION = 1
+
+FREQS = ("weekly", "monthly", "quarterly")
+METRICS = ("return", "volume")
+
+# source frequency -> {metric: (export, value column)}, finest first
+SOURCES = {
+    "daily": {"return": ("qry_graph_data_13.csv", "daily_return_pct"),
+              "volume": ("qry_graph_data_15.csv", "daily_volume")},
+    "monthly": {"return": ("qry_graph_data_19.csv", "monthly_return"),
+                "volume": ("qry_graph_data_21.csv", "monthly_volume")},
+}
+_COARSER = {"daily": FREQS, "monthly": ("quarterly",)}
+
+# Deep Dive graph id -> (freq, metric) a Bars can serve
+RESAMPLED_GRAPHS = {
+    16: ("weekly", "return"), 18: ("weekly", "volume"),
+    19: ("monthly", "return"), 21: ("monthly", "volume"),
+    26: ("quarterly", "return"), 27: ("quarterly", "volume"),
+}
+
+_SPAN = np.int64(1) << 32    # (ticker, bucket) key = ticker code * _SPAN + bucket
+
+_lock = threading.Lock()
+_built: dict = {}          # (data dir, snapshot) -> in-memory fallback (last one only)
+
+
+# -------------------------
+# Core
+# -------------------------
+def period_buckets(days: np.ndarray, freq: str) -> np.ndarray:
+    """Bucket number per day number (days since 1970-01-01): Monday's day / month / quarter index."""
+    days = np.asarray(days, dtype=np.int64)
+    if freq == "weekly":
+        return days - (days + 3) % 7                  # 1970-01-01 was a Thursday
+    months = days.astype("datetime64[D]").astype("datetime64[M]").astype(np.int64)
+    if freq == "monthly":
+        return months
+    if freq == "quarterly":
+        return months // 3
+    raise ValueError(f"unknown frequency: {freq!r}")
+
+def _bucket_day(buckets: np.ndarray, freq: str) -> np.ndarray:
+    # first calendar day of a month / quarter bucket
+    months = buckets * 3 if freq == "quarterly" else buckets
+    return months.astype("datetime64[M]").astype("datetime64[D]").astype(np.int64)
+
+def resample(codes: np.ndarray, days: np.ndarray, values: dict, freq: str) -> tuple:
+    """
+    Bars of every ticker at once. codes / days sorted by (code, day); values:
+    {metric: float array}. Returns (codes, days, {metric: bars}); a bar with no
+    observation of a metric is NaN.
+    """
+    buckets = period_buckets(days, freq)
+    key = codes.astype(np.int64) * _SPAN + buckets
+    starts = np.flatnonzero(np.r_[True, key[1:] != key[:-1]]) if len(key) else np.zeros(0, np.intp)
+    out_days = days[starts] if freq == "weekly" else _bucket_day(buckets[starts], freq)
+    out = {}
+    for metric, v in values.items():
+        seen = ~np.isnan(v)
+        if not len(starts):
+            out[metric] = np.zeros(0)
+            continue
+        n = np.add.reduceat(seen.astype(np.int64), starts)
+        if metric == "return":
+            bar = np.multiply.reduceat(np.where(seen, 1.0 + v, 1.0), starts) - 1.0
+        else:
+            bar = np.add.reduceat(np.where(seen, v, 0.0), starts)
+        out[metric] = np.where(n > 0, bar, np.nan)
+    return codes[starts], out_days, out
+
+def bands(codes: np.ndarray, values: np.ndarray, n_tickers: int) -> tuple:
+    """(avg, hi, lo) per ticker code: mean and mean ± 1 sample std, NaN ignored."""
+    seen = ~np.isnan(values)
+    c, v = codes[seen].astype(np.intp), values[seen]
+    n = np.bincount(c, minlength=n_tickers)
+    with np.errstate(invalid="ignore", divide="ignore"):
+        avg = np.bincount(c, weights=v, minlength=n_tickers) / n
+        dev = np.bincount(c, weights=(v - avg[c]) ** 2, minlength=n_tickers)
+        std = np.where(n > 1, np.sqrt(dev / (n - 1)), np.nan)
+    return avg, avg + std, avg - std
+
+
+# -------------------------
+# Build
+# -------------------------
+def resampled_paths(data_dir: Path) -> tuple[Path, Path, Path]:
+    d = Path(data_dir) / RESAMPLED_DIRNAME
+    return d / "bars.feather", d / "bands.feather", d / "_meta.json"
+
+def _fractions(v: np.ndarray) -> np.ndarray:
+    # returns exported as percent are brought back to fractions before compounding
+    a = np.abs(v[np.isfinite(v)])
+    return v if not a.size or np.quantile(a, 0.99) <= 1.0 else v / 100.0
+
+def _read_source(data_dir: Path, source: str) -> pd.DataFrame | None:
+    # one long Ticker, Date, return, volume frame of a source, or None when it is absent
+    frames = []
+    for metric, (name, value) in SOURCES[source].items():
+        p = Path(data_dir) / name
+        if not p.exists():
+            continue
+        df = store.read_table(p, columns=["ticker", "date", value])     # series only, no bands
+        df.columns = [str(c).strip().lower() for c in df.columns]
+        if not {"ticker", "date", value} <= set(df.columns):
+            continue
+        df = df[["ticker", "date", value]].rename(columns={value: metric})
+        df["ticker"] = df["ticker"].astype(str)
+        df["date"] = pd.to_datetime(df["date"], errors="coerce")
+        frames.append(df.dropna(subset=["date"]).drop_duplicates(["ticker", "date"], keep="last")
+                        .set_index(["ticker", "date"]))
+    if not frames:
+        return None
+    long = pd.concat(frames, axis=1, join="outer").reindex(columns=list(METRICS))
+    return long.sort_index().reset_index()
+
+def build_bars(data_dir: Path) -> tuple[pd.DataFrame, pd.DataFrame, dict]:
+    """(bars, bands, meta info) from the finest source in the drop; empty frames without one."""
+    for source in SOURCES:
+        long = _read_source(data_dir, source)
+        if long is not None and not long.empty:
+            break
+    else:
+        return pd.DataFrame(), pd.DataFrame(), {}
+
+    codes, tickers = pd.factorize(long["ticker"], sort=True)
+    days = np.asarray(long["date"].values, dtype="datetime64[D]").astype(np.int64)
+    values = {m: pd.to_numeric(long[m], errors="coerce").to_numpy(dtype=float) for m in METRICS}
+    values["return"] = _fractions(values["return"])
+    freqs = _COARSER[source]
+
+    bar_parts, band_parts = [], []
+    for freq in freqs:
+        c, d, v = resample(codes, days, values, freq)
+        bar_parts.append(pd.DataFrame({"code": c, "Freq": freq, "Date": d.astype("datetime64[D]"), **v}))
+        band = {"code": np.arange(len(tickers)), "Freq": freq}
+        for m in METRICS:
+            band[f"{m}_avg"], band[f"{m}_hi"], band[f"{m}_lo"] = bands(c, v[m], len(tickers))
+        band_parts.append(pd.DataFrame(band))
+
+    def _typed(df: pd.DataFrame) -> pd.DataFrame:
+        df.insert(0, "Ticker", pd.Categorical.from_codes(df.pop("code"), categories=tickers))
+        df["Freq"] = pd.Categorical(df["Freq"], categories=FREQS)
+        return df.sort_values(["Ticker", "Freq"], kind="stable").reset_index(drop=True)
+
+    bars = _typed(pd.concat(bar_parts, ignore_index=True))
+    bars["Date"] = bars["Date"].astype("datetime64[ns]")
+    return bars, _typed(pd.concat(band_parts, ignore_index=True)), {"source": source, "freqs": list(freqs)}
+
+def write_bars(data_dir: Path) -> tuple[int, list[str]]:
+    """Write bars / bands Feather + _meta.json. Returns (bar rows, freqs); (0, []) without pyarrow or a source."""
+    if store.pa is None:
+        return 0, []
+    data_dir = Path(data_dir)
+    bars, band, info = build_bars(data_dir)
+    if bars.empty:
+        return 0, []
+    bp, sp, meta_path = resampled_paths(data_dir)
+    bp.parent.mkdir(parents=True, exist_ok=True)
+    for frame, path in ((bars, bp), (band, sp)):
+        tmp = path.with_suffix(".tmp")
+        store.feather.write_feather(frame, tmp, compression="uncompressed")
+        tmp.replace(path)
+    meta = {"version": RESAMPLED_VERSION, "snapshot": snapshot_version(data_dir), **info}
+    meta_path.write_text(json.dumps(meta), encoding="utf-8")
+    return len(bars), info["freqs"]
+
+
+# -------------------------
+# Runtime
+# -------------------------
+def graph_columns(freq: str, metric: str) -> tuple[str, str, str, str]:
+    """Export-style value / avg / hi / lo column names (weekly returns carry the _pct suffix)."""
+    stem = f"{freq}_{metric}"
+    if (freq, metric) == ("weekly", "return"):
+        return f"{stem}_pct", f"{stem}_avg_pct", f"{stem}_hi_pct", f"{stem}_lo_pct"
+    return stem, f"{stem}_avg", f"{stem}_hi", f"{stem}_lo"
+
+class Bars:
+    """Read-only bars + bands with per-ticker slicing (rows are ticker-major)."""
+
+    def __init__(self, bars: pd.DataFrame, bands: pd.DataFrame, freqs):
+        self.freqs = frozenset(freqs)
+        names = np.asarray(bars["Ticker"].cat.categories, dtype=object)
+        self.tickers = {t: i for i, t in enumerate(names)}
+        codes = bars["Ticker"].cat.codes.to_numpy().astype(np.int64)
+        self.offsets = np.searchsorted(codes, np.arange(len(names) + 1))
+        self.freq = bars["Freq"].cat.codes.to_numpy()
+        self.dates = bars["Date"].to_numpy()
+        self.values = {m: bars[m].to_numpy(dtype=float) for m in METRICS}
+        fi = bands["Freq"].cat.codes.to_numpy().astype(np.int64)
+        self.bands = {(int(c), int(f)): j for j, (c, f) in
+                      enumerate(zip(bands["Ticker"].cat.codes.to_numpy(), fi))}
+        self.band_values = bands
+
+    def has_graph(self, gid: int) -> bool:
+        return gid in RESAMPLED_GRAPHS and RESAMPLED_GRAPHS[gid][0] in self.freqs
+
+    def graph_frame(self, gid: int, ticker: str) -> pd.DataFrame:
+        """
+        One ticker's bars of graph gid in export shape (date, ticker, value,
+        avg, hi, lo columns) – a slice of the ticker's rows, no scan.
+        """
+        freq, metric = RESAMPLED_GRAPHS[gid]
+        i = self.tickers.get(ticker)
+        if i is None or freq not in self.freqs:
+            return pd.DataFrame()
+        f = FREQS.index(freq)
+        lo, hi = self.offsets[i], self.offsets[i + 1]
+        rows = lo + np.flatnonzero(self.freq[lo:hi] == f)
+        if not len(rows):
+            return pd.DataFrame()
+        band = self.band_values.iloc[self.bands[(i, f)]]
+        value, avg, top, bottom = graph_columns(freq, metric)
+        return pd.DataFrame({
+            "date": self.dates[rows], "ticker": ticker, value: self.values[metric][rows],
+            avg: band[f"{metric}_avg"], top: band[f"{metric}_hi"], bottom: band[f"{metric}_lo"],
+        })
+
+
+def read_bars(data_dir: Path, snapshot: str) -> Bars | None:
+    """The Bars written for this snapshot, or None when missing / built from other data."""
+    if store.pa is None:
+        return None
+    bp, sp, meta_path = resampled_paths(data_dir)
+    try:
+        meta = json.loads(meta_path.read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        return None
+    if meta.get("version") != RESAMPLED_VERSION or meta.get("snapshot") != snapshot:
+        return None
+    if not (bp.exists() and sp.exists()):
+        return None
+    return Bars(store.feather.read_table(bp, memory_map=True).to_pandas(),
+                store.feather.read_table(sp, memory_map=True).to_pandas(), meta.get("freqs", []))
+
+def load_bars(data_dir: Path, snapshot: str) -> Bars | None:
+    """read_bars(), falling back to build_bars() (memoised per snapshot); None when there is no source."""
+    got = read_bars(data_dir, snapshot)
+    if got is not None:
+        return got
+    key = (str(Path(data_dir).resolve()), snapshot)
+    with _lock:
+        if key in _built:
+            return _built[key]
+    bars, band, info = build_bars(data_dir)
+    built = Bars(bars, band, info["freqs"]) if info else None
+    with _lock:
+        _built.clear()
+        _built[key] = built
+    return built
@@ -0,0 +1,153 @@
+# markmentum/search.py
+#
+# Ticker / name search shared by the Deep Dive and the Universe page. Built once
+# per data snapshot (pages hold it in st.cache_resource), then every query is a
+# few index lookups instead of str.contains over the whole directory:
+#   - sorted ticker / name arrays: exact and prefix matches are np.searchsorted ranges
+#   - inverted n-gram index (1- to 3-grams) over tickers and names: a query of up
+#     to 3 characters is a single posting list, a longer one intersects its
+#     trigram postings and verifies the few survivors
+#   - fuzzy: share of the query's bigrams a name contains (np.bincount)
+# Results are row positions of the frame the index was built from, ranked
+#   exact > prefix > substring > fuzzy
+# (ticker before name within a tier).
+
+import re
+from collections import defaultdict
+
+import numpy as np
+import pandas as pd
+
+NGRAM = 3
+FUZZY_NGRAM = 2        # bigrams survive typos / transpositions better than trigrams
+FUZZY_MIN = 0.7        # share of the query's bigrams a fuzzy hit must contain
+
+_SPACES = re.compile(r"\s+")
+
+
+# -------------------------
+# Helpers
+# -------------------------
+def normalize(text) -> str:
+    return _SPACES.sub(" ", str(text or "")).strip().upper()
+
+def _grams(s: str, n: int) -> set:
+    return {s[i:i + n] for i in range(len(s) - n + 1)}
+
+def _postings(values: list[str]) -> dict:
+    # gram -> sorted int32 row positions, for every gram length 1..NGRAM
+    acc = defaultdict(list)
+    for row, v in enumerate(values):
+        for n in range(1, NGRAM + 1):
+            for g in _grams(v, n):
+                acc[g].append(row)
+    return {g: np.asarray(rows, dtype=np.int32) for g, rows in acc.items()}
+
+def _sorted_index(values: list[str]) -> tuple[np.ndarray, np.ndarray]:
+    order = np.argsort(np.asarray(values, dtype=object), kind="stable").astype(np.int32)
+    return np.asarray(values, dtype=object)[order], order
+
+_EMPTY = np.empty(0, dtype=np.int32)
+
+
+# -------------------------
+# Index
+# -------------------------
+class TickerSearch:
+    """Search index over (ticker, name) rows. Immutable once built; thread-safe."""
+
+    def __init__(self, tickers, names):
+        self.tickers = [normalize(t) for t in tickers]
+        self.names = [normalize(n) for n in names]
+        self.size = len(self.tickers)
+
+        self._ticker_sorted, self._ticker_order = _sorted_index(self.tickers)
+        self._name_sorted, self._name_order = _sorted_index(self.names)
+        self._ticker_len = np.asarray([len(t) for t in self.tickers], dtype=np.int32)
+        self._name_len = np.asarray([len(n) for n in self.names], dtype=np.int32)
+        self._ticker_grams = _postings(self.tickers)
+        self._name_grams = _postings(self.names)
+
+    @classmethod
+    def from_frame(cls, df: pd.DataFrame, ticker_col: str = "Ticker",
+                   name_col: str = "Ticker_name") -> "TickerSearch":
+        return cls(df[ticker_col].tolist(), df[name_col].tolist())
+
+    # ---- lookups ----
+    @staticmethod
+    def _range(sorted_values: np.ndarray, order: np.ndarray, lo: str, hi: str) -> np.ndarray:
+        i = np.searchsorted(sorted_values, lo, side="left")
+        j = np.searchsorted(sorted_values, hi, side="left")
+        return order[i:j]
+
+    def _exact(self, sorted_values, order, q: str) -> np.ndarray:
+        i = np.searchsorted(sorted_values, q, side="left")
+        j = np.searchsorted(sorted_values, q, side="right")
+        return order[i:j]
+
+    def _ticker_prefix(self, q: str) -> np.ndarray:
+        rows = self._range(self._ticker_sorted, self._ticker_order, q, q + "\uffff")
+        # shorter tickers first: "A" before "AAPL" before "AAPLX"
+        return rows[np.argsort(self._ticker_len[rows], kind="stable")]
+
+    def _contains(self, grams: dict, values: list[str], q: str) -> np.ndarray:
+        if len(q) <= NGRAM:
+            return grams.get(q, _EMPTY)        # the gram's posting list is the answer
+        rows = None
+        for g in sorted(_grams(q, NGRAM), key=lambda g: len(grams.get(g, _EMPTY))):
+            post = grams.get(g)
+            if post is None:
+                return _EMPTY
+            rows = post if rows is None else np.intersect1d(rows, post, assume_unique=True)
+            if rows.size == 0:
+                return _EMPTY
+        return np.asarray([r for r in rows if q in values[r]], dtype=np.int32)
+
+    def _fuzzy(self, q: str) -> np.ndarray:
+        grams = _grams(q, FUZZY_NGRAM)
+        posts = [self._name_grams[g] for g in grams if g in self._name_grams]
+        if len(grams) < 3 or not posts:
+            return _EMPTY
+        share = np.bincount(np.concatenate(posts), minlength=self.size) / len(grams)
+        rows = np.flatnonzero(share >= FUZZY_MIN)
+        # best share first; ties go to the name closest in length to the query
+        gap = np.abs(self._name_len[rows] - len(q))
+        return rows[np.lexsort((gap, -share[rows]))].astype(np.int32)
+
+    def _tiers(self, q: str, fuzzy: bool):
+        # lazily, best first: later tiers are only computed when still needed
+        yield self._exact(self._ticker_sorted, self._ticker_order, q)
+        yield self._exact(self._name_sorted, self._name_order, q)
+        yield self._ticker_prefix(q)
+        yield self._range(self._name_sorted, self._name_order, q, q + "\uffff")
+        yield self._contains(self._ticker_grams, self.tickers, q)
+        yield self._contains(self._name_grams, self.names, q)
+        if fuzzy:
+            yield self._fuzzy(q)
+
+    # ---- query ----
+    def search(self, query, limit: int | None = None, fuzzy: bool = True) -> np.ndarray:
+        """Row positions (int array) matching query, best first, at most limit."""
+        q = normalize(query)
+        if not q:
+            return _EMPTY
+        tiers = self._tiers(q, fuzzy)
+        if limit is None:
+            hits = np.concatenate(list(tiers))
+            _, first = np.unique(hits, return_index=True)   # keep each row's best tier
+            return hits[np.sort(first)]
+        out, seen = [], set()
+        for tier in tiers:
+            for r in tier:
+                r = int(r)
+                if r not in seen:
+                    seen.add(r)
+                    out.append(r)
+                    if len(out) >= limit:
+                        return np.asarray(out, dtype=np.int32)
+        return np.asarray(out, dtype=np.int32)
+
+    def best(self, query) -> str | None:
+        """Ticker of the top hit (None when nothing matches)."""
+        hits = self.search(query, limit=1)
+        return self.tickers[hits[0]] if len(hits) else None
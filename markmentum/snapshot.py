@@ -0,0 +1,100 @@
+# markmentum/snapshot.py
+#
+# Data-snapshot version: one short hash that changes exactly when the nightly
+# drop in data/ changes. Pages pass it into every @st.cache_data loader as a
+# plain (hashed) argument, so cached entries expire on new data instead of a
+# global st.cache_data.clear() on every page run.
+#
+# The ingest step writes data/_manifest.json (content hash per file). At runtime
+# we only stat() the files; the content hashes are recomputed once per process
+# when the stats no longer match the manifest (e.g. after a fresh checkout).
+
+import hashlib
+import json
+from pathlib import Path
+
+from markmentum.fileinfo import file_digest
+
+MANIFEST_NAME = "_manifest.json"
+MANIFEST_VERSION = 1
+
+# file kinds that make up the nightly drop (derived _index/_store dirs are excluded)
+SNAPSHOT_SUFFIXES = (".csv", ".docx", ".pdf")
+
+# stat fingerprint -> snapshot version
+_VERSION_MEMO: dict = {}
+
+
+# -------------------------
+# Helpers
+# -------------------------
+def _snapshot_files(data_dir: Path) -> list[Path]:
+    return sorted(p for p in Path(data_dir).iterdir()
+                  if p.is_file() and p.suffix.lower() in SNAPSHOT_SUFFIXES)
+
+def _stat_fingerprint(files) -> str:
+    h = hashlib.sha1()
+    for p in files:
+        st_ = p.stat()
+        h.update(f"{p.name}|{st_.st_size}|{st_.st_mtime_ns}\n".encode("utf-8"))
+    return h.hexdigest()
+
+def _content_version(digests: dict) -> str:
+    h = hashlib.sha1()
+    for name in sorted(digests):
+        h.update(f"{name}|{digests[name]}\n".encode("utf-8"))
+    return h.hexdigest()[:16]
+
+
+# -------------------------
+# Manifest
+# -------------------------
+def build_manifest(data_dir: Path) -> dict:
+    files = _snapshot_files(data_dir)
+    digests = {p.name: file_digest(p) for p in files}
+    return {
+        "version": MANIFEST_VERSION,
+        "snapshot": _content_version(digests),
+        "stat": _stat_fingerprint(files),
+        "files": digests,
+    }
+
+def write_manifest(data_dir: Path) -> dict:
+    man = build_manifest(data_dir)
+    out = Path(data_dir) / MANIFEST_NAME
+    tmp = out.with_suffix(".tmp")
+    tmp.write_text(json.dumps(man, indent=1), encoding="utf-8")
+    tmp.replace(out)
+    return man
+
+def load_manifest(data_dir: Path) -> dict | None:
+    try:
+        man = json.loads((Path(data_dir) / MANIFEST_NAME).read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        return None
+    return man if man.get("version") == MANIFEST_VERSION else None
+
+
+# -------------------------
+# Runtime
+# -------------------------
+def snapshot_version(data_dir: Path) -> str:
+    """
+    Version string of the data currently in data_dir. Cheap on the hot path
+    (one stat per file); content-hashes only when the files changed.
+    """
+    files = _snapshot_files(data_dir)
+    fp = _stat_fingerprint(files)
+    if fp in _VERSION_MEMO:
+        return _VERSION_MEMO[fp]
+
+    man = load_manifest(data_dir)
+    if man is not None and man.get("stat") == fp:
+        version = man["snapshot"]
+    else:
+        # no manifest, or files touched since ingest -> hash contents; identical
+        # contents (fresh checkout of the same drop) still give the manifest's version
+        version = _content_version({p.name: file_digest(p) for p in files})
+
+    _VERSION_MEMO[fp] = version
+    return version
@@ -0,0 +1,262 @@
+# markmentum/store.py
+#
+# Columnar snapshot store. The ingest step converts each data/*.csv export into
+# an Arrow IPC (Feather v2) file with explicit dtypes:
+#   - date columns      -> datetime64[ns]
+#   - numeric columns   -> int64 / float64 (as inferred once at ingest)
+#   - everything else   -> string (object on read, as with read_csv)
+# Files are written uncompressed so reads are memory-mapped, and ticker-sorted
+# files carry a  ticker -> [row_start, row_count]  map so one ticker is a slice.
+#
+# History exports repeat per-ticker constants on every date row: the ticker
+# itself and the band columns (*_avg / *_hi / *_lo). Those are split off at
+# ingest – the Feather file keeps the narrow (date, value) series and
+# <stem>.bands.feather one row per ticker, in block order – and rejoined (an
+# Arrow take) only when a read asks for them.
+#
+# read_table() / read_ticker_rows() are the shared loaders for every page. They
+# read only the requested columns, and fall back to the CSV when no columnar
+# file exists, pyarrow is not installed, or the CSV changed since ingest.
+
+import json
+import re
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from markmentum import csv_index
+from markmentum.fileinfo import matches_source, source_stamp
+
+try:
+    import pyarrow as pa
+    import pyarrow.feather as feather
+except Exception:
+    pa = None
+    feather = None
+
+STORE_DIRNAME = "_store"
+STORE_VERSION = 2
+_META_KEY = b"markmentum"
+
+DATE_COLUMNS = ("date", "as_of_date", "trade_date")
+BAND_SUFFIX = re.compile(r"_(avg|hi|lo|low)(_pct)?$")
+
+# validated store metadata, keyed by (csv path, mtime_ns, size)
+_META_MEMO: dict = {}
+
+
+# -------------------------
+# Helpers
+# -------------------------
+def columnar_path(csv_path: Path) -> Path:
+    csv_path = Path(csv_path)
+    return csv_path.parent / STORE_DIRNAME / f"{csv_path.stem}.feather"
+
+def bands_path(csv_path: Path) -> Path:
+    csv_path = Path(csv_path)
+    return csv_path.parent / STORE_DIRNAME / f"{csv_path.stem}.bands.feather"
+
+def _typed(df: pd.DataFrame) -> pd.DataFrame:
+    # explicit dtypes, decided once here instead of on every page load
+    # (object columns are written as Arrow strings and come back as plain str/object)
+    for c in df.columns:
+        if str(c).strip().lower() in DATE_COLUMNS:
+            df[c] = pd.to_datetime(df[c], errors="coerce")
+        elif df[c].dtype == object:
+            df[c] = df[c].where(df[c].isna(), df[c].astype(str))
+    return df
+
+def _ticker_rows(df: pd.DataFrame) -> dict | None:
+    # ticker -> [row_start, row_count] when the file is in contiguous ticker blocks
+    tcol = next((c for c in df.columns if str(c).strip().lower() == "ticker"), None)
+    if tcol is None or df.empty:
+        return None
+    t = df[tcol].astype(str).to_numpy()
+    starts = [0, *(np.flatnonzero(t[1:] != t[:-1]) + 1).tolist()]
+    if len(starts) != len(set(t)):
+        return None  # ticker appears in more than one block -> not sorted
+    ends = [*starts[1:], len(t)]
+    return {str(t[s]): [s, e - s] for s, e in zip(starts, ends)}
+
+def _per_ticker_columns(df: pd.DataFrame, rows: dict | None) -> list[str]:
+    # ticker + numeric *_avg / *_hi / *_lo columns constant within every ticker
+    # block of a history file; [] when there are no such bands
+    if not rows or len(rows) == len(df):
+        return []
+    starts = np.array([s for s, _ in rows.values()])
+    counts = np.array([n for _, n in rows.values()])
+    out = []
+    for c in df.columns:
+        if not BAND_SUFFIX.search(str(c).strip().lower()) or not pd.api.types.is_numeric_dtype(df[c]):
+            continue
+        v = df[c].to_numpy(dtype=float)
+        if np.array_equal(v, np.repeat(v[starts], counts), equal_nan=True):
+            out.append(c)
+    tcol = next(c for c in df.columns if str(c).strip().lower() == "ticker")
+    return [tcol, *out] if out else []
+
+def _resolve_columns(available, wanted) -> list[str] | None:
+    # case-insensitive projection; unknown names are dropped (callers check "need")
+    if wanted is None:
+        return None
+    lower = {str(c).strip().lower(): c for c in available}
+    out = []
+    for w in wanted:
+        c = lower.get(str(w).strip().lower())
+        if c is not None and c not in out:
+            out.append(c)
+    return out
+
+def _csv_usecols(wanted):
+    if wanted is None:
+        return None
+    keep = {str(w).strip().lower() for w in wanted}
+    return lambda c: str(c).strip().lower() in keep
+
+
+# -------------------------
+# Ingest
+# -------------------------
+def write_columnar(csv_path: Path) -> Path | None:
+    """
+    Convert one CSV into its typed Feather file. Returns the path, or None when
+    pyarrow is unavailable.
+    """
+    if pa is None:
+        return None
+    csv_path = Path(csv_path)
+    df = _typed(pd.read_csv(csv_path))
+    rows = _ticker_rows(df)
+    per_ticker = _per_ticker_columns(df, rows)
+    table = pa.Table.from_pandas(df.drop(columns=per_ticker), preserve_index=False)
+    meta = {
+        "version": STORE_VERSION,
+        "source": source_stamp(csv_path),
+        "tickers": rows,
+        "columns": [str(c) for c in df.columns],
+        "per_ticker": per_ticker,
+    }
+    table = table.replace_schema_metadata({
+        **(table.schema.metadata or {}),
+        _META_KEY: json.dumps(meta, separators=(",", ":")).encode("utf-8"),
+    })
+    out = columnar_path(csv_path)
+    out.parent.mkdir(parents=True, exist_ok=True)
+    side = bands_path(csv_path)
+    if per_ticker:
+        # one row per ticker block, written before the table whose meta points at it
+        first = df.iloc[[s for s, _ in rows.values()]][per_ticker].reset_index(drop=True)
+        tmp = side.with_suffix(".tmp")
+        feather.write_feather(pa.Table.from_pandas(first, preserve_index=False), tmp,
+                              compression="uncompressed")
+        tmp.replace(side)
+    else:
+        side.unlink(missing_ok=True)
+    tmp = out.with_suffix(".tmp")
+    feather.write_feather(table, tmp, compression="uncompressed")
+    tmp.replace(out)
+    return out
+
+
+# -------------------------
+# Load / read
+# -------------------------
+def store_meta(csv_path: Path) -> dict | None:
+    """
+    Store metadata for csv_path if a columnar file exists and still matches the
+    CSV, else None (-> callers use the CSV).
+    """
+    if pa is None:
+        return None
+    csv_path = Path(csv_path)
+    fp = columnar_path(csv_path)
+    try:
+        st_ = csv_path.stat()
+    except OSError:
+        return None
+    key = (str(csv_path), st_.st_mtime_ns, st_.st_size)
+    if key in _META_MEMO:
+        return _META_MEMO[key]
+
+    meta = None
+    try:
+        schema = pa.ipc.open_file(pa.memory_map(str(fp), "r")).schema
+        raw = json.loads((schema.metadata or {}).get(_META_KEY, b"{}"))
+        if raw.get("version") == STORE_VERSION and matches_source(csv_path, raw.get("source")):
+            meta = raw
+            if meta.get("per_ticker"):
+                meta["ticker_index"] = {t: i for i, t in enumerate(meta["tickers"])}
+    except (OSError, ValueError, pa.ArrowException):
+        meta = None
+
+    _META_MEMO[key] = meta
+    return meta
+
+def _read_feather(csv_path: Path, meta: dict, columns=None, span=None) -> "pa.Table":
+    # span: (row start, row count, side-table row) of one ticker; per-ticker
+    # columns are only read and repeated when `columns` asks for them (or is None)
+    table = feather.read_table(columnar_path(csv_path), memory_map=True)
+    if span is not None:
+        table = table.slice(span[0], span[1])
+    per_ticker = meta.get("per_ticker") or []
+    if not per_ticker:
+        cols = _resolve_columns(table.column_names, columns)
+        return table if cols is None else table.select(cols)
+    cols = _resolve_columns(meta["columns"], columns) or ([] if columns is not None else meta["columns"])
+    wanted = [c for c in cols if c in per_ticker]
+    if not wanted:
+        return table.select(cols)
+    if span is None:
+        counts = [n for _, n in meta["tickers"].values()]
+        take = np.repeat(np.arange(len(counts)), counts)
+    else:
+        take = np.full(span[1], span[2])
+    side = feather.read_table(bands_path(csv_path), columns=wanted, memory_map=True).take(pa.array(take))
+    return pa.table([side.column(c) if c in per_ticker else table.column(c) for c in cols], names=cols)
+
+def read_table(csv_path: Path, columns=None) -> pd.DataFrame:
+    """
+    Whole table for one export, optionally projected to `columns`
+    (case-insensitive). Empty frame when the CSV does not exist.
+    """
+    csv_path = Path(csv_path)
+    if not csv_path.exists():
+        return pd.DataFrame()
+    meta = store_meta(csv_path)
+    if meta is not None:
+        return _read_feather(csv_path, meta, columns).to_pandas()
+    return pd.read_csv(csv_path, usecols=_csv_usecols(columns))
+
+def read_ticker_rows(csv_path: Path, ticker: str, columns=None) -> pd.DataFrame:
+    """
+    Rows of one ticker, columns stripped + lower-cased (the Deep Dive convention).
+    Columnar slice when available, else the CSV byte-offset index / chunk scan.
+    """
+    csv_path = Path(csv_path)
+    if not csv_path.exists():
+        return pd.DataFrame()
+    if columns is not None:
+        columns = ["ticker", *columns]
+
+    meta = store_meta(csv_path)
+    if meta is None:
+        return csv_index.read_ticker_rows(csv_path, ticker, usecols=_csv_usecols(columns))
+
+    rows = meta.get("tickers")
+    if rows is not None:
+        span = rows.get(str(ticker))
+        if span is None:
+            return pd.DataFrame()
+        side_row = meta.get("ticker_index", {}).get(str(ticker), 0)
+        df = _read_feather(csv_path, meta, columns, (span[0], span[1], side_row)).to_pandas()
+    else:
+        df = _read_feather(csv_path, meta, columns).to_pandas()
+        tcol = next((c for c in df.columns if str(c).strip().lower() == "ticker"), None)
+        if tcol is not None:
+            df = df.loc[df[tcol] == ticker].reset_index(drop=True)
+
+    if df.empty:
+        return pd.DataFrame()
+    df.columns = [str(c).strip().lower() for c in df.columns]
+    return df
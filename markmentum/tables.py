@@ -0,0 +1,133 @@
+# markmentum/tables.py
+#
+# Shared HTML table renderer for the card pages (Morning Compass, Market
+# Overview, Filters, Volatility Spreads, Signals, the heatmap pages).
+# Formatting works a whole column at a time – numeric coercion, scaling and NaN
+# handling in numpy, one format call per value – and the <table> (optional
+# <colgroup>, <thead>, <tbody>) is assembled in a single pass with no
+# iterrows(), DataFrame.to_html() or string patching afterwards.
+# Output has no leading indentation and no blank lines, so st.markdown keeps
+# it as one raw HTML block.
+
+import html
+from dataclasses import dataclass
+from urllib.parse import quote_plus
+
+import numpy as np
+import pandas as pd
+
+
+# -------------------------
+# Column formatters (array in -> object array of str out)
+# -------------------------
+def _numeric(values) -> np.ndarray:
+    return pd.to_numeric(pd.Series(values, copy=False), errors="coerce").to_numpy(dtype=float)
+
+def fmt_number(values, decimals: int = 2, *, scale: float = 1.0, suffix: str = "",
+               na: str = "") -> np.ndarray:
+    """'1,234.56' style (thousands separators); na for missing / non-numeric."""
+    x = _numeric(values) * scale
+    out = np.full(x.shape, na, dtype=object)
+    ok = np.isfinite(x)
+    spec = f",.{decimals}f"
+    out[ok] = [format(v, spec) + suffix for v in x[ok].tolist()]
+    return out
+
+def fmt_percent(values, decimals: int = 2, *, scale: float = 100.0, na: str = "") -> np.ndarray:
+    """Fractions -> '12.34%' (pass scale=1 when the column is already in percent)."""
+    return fmt_number(values, decimals, scale=scale, suffix="%", na=na)
+
+def fmt_int(values, na: str = "") -> np.ndarray:
+    """'1,234' (rounded half to even); -0.4 shows as 0, not -0."""
+    return fmt_number(np.rint(_numeric(values)) + 0.0, 0, na=na)
+
+def fmt_millions(values, decimals: int = 2, *, na: str = "") -> np.ndarray:
+    return fmt_number(values, decimals, scale=1e-6, suffix=" M", na=na)
+
+def escape_text(values, na: str = "") -> np.ndarray:
+    """Plain text cells, HTML-escaped; missing values become na."""
+    s = pd.Series(values, copy=False)
+    out = np.full(len(s), na, dtype=object)
+    ok = s.notna().to_numpy()
+    out[ok] = [html.escape(str(v), quote=False) for v in s[ok].tolist()]
+    return out
+
+def ticker_links(values) -> np.ndarray:
+    """Deep Dive links (same markup as the pages' _mk_ticker_link), one per ticker."""
+    s = pd.Series(values, copy=False)
+    s = s.astype(object).where(s.notna(), "").astype(str).str.strip().str.upper()
+    out = np.full(len(s), "", dtype=object)
+    ok = (s != "").to_numpy()
+    out[ok] = [f'<a href="?page=Deep%20Dive&ticker={quote_plus(t)}" target="_self" rel="noopener" '
+               f'style="text-decoration:none; font-weight:600;">{t}</a>' for t in s[ok].tolist()]
+    return out
+
+
+# -------------------------
+# Table
+# -------------------------
+@dataclass
+class Column:
+    """One table column: header text plus the cells' HTML (array-like of str, one per row)."""
+    header: str
+    cells: object
+    td_class: str = ""
+    th_class: str = ""
+    td_style: str = ""
+    th_style: str = ""
+    col_class: str | None = None     # <col class=…> in the colgroup (None -> bare <col>)
+
+def _attrs(cls: str, style: str) -> str:
+    return (f' class="{cls}"' if cls else "") + (f' style="{style}"' if style else "")
+
+def table_html(columns: list[Column], classes: str = "tbl", colgroup: bool | None = None) -> str:
+    """
+    <table> from columns in one pass. The colgroup is written when any column
+    names a col_class (or colgroup=True).
+    """
+    n = len(columns[0].cells) if columns else 0
+    parts = [f'<table class="{classes}">']
+    if colgroup or (colgroup is None and any(c.col_class for c in columns)):
+        parts.append("<colgroup>" + "".join(
+            f'<col class="{c.col_class}">' if c.col_class else "<col>" for c in columns) + "</colgroup>")
+    parts.append("<thead><tr>" + "".join(
+        f"<th{_attrs(c.th_class, c.th_style)}>{c.header}</th>" for c in columns) + "</tr></thead>")
+
+    rows = np.full(n, "<tr>", dtype=object)
+    for c in columns:
+        cells = np.asarray(c.cells, dtype=object)
+        rows = rows + f"<td{_attrs(c.td_class, c.td_style)}>" + cells + "</td>"
+    parts.append("<tbody>" + "\n".join((rows + "</tr>").tolist()) + "</tbody>")
+    parts.append("</table>")
+    return "\n".join(parts)
+
+def frame_table_html(df: pd.DataFrame, col_classes=None, classes: str = "tbl") -> str:
+    """Drop-in for df.to_html(index=False, escape=False) with an optional colgroup."""
+    col_classes = list(col_classes) if col_classes is not None else [None] * df.shape[1]
+    # where, not fillna: fillna on object columns downcasts (FutureWarning on every numeric column)
+    cols = [Column(str(h), df[h].astype(object).where(df[h].notna(), "").astype(str).to_numpy(dtype=object),
+                   col_class=cc)
+            for h, cc in zip(df.columns, col_classes)]
+    return table_html(cols, classes=classes)
+
+def card_html(title: str, table: str, extra_class: str = "") -> str:
+    cls = f"card {extra_class}".strip()
+    return f'<div class="{cls}">\n<h3>{title}</h3>\n{table}\n</div>'
+
+
+# -------------------------
+# Card-page helpers
+# -------------------------
+def pick_column(df: pd.DataFrame, *names: str) -> str | None:
+    """First of names present in df (case-insensitive), else None."""
+    cmap = {str(c).lower(): c for c in df.columns}
+    for n in names:
+        if n.lower() in cmap:
+            return cmap[n.lower()]
+    return None
+
+def column_values(df: pd.DataFrame, col: str | None) -> np.ndarray:
+    """df[col] as an object array ('' for every row when the column is missing)."""
+    if col is None or col not in df.columns:
+        return np.full(len(df), "", dtype=object)
+    return df[col].to_numpy(dtype=object)
@@ -0,0 +1,113 @@
+# markmentum/tints.py
+#
+# Colour scales for the tinted / badge cells of the Morning Compass and the
+# heatmap pages (Performance, Sharpe Rank, Markmentum, Directional Trends).
+# A scale is a list of bands split at fixed edges; a band either has a fixed
+# background or an rgb whose alpha grows with the distance from an origin
+# (capped). tint_cells() takes a whole column, finds every value's band with
+# numpy comparisons, computes the alphas as arrays and looks their text up in
+# a precomputed table, then joins the <span> cells with object-array adds –
+# no per-cell float() / pd.isna() / f-string.
+#
+#   diverging(vmax)  red below zero, green above, alpha by |v| / vmax
+#   Banded(...)      any edges / palette (MM Score badges, Buy/Sell bands)
+
+from dataclasses import dataclass
+
+import numpy as np
+import pandas as pd
+
+GREEN = "16,185,129"
+RED = "239,68,68"
+GRAY = "rgba(156,163,175,0.18)"
+
+
+# -------------------------
+# Scale spec
+# -------------------------
+@dataclass(frozen=True)
+class Band:
+    """bg is a CSS colour when origin is None, else the 'r,g,b' of a scaled tint."""
+    bg: str
+    color: str | None = None          # text colour
+    origin: float | None = None       # alpha = base + span * min(|v - origin| / width, 1)
+    width: float = 1.0
+
+@dataclass(frozen=True)
+class Banded:
+    edges: tuple[float, ...]          # ascending, len(bands) - 1
+    bands: tuple[Band, ...]           # low to high
+    upper: tuple[bool, ...]           # per edge: the edge value itself falls in the band above
+    clip: tuple[float, float] | None = None
+    base: float = 0.12
+    span: float = 0.28
+    digits: int = 3                   # decimals of the alpha in rgba()
+
+    def bucket(self, v: np.ndarray) -> np.ndarray:
+        """Band index of every value (NaN lands in 0; callers mask it)."""
+        idx = np.zeros(v.shape, dtype=np.int8)
+        for edge, up in zip(self.edges, self.upper):
+            idx += (v >= edge) if up else (v > edge)
+        return idx
+
+def diverging(vmax, *, base: float = 0.12, span: float = 0.28, neutral: float = 0.0,
+              digits: int = 3) -> Banded | None:
+    """
+    Red below -neutral, green above +neutral, transparent in between; alpha
+    reaches base + span at |v| >= vmax. None (blank cells) without a usable vmax.
+    """
+    if vmax is None or pd.isna(vmax) or vmax <= 0:
+        return None
+    return Banded(edges=(-neutral, neutral),
+                  bands=(Band(RED, origin=0.0, width=float(vmax)),
+                         Band("transparent"),
+                         Band(GREEN, origin=0.0, width=float(vmax))),
+                  upper=(True, False), base=base, span=span, digits=digits)
+
+
+# -------------------------
+# Rendering
+# -------------------------
+_ALPHA_TEXT: dict[int, np.ndarray] = {}
+
+def _alpha_text(alpha: np.ndarray, digits: int) -> np.ndarray:
+    # '0.123' strings by table lookup instead of one format call per cell
+    table = _ALPHA_TEXT.get(digits)
+    if table is None:
+        n = 10 ** digits
+        table = _ALPHA_TEXT[digits] = np.array([f"{k / n:.{digits}f}" for k in range(n + 1)], dtype=object)
+    k = np.rint(np.clip(alpha, 0.0, 1.0) * (len(table) - 1)).astype(np.intp)
+    return table[k]
+
+def tint_cells(values, scale: Banded | None, labels, *, pad: int = 4, radius: int = 2,
+               align_right: bool = False) -> np.ndarray:
+    """
+    Styled <span> cells for a column. labels are the cell texts (e.g. from
+    markmentum.tables.fmt_number); missing values and scale=None give ''.
+    """
+    v = pd.to_numeric(pd.Series(values, copy=False), errors="coerce").to_numpy(dtype=float)
+    out = np.full(v.shape, "", dtype=object)
+    ok = np.isfinite(v)
+    if scale is None or not ok.any():
+        return out
+    if scale.clip is not None:
+        v = np.clip(v, *scale.clip)
+
+    idx = scale.bucket(v)
+    bg = np.empty(v.shape, dtype=object)
+    mid = np.empty(v.shape, dtype=object)
+    for k, band in enumerate(scale.bands):
+        sel = ok & (idx == k)
+        if not sel.any():
+            continue
+        if band.origin is None:
+            bg[sel] = band.bg
+        else:
+            strength = np.minimum(np.abs(v[sel] - band.origin) / band.width, 1.0)
+            bg[sel] = f"rgba({band.bg}," + _alpha_text(scale.base + scale.span * strength, scale.digits) + ")"
+        mid[sel] = f"; color:{band.color}; " if band.color else "; "
+
+    tail = f'padding:0 {pad}px; border-radius:{radius}px;' + (" text-align:right;" if align_right else "") + '">'
+    labels = np.asarray(labels, dtype=object)
+    out[ok] = '<span style="display:block; background:' + bg[ok] + mid[ok] + tail + labels[ok] + "</span>"
+    return out
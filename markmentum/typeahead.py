@@ -0,0 +1,91 @@
+# markmentum/typeahead.py
+#
+# Client-side ticker typeahead (Streamlit custom component, frontend in
+# typeahead_frontend/index.html). The ticker directory is written once per
+# snapshot as directory-<snapshot>.json beside the frontend and fetched by the
+# browser from there – immutable name, so it is cached and never re-sent with
+# each rerun. The previous snapshot's file is kept until the next one lands, so
+# browsers still on it keep working. When the install is read-only the rows go
+# in the component args instead. Ranking (ticker prefix > ticker contains >
+# name contains) runs in the browser; the server sees one event per committed
+# pick (or, for text with no local match, one query for markmentum.search to
+# resolve).
+
+import json
+import os
+import threading
+from pathlib import Path
+
+import pandas as pd
+import streamlit.components.v1 as components
+
+FRONTEND_DIR = Path(__file__).resolve().parent / "typeahead_frontend"
+DIRECTORY_PREFIX = "directory-"
+
+_component = components.declare_component("ticker_typeahead", path=str(FRONTEND_DIR))
+_lock = threading.Lock()
+
+
+# -------------------------
+# Directory file
+# -------------------------
+def directory_name(snapshot: str) -> str:
+    return f"{DIRECTORY_PREFIX}{snapshot}.json"
+
+def _rows(directory: pd.DataFrame) -> list:
+    return (directory[["ticker", "ticker_name"]].astype(str)
+            .drop_duplicates("ticker").sort_values("ticker").values.tolist())
+
+def _prune(keep: str) -> None:
+    # keep this snapshot's file and the newest other one (pages still open on it)
+    olds = []
+    for p in FRONTEND_DIR.glob(f"{DIRECTORY_PREFIX}*.json"):
+        try:
+            if p.name != keep:
+                olds.append((p.stat().st_mtime_ns, p))
+        except OSError:
+            pass   # removed by another process meanwhile
+    for _, p in sorted(olds, key=lambda t: t[0], reverse=True)[1:]:
+        p.unlink(missing_ok=True)
+
+def write_directory(directory: pd.DataFrame, snapshot: str) -> str | None:
+    """
+    directory-<snapshot>.json from a (ticker, ticker_name) frame, unless already
+    there; files older than the previous snapshot's are removed. Returns the
+    file name, or None when the frontend directory is not writable.
+    """
+    name = directory_name(snapshot)
+    path = FRONTEND_DIR / name
+    if path.exists():
+        return name
+    tmp = path.with_name(f"{name}.{os.getpid()}.{threading.get_ident()}.tmp")
+    with _lock:
+        try:
+            tmp.write_text(json.dumps(_rows(directory), separators=(",", ":")), encoding="utf-8")
+            tmp.replace(path)
+            _prune(name)
+        except OSError:
+            # read-only install (or a full disk): no file, unless another process wrote it
+            try:
+                tmp.unlink(missing_ok=True)
+            except OSError:
+                pass
+            return name if path.exists() else None
+    return name
+
+
+# -------------------------
+# Component
+# -------------------------
+def ticker_typeahead(directory: pd.DataFrame, snapshot: str, value: str, *, key: str,
+                     on_change=None, placeholder: str = "Type ticker or name…") -> dict | None:
+    """
+    Render the search box. Returns the last pick as {"ticker", "ts"}, or
+    {"query", "ts"} when Enter was pressed on text with no local suggestion
+    (None before the first); pass on_change to act on it before the rerun starts.
+    """
+    name = write_directory(directory, snapshot)
+    # read-only install: the rows travel with the args (re-sent each rerun, still ranked in the browser)
+    rows = None if name else _rows(directory)
+    return _component(directory=name or directory_name(snapshot), rows=rows, value=value,
+                      placeholder=placeholder, key=key, on_change=on_change, default=None)
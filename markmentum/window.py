@@ -0,0 +1,61 @@
+# markmentum/window.py
+#
+# Deep Dive date-range presets (the "Range" control) and the windowing helper
+# shared by the page and the offline pre-render (python -m markmentum.prerender).
+#
+# Graph frames from markmentum.graphs.normalize carry a sorted DatetimeIndex
+# (their dates), so a window is one searchsorted + iloc slice – a view of the
+# cached frame, no mask, no copy. Every graph of a snapshot ends on one of a
+# few dates, so the five preset starts are computed once per end date.
+
+from functools import lru_cache
+
+import pandas as pd
+
+RANGE_OPTIONS = ["3M", "6M", "YTD", "1Y", "All"]
+
+
+def range_start(end_date: pd.Timestamp, label: str) -> pd.Timestamp | None:
+    if label == "3M":
+        return end_date - pd.DateOffset(months=3)
+    if label == "6M":
+        return end_date - pd.DateOffset(months=6)
+    if label == "YTD":
+        return pd.Timestamp(end_date.year, 1, 1)
+    if label == "1Y":
+        return end_date - pd.DateOffset(years=1)
+    return None  # All
+
+@lru_cache(maxsize=256)
+def preset_starts(end_date: pd.Timestamp, gutter_days: int = 5) -> dict:
+    """{label: first date shown (preset start less the gutter) or None for All}, per end date."""
+    gutter = pd.Timedelta(days=gutter_days)
+    return {label: (None if (s := range_start(end_date, label)) is None else s - gutter)
+            for label in RANGE_OPTIONS}
+
+def _sorted_index(df: pd.DataFrame) -> pd.DatetimeIndex | None:
+    idx = df.index
+    return idx if isinstance(idx, pd.DatetimeIndex) and idx.is_monotonic_increasing else None
+
+def apply_window_with_gutter(df: pd.DataFrame, label: str, date_col: str = "date", gutter_days: int = 5) -> pd.DataFrame:
+    if df.empty:
+        return df
+    idx = _sorted_index(df)
+    if idx is None:
+        # frames without a sorted date index (not from normalize): mask on the column
+        end = pd.to_datetime(df[date_col]).max()
+        start_raw = range_start(end, label)
+        if start_raw is None:
+            start = df[date_col].min() - pd.Timedelta(days=gutter_days)
+            end = end + pd.Timedelta(days=gutter_days)
+        else:
+            start = max(df[date_col].min(), start_raw - pd.Timedelta(days=gutter_days))
+            end   = end + pd.Timedelta(days=gutter_days)
+        m = (df[date_col] >= start) & (df[date_col] <= end)
+        return df.loc[m].copy()
+
+    # the window always runs to the last row (end + gutter), so only the start matters
+    start = preset_starts(idx[-1], gutter_days).get(label)
+    if start is None:
+        return df
+    return df.iloc[idx.searchsorted(start, side="left"):]
@@ -1,17 +1,20 @@
 from pathlib import Path
 import base64
-import textwrap
 import pandas as pd
 import numpy as np
 import streamlit as st
 import matplotlib.pyplot as plt
-from urllib.parse import quote_plus
+from markmentum.leaders import board
+from markmentum.registry import shared_cache
+from markmentum.snapshot import snapshot_version
+from markmentum.tables import (Column, escape_text, fmt_int, fmt_number, fmt_percent, table_html,
+                               ticker_links)
+from markmentum.tints import Band, Banded, diverging, tint_cells
 
 # -------------------------
 # Page & shared style
 # -------------------------
 st.set_page_config(page_title="Markmentum – Morning Compass", layout="wide")
-st.cache_data.clear()
 # ---- LAYOUT & WIDTH TUNING (Cloud parity + your constraints) ----
 
 
@@ -25,6 +28,7 @@ _here = Path(__file__).resolve().parent
 APP_DIR = _here if _here.name != "pages" else _here.parent
 
 DATA_DIR   = APP_DIR / "data"
+SNAPSHOT = snapshot_version(DATA_DIR)   # data version, part of every cache key
 ASSETS_DIR = APP_DIR / "assets"
 LOGO_PATH  = ASSETS_DIR / "markmentum_logo.png"
 
@@ -51,16 +55,6 @@ if LOGO_PATH.exists():
 # -------------------------
 # Helpers
 # -------------------------
-def _mk_ticker_link(ticker: str) -> str:
-    t = (ticker or "").strip().upper()
-    if not t:
-        return ""
-    return (
-        f'<a href="?page=Deep%20Dive&ticker={quote_plus(t)}" '
-        f'target="_self" rel="noopener" '
-        f'style="text-decoration:none; font-weight:600;">{t}</a>'
-    )
-
 # Lightweight router for Deep Dive links
 qp = st.query_params
 dest = (qp.get("page") or "").strip().lower()
@@ -75,77 +69,40 @@ if dest.replace("%20", " ") == "deep dive":
 def row_spacer(height_px: int = 14):
     st.markdown(f"<div style='height:{height_px}px'></div>", unsafe_allow_html=True)
 
-# ---------- Shared formatters ----------
-def fmt_num(x, nd=2):
-    try:
-        if pd.isna(x): return ""
-        return f"{float(x):,.{nd}f}"
-    except Exception:
-        return ""
-
-def fmt_pct(x, nd=2):
-    try:
-        if pd.isna(x): return ""
-        return f"{float(x)*100:,.{nd}f}%"
-    except Exception:
-        return ""
-
-def fmt_int(x):
-    try:
-        if pd.isna(x): return ""
-        return f"{int(round(float(x))):,}"
-    except Exception:
-        return ""
-
 # ---------- UI renderers ----------
-def mm_badge_html(x):
-        try:
-            if pd.isna(x):
-                return ""
-            v = float(x)
-        except Exception:
-            return ""
-
-        if v <= -100:
-            bg, alpha = "rgba(185,28,28,0.35)", 0.35   # deep red
-        elif v < -25:
-            bg, alpha = "rgba(239,68,68,0.28)", 0.28   # red
-        elif v <= 25:
-            bg, alpha = "rgba(229,231,235,1.00)", 1.00 # gray pill
-        elif v < 100:
-            bg, alpha = "rgba(16,185,129,0.28)", 0.28  # green
-        else:
-            bg, alpha = "rgba(6,95,70,0.35)", 0.35     # dark green
-
-        label = f"{int(round(v)):,}"
-        # block so it fills the cell nicely; cell stays right-aligned from CSS
-        return f'<span style="display:block; background:{bg}; padding:0 4px; border-radius:2px;">{label}</span>'
-
-
-def rr_tinted_html(x, cap=3.0):
-        try:
-            if pd.isna(x): 
-                return ""
-            v = float(x)
-        except Exception:
-            return ""
-
-        # scale 0..1 (capped), keep near-zero very light
-        s = min(abs(v) / cap, 1.0)
-        alpha = 0.12 + 0.28 * s     # 0.12 → 0.40 opacity
-
-        if v > 0:
-            # green (tailwind-ish 10B981)
-            bg = f"rgba(16,185,129,{alpha:.3f})"
-        elif v < 0:
-            # red (EF4444)
-            bg = f"rgba(239,68,68,{alpha:.3f})"
-        else:
-            bg = "transparent"
+# MM Score badges: fixed colour per Buy/Sell band
+MM_BADGE = Banded(
+    edges=(-100, -25, 25, 100),
+    upper=(False, True, False, True),          # ≤-100 | <-25 | -25..25 | <100 | ≥100
+    bands=(Band("rgba(185,28,28,0.35)"),       # deep red
+           Band("rgba(239,68,68,0.28)"),       # red
+           Band("rgba(229,231,235,1.00)"),     # gray pill
+           Band("rgba(16,185,129,0.28)"),      # green
+           Band("rgba(6,95,70,0.35)")),        # dark green
+)
 
-        # numeric label with 1 decimal, same as before
-        label = f"{v:,.1f}"
-        return f'<span style="display:block; background:{bg}; padding:0 4px; border-radius:2px;">{label}</span>'
+def mm_badge_html(values):
+    # block so it fills the cell nicely; cell stays right-aligned from CSS
+    return tint_cells(values, MM_BADGE, fmt_int(values))
+
+def rr_tinted_html(values, cap=3.0):
+    # scale 0..1 (capped), keep near-zero very light: 0.12 → 0.40 opacity
+    return tint_cells(values, diverging(cap), fmt_number(values, 1))
+
+# ---------- Card table ----------
+def compass_table_html(d: pd.DataFrame, cols: dict) -> str:
+    """Name … MM Score Change table for rows of a timeframe export, formatted a column at a time."""
+    return table_html([
+        Column("Name",            escape_text(d["Ticker_name"]), col_class="col-name"),
+        Column("Ticker",          ticker_links(d["Ticker"])),
+        Column("Close",           fmt_number(d["Close"])),
+        Column("% Change",        fmt_percent(d[cols["ret"]])),
+        Column("Probable Low",    fmt_number(d[cols["pr_low"]])),
+        Column("Probable High",   fmt_number(d[cols["pr_high"]])),
+        Column("Risk / Reward",   rr_tinted_html(d[cols["rr"]])),
+        Column("MM Score",        mm_badge_html(d["model_score"])),
+        Column("MM Score Change", fmt_int(d["model_score_delta"])),
+    ])
 
 # =========================
 # Timeframe config
@@ -191,12 +148,10 @@ def timeframe_selector(default="Daily"):
     with c2:
         return st.selectbox("Timeframe", list(TIMEFRAMES.keys()), index=list(TIMEFRAMES.keys()).index(default), label_visibility="collapsed")
 
-@st.cache_data(show_spinner=False)
-def load_csv_by_id(n: int, base_dir: Path) -> pd.DataFrame:
-    p = base_dir / f"qry_graph_data_{n}.csv"
-    if not p.exists():
-        return pd.DataFrame()
-    return pd.read_csv(p)
+@shared_cache
+def load_csv_by_id(n: int, base_dir: Path, snapshot: str) -> pd.DataFrame:
+    # leaders / mm / delta boards are cut by markmentum.leaders; other ids read the export
+    return board(n, base_dir, snapshot)
 
 
 
@@ -275,7 +230,7 @@ st.markdown("""
 sel_tf = timeframe_selector(default="Daily")
 cfg_tf  = TIMEFRAMES[sel_tf]
 
-df_main = load_csv_by_id(cfg_tf["ids"]["main"], DATA_DIR)
+df_main = load_csv_by_id(cfg_tf["ids"]["main"], DATA_DIR, SNAPSHOT)
 
 # Page title under the logo (date pulled from selected timeframe's main csv)
 date_str = ""
@@ -307,54 +262,7 @@ req = ["Date","Ticker","Ticker_name","Close",
 if df_main.empty or not all(c in df_main.columns for c in req):
     st.info(f"Morning Compass: `qry_graph_data_{cfg_tf['ids']['main']}.csv` is missing or columns are incomplete.")
 else:
-    df_render = df_main.copy()
-    df_render["Ticker"] = df_render["Ticker"].apply(_mk_ticker_link)
-
-    # formatters (reuse existing helpers defined above)
-    def fmt_num(x, nd=2):
-        try:
-            if pd.isna(x): return ""
-            return f"{float(x):,.{nd}f}"
-        except Exception: return ""
-    def fmt_pct(x, nd=2):
-        try:
-            if pd.isna(x): return ""
-            return f"{float(x)*100:,.{nd}f}%"
-        except Exception: return ""
-    def fmt_int(x):
-        try:
-            if pd.isna(x): return ""
-            return f"{int(round(float(x))):,}"
-        except Exception: return ""
-
-    df_card = pd.DataFrame({
-        "Name":           df_render["Ticker_name"],
-        "Ticker":         df_render["Ticker"],
-        "Close":          df_render["Close"].map(lambda v: fmt_num(v, 2)),
-        "% Change":       df_render[cols["ret"]].map(lambda v: fmt_pct(v, 2)),
-        "Probable Low":   df_render[cols["pr_low"]].map(lambda v: fmt_num(v, 2)),
-        "Probable High":  df_render[cols["pr_high"]].map(lambda v: fmt_num(v, 2)),
-        "Risk / Reward":  df_render[cols["rr"]].map(rr_tinted_html),
-        "MM Score":       df_render["model_score"].map(mm_badge_html),
-        "MM Score Change":df_render["model_score_delta"].map(fmt_int),
-    })
-
-    table_html = df_card.to_html(index=False, classes="tbl", escape=False, border=0)
-    table_html = table_html.replace('class="dataframe tbl"', 'class="tbl"')
-    colgroup = """
-    <colgroup>
-      <col class="col-name">
-      <col>
-      <col>
-      <col>
-      <col>
-      <col>
-      <col>
-      <col>
-      <col>
-    </colgroup>
-    """.strip()
-    table_html = table_html.replace('<table class="tbl">', f'<table class="tbl">{colgroup}', 1)
+    table_html_main = compass_table_html(df_main, cols)
 
     # Bottom line docx switches with timeframe
     import os
@@ -369,8 +277,8 @@ else:
         except Exception:
             return False
 
-    @st.cache_data(show_spinner=False)
-    def load_market_read_md(doc_path: str) -> str:
+    @shared_cache
+    def load_market_read_md(doc_path: str, snapshot: str) -> str:
         if Document is None:
             return "⚠️ **Market Read**: python-docx is not installed (run: `pip install python-docx`)."
         if not os.path.exists(doc_path):
@@ -397,7 +305,7 @@ else:
 
     from html import escape
     docx_path = (DATA_DIR / cfg_tf["docx"]).resolve()
-    bl_text = load_market_read_md(str(docx_path)).strip()
+    bl_text = load_market_read_md(str(docx_path), SNAPSHOT).strip()
     bl_html_safe = escape(bl_text)
     note_text = "Note: MM Score → Rules-based contrarian score designed to avoid chasing stretch, identify crowding, and size conviction sensibly."
     note_html_safe = escape(note_text)
@@ -408,7 +316,7 @@ else:
         <h3 style="margin:0 0 8px 0; font-size:16px; font-weight:700; color:#1a1a1a;">
           {cfg_tf["card_title"]}
         </h3>
-        {table_html}
+        {table_html_main}
         <div class="bl">{bl_html_safe}</div>
         <div class="bl note">{note_html_safe}</div>
       </div>
@@ -422,7 +330,7 @@ else:
 # =========================
 # Card 2: Leaders/Laggards by % Change  (Top/Bottom 5 from selected timeframe)
 # =========================
-df74 = load_csv_by_id(cfg_tf["ids"]["leaders"], DATA_DIR)
+df74 = load_csv_by_id(cfg_tf["ids"]["leaders"], DATA_DIR, SNAPSHOT)
 req74 = ["Date","Ticker","Ticker_name","Close",
          cols["ret"], cols["pr_low"], cols["pr_high"], cols["rr"], "model_score","model_score_delta"]
 
@@ -430,29 +338,7 @@ if df74.empty or not all(c in df74.columns for c in req74):
     row_spacer(8)
     st.info(f"Top 5 Leaders/Laggards by % Change: `qry_graph_data_{cfg_tf['ids']['leaders']}.csv` is missing or columns are incomplete.")
 else:
-    d = df74.copy()
-    d["Ticker"] = d["Ticker"].apply(_mk_ticker_link)
-
-    df_74_card = pd.DataFrame({
-        "Name":           d["Ticker_name"],
-        "Ticker":         d["Ticker"],
-        "Close":          d["Close"].map(lambda v: fmt_num(v, 2)),
-        "% Change":       d[cols["ret"]].map(lambda v: fmt_pct(v, 2)),
-        "Probable Low":   d[cols["pr_low"]].map(lambda v: fmt_num(v, 2)),
-        "Probable High":  d[cols["pr_high"]].map(lambda v: fmt_num(v, 2)),
-        "Risk / Reward":  d[cols["rr"]].map(rr_tinted_html),
-        "MM Score":       d["model_score"].map(mm_badge_html),
-        "MM Score Change":d["model_score_delta"].map(fmt_int),
-    })
-
-    tbl_html_74 = df_74_card.to_html(index=False, classes="tbl", escape=False, border=0)
-    tbl_html_74 = tbl_html_74.replace('class="dataframe tbl"', 'class="tbl"')
-    colgroup = """
-    <colgroup>
-      <col class="col-name"><col><col><col><col><col><col><col><col>
-    </colgroup>
-    """.strip()
-    tbl_html_74 = tbl_html_74.replace('<table class="tbl">', f'<table class="tbl">{colgroup}', 1)
+    tbl_html_74 = compass_table_html(df74, cols)
 
     note_text = "Note: MM Score → Rules-based contrarian score designed to avoid chasing stretch, identify crowding, and size conviction sensibly."
     note_html_safe = escape(note_text)
@@ -476,7 +362,7 @@ else:
 # =========================
 # Card 3: Leaders/Laggards by MM Score (Top/Bottom 5)
 # =========================
-df75 = load_csv_by_id(cfg_tf["ids"]["mm"], DATA_DIR)
+df75 = load_csv_by_id(cfg_tf["ids"]["mm"], DATA_DIR, SNAPSHOT)
 req75 = ["Date","Ticker","Ticker_name","Close",
          cols["ret"], cols["pr_low"], cols["pr_high"], cols["rr"], "model_score","model_score_delta"]
 
@@ -484,29 +370,7 @@ if df75.empty or not all(c in df75.columns for c in req75):
     row_spacer(8)
     st.info(f"Top 5 Leaders/Laggards by MM Score: `qry_graph_data_{cfg_tf['ids']['mm']}.csv` is missing or columns are incomplete.")
 else:
-    d = df75.copy()
-    d["Ticker"] = d["Ticker"].apply(_mk_ticker_link)
-
-    df_75_card = pd.DataFrame({
-        "Name":           d["Ticker_name"],
-        "Ticker":         d["Ticker"],
-        "Close":          d["Close"].map(lambda v: fmt_num(v, 2)),
-        "% Change":       d[cols["ret"]].map(lambda v: fmt_pct(v, 2)),
-        "Probable Low":   d[cols["pr_low"]].map(lambda v: fmt_num(v, 2)),
-        "Probable High":  d[cols["pr_high"]].map(lambda v: fmt_num(v, 2)),
-        "Risk / Reward":  d[cols["rr"]].map(rr_tinted_html),
-        "MM Score":       d["model_score"].map(mm_badge_html),
-        "MM Score Change":d["model_score_delta"].map(fmt_int),
-    })
-
-    tbl_html_75 = df_75_card.to_html(index=False, classes="tbl", escape=False, border=0)
-    tbl_html_75 = tbl_html_75.replace('class="dataframe tbl"', 'class="tbl"')
-    colgroup = """
-    <colgroup>
-      <col class="col-name"><col><col><col><col><col><col><col><col>
-    </colgroup>
-    """.strip()
-    tbl_html_75 = tbl_html_75.replace('<table class="tbl">', f'<table class="tbl">{colgroup}', 1)
+    tbl_html_75 = compass_table_html(df75, cols)
 
     note_text = "Note: MM Score → Rules-based contrarian score designed to avoid chasing stretch, identify crowding, and size conviction sensibly."
     note_html_safe = escape(note_text)
@@ -530,7 +394,7 @@ else:
 # =========================
 # Card 4: Leaders/Laggards by MM Score Change (Top/Bottom 5)
 # =========================
-df77 = load_csv_by_id(cfg_tf["ids"]["delta"], DATA_DIR)
+df77 = load_csv_by_id(cfg_tf["ids"]["delta"], DATA_DIR, SNAPSHOT)
 req77 = ["Date","Ticker","Ticker_name","Close",
          cols["ret"], cols["pr_low"], cols["pr_high"], cols["rr"], "model_score","model_score_delta"]
 
@@ -538,29 +402,7 @@ if df77.empty or not all(c in df77.columns for c in req77):
     row_spacer(8)
     st.info(f"Top 5 Leaders/Laggards by MM Score Change: `qry_graph_data_{cfg_tf['ids']['delta']}.csv` is missing or columns are incomplete.")
 else:
-    d = df77.copy()
-    d["Ticker"] = d["Ticker"].apply(_mk_ticker_link)
-
-    df_77_card = pd.DataFrame({
-        "Name":           d["Ticker_name"],
-        "Ticker":         d["Ticker"],
-        "Close":          d["Close"].map(lambda v: fmt_num(v, 2)),
-        "% Change":       d[cols["ret"]].map(lambda v: fmt_pct(v, 2)),
-        "Probable Low":   d[cols["pr_low"]].map(lambda v: fmt_num(v, 2)),
-        "Probable High":  d[cols["pr_high"]].map(lambda v: fmt_num(v, 2)),
-        "Risk / Reward":  d[cols["rr"]].map(rr_tinted_html),
-        "MM Score":       d["model_score"].map(mm_badge_html),
-        "MM Score Change":d["model_score_delta"].map(fmt_int),
-    })
-
-    tbl_html_77 = df_77_card.to_html(index=False, classes="tbl", escape=False, border=0)
-    tbl_html_77 = tbl_html_77.replace('class="dataframe tbl"', 'class="tbl"')
-    colgroup = """
-    <colgroup>
-      <col class="col-name"><col><col><col><col><col><col><col><col>
-    </colgroup>
-    """.strip()
-    tbl_html_77 = tbl_html_77.replace('<table class="tbl">', f'<table class="tbl">{colgroup}', 1)
+    tbl_html_77 = compass_table_html(df77, cols)
 
     note_text = "Note: MM Score → Rules-based contrarian score designed to avoid chasing stretch, identify crowding, and size conviction sensibly."
     note_html_safe = escape(note_text)
@@ -592,7 +434,7 @@ row_spacer(6)
 show_cat = st.checkbox("View Category Snapshot", value=False)
 
 if show_cat:
-    df76 = load_csv_by_id(cfg_tf["ids"]["category"], DATA_DIR)
+    df76 = load_csv_by_id(cfg_tf["ids"]["category"], DATA_DIR, SNAPSHOT)
     req76 = ["Date","Ticker","Ticker_name","Category","Close",
              cols["ret"], cols["pr_low"], cols["pr_high"], cols["rr"], "model_score","model_score_delta"]
 
@@ -609,29 +451,7 @@ if show_cat:
             present = [c for c in cat_order if c in df76["Category"].dropna().unique().tolist()]
             sel = st.selectbox("Category", present, index=0)
 
-        d = df76[df76["Category"] == sel].copy()
-        d["Ticker"] = d["Ticker"].apply(_mk_ticker_link)
-
-        df_cat_card = pd.DataFrame({
-            "Name":           d["Ticker_name"],
-            "Ticker":         d["Ticker"],
-            "Close":          d["Close"].map(lambda v: fmt_num(v, 2)),
-            "% Change":       d[cols["ret"]].map(lambda v: fmt_pct(v, 2)),
-            "Probable Low":   d[cols["pr_low"]].map(lambda v: fmt_num(v, 2)),
-            "Probable High":  d[cols["pr_high"]].map(lambda v: fmt_num(v, 2)),
-            "Risk / Reward":  d[cols["rr"]].map(rr_tinted_html),
-            "MM Score":       d["model_score"].map(mm_badge_html),
-            "MM Score Change":d["model_score_delta"].map(fmt_int),
-        })
-
-        tbl_html_76 = df_cat_card.to_html(index=False, classes="tbl", escape=False, border=0)
-        tbl_html_76 = tbl_html_76.replace('class="dataframe tbl"', 'class="tbl"')
-        colgroup = """
-        <colgroup>
-          <col class="col-name"><col><col><col><col><col><col><col><col>
-        </colgroup>
-        """.strip()
-        tbl_html_76 = tbl_html_76.replace('<table class="tbl">', f'<table class="tbl">{colgroup}', 1)
+        tbl_html_76 = compass_table_html(df76[df76["Category"] == sel], cols)
 
         note_text = "Note: MM Score → Rules-based contrarian score designed to avoid chasing stretch, identify crowding, and size conviction sensibly."
         note_html_safe = escape(note_text)
@@ -5,7 +5,12 @@ import pandas as pd
 import numpy as np
 import streamlit as st
 import matplotlib.pyplot as plt
-from urllib.parse import quote_plus
+from markmentum.distribution import DISTRIBUTIONS, distribution
+from markmentum.leaders import board
+from markmentum.registry import shared_cache
+from markmentum.snapshot import snapshot_version
+from markmentum.tables import (Column, card_html, column_values, escape_text, fmt_int, fmt_number,
+                               fmt_percent, frame_table_html, pick_column, table_html, ticker_links)
 
 # -------------------------
 # Page & shared style
@@ -106,22 +111,13 @@ _here = Path(__file__).resolve().parent
 APP_DIR = _here if _here.name != "pages" else _here.parent
 
 DATA_DIR   = APP_DIR / "data"
+SNAPSHOT = snapshot_version(DATA_DIR)   # data version, part of every cache key
 ASSETS_DIR = APP_DIR / "assets"
 LOGO_PATH  = ASSETS_DIR / "markmentum_logo.png"
 
 # -------------------------
 # Helpers
 # -------------------------
-def _mk_ticker_link(ticker: str) -> str:
-    t = (ticker or "").strip().upper()
-    if not t:
-        return ""
-    return (
-        f'<a href="?page=Deep%20Dive&ticker={quote_plus(t)}" '
-        f'target="_self" rel="noopener" '
-        f'style="text-decoration:none; font-weight:600;">{t}</a>'
-    )
-
 # Lightweight router for Deep Dive links
 qp = st.query_params
 dest = (qp.get("page") or "").strip().lower()
@@ -140,31 +136,15 @@ def _image_to_base64(path: Path) -> str:
     with open(path, "rb") as f:
         return base64.b64encode(f.read()).decode()
 
-@st.cache_data(show_spinner=False)
-def load_csv(path: Path) -> pd.DataFrame:
-    if not path.exists():
-        return pd.DataFrame()
-    return pd.read_csv(path)
-
-def _fmt_pct(val):
-    try:
-        v = float(val) * 100
-        return f"{v:,.2f}%"
-    except Exception:
-        return "—"
+# column formatters (whole column -> cell strings)
+def _fmt_pct(values):
+    return fmt_percent(values, na="—")
 
-def _fmt_millions(val):
-    try:
-        v = float(val)
-        return f"{v:,.2f} M"
-    except Exception:
-        return "—"
+def _fmt_millions(values):
+    return fmt_number(values, suffix=" M", na="—")
 
-def _fmt_num(val):
-    try:
-        return f"{float(val):,.0f}"
-    except Exception:
-        return "—"
+def _fmt_num(values):
+    return fmt_int(values, na="—")
 
 def _pick(df: pd.DataFrame, candidates: list[str], default: str | None = None):
     for c in candidates:
@@ -177,39 +157,18 @@ def _pick(df: pd.DataFrame, candidates: list[str], default: str | None = None):
 
 def _table_html(title: str, df: pd.DataFrame, value_col: str, value_label: str, value_fmt, value_width_px: int = 90, extra_class: str = ""):
     # tolerant column mapping
-    cmap = {c.lower(): c for c in df.columns}
-    tcol = cmap.get("ticker") or "Ticker"
-    ncol = cmap.get("ticker_name") or cmap.get("company") or "Company"
-    ccol = cmap.get("category") or cmap.get("exposure") or "Exposure"
-
-    rows = []
-    for _, r in df.iterrows():
-        rows.append(f"""
-<tr>
-  <td class="col-company">{r.get(ncol, "")}</td>
-  <td class="center col-ticker">{_mk_ticker_link(r.get(tcol, ""))}</td>
-  <td class="col-category">{r.get(ccol, "")}</td>
-  <td class="right col-value" style="width:{value_width_px}px">{value_fmt(r.get(value_col))}</td>
-</tr>""")
-
-    return textwrap.dedent(f"""
-<div class="card {extra_class}">
-  <h3>{title}</h3>
-  <table class="tbl">
-    <thead>
-      <tr>
-        <th class="col-company">Company</th>
-        <th class="col-ticker">Ticker</th>
-        <th class="col-category">Category</th>
-        <th class="right col-value" style="width:{value_width_px}px">{value_label}</th>
-      </tr>
-    </thead>
-    <tbody>
-      {''.join(rows)}
-    </tbody>
-  </table>
-</div>
-""").strip()
+    tcol = pick_column(df, "ticker")
+    ncol = pick_column(df, "ticker_name", "company")
+    ccol = pick_column(df, "category", "exposure")
+    width = f"width:{value_width_px}px"
+    table = table_html([
+        Column("Company", escape_text(column_values(df, ncol)), td_class="col-company", th_class="col-company"),
+        Column("Ticker", ticker_links(column_values(df, tcol)), td_class="center col-ticker", th_class="col-ticker"),
+        Column("Category", escape_text(column_values(df, ccol)), td_class="col-category", th_class="col-category"),
+        Column(value_label, value_fmt(df[value_col]), td_class="right col-value", th_class="right col-value",
+               td_style=width, th_style=width),
+    ])
+    return card_html(title, table, extra_class)
 
 def render_card(slot, title: str, df: pd.DataFrame, value_col: str, value_label: str, value_fmt, value_width_px: int = 90, extra_class: str = ""):
     with slot:
@@ -221,16 +180,7 @@ def render_card(slot, title: str, df: pd.DataFrame, value_col: str, value_label:
 # ------------- Helper for plain table-in-card -------------
 def render_table_card(container, title: str, df):
     with container:
-        table_html = df.to_html(index=False, classes="tbl", escape=False)
-        st.markdown(
-            f"""
-            <div class="card">
-              <h3>{title}</h3>
-              {table_html}
-            </div>
-            """,
-            unsafe_allow_html=True,
-        )
+        st.markdown(card_html(title, frame_table_html(df)), unsafe_allow_html=True)
 
 # -------------------------
 # Timeframe selector & wiring
@@ -238,7 +188,8 @@ def render_table_card(container, title: str, df):
 TF_LABELS = ["Daily", "Weekly", "Monthly", "Quarterly"]
 tf = st.session_state.get("tf_select", TF_LABELS[0])
 
-# CSV map per card (by timeframe)
+# board / export id per card (by timeframe); leader boards are cut by markmentum.leaders,
+# score distributions (31, 57, 63, 69, 72) are binned by markmentum.distribution
 CSV_MAP = {
     "Daily":    [26, 27, 28, 70, 71, 72, 29, 30, 31],
     "Weekly":   [52, 53, 54, 55, 56, 57, None, None, None],
@@ -267,18 +218,19 @@ TITLES = [
 def tf_prefix(title: str) -> str:
     return f"{tf} – {title}"
 
-@st.cache_data(show_spinner=False)
-def load_for_timeframe(tf_key: str, data_dir: Path):
+@shared_cache
+def load_for_timeframe(tf_key: str, data_dir: Path, snapshot: str):
     nums = CSV_MAP[tf_key]
     dfs = []
     for num in nums:
         if num is None:
             dfs.append(pd.DataFrame())
         else:
-            dfs.append(load_csv(data_dir / f"qry_graph_data_{num}.csv"))
+            load = distribution if num in DISTRIBUTIONS else board
+            dfs.append(load(num, data_dir, snapshot))
     return dfs
 
-dfs = load_for_timeframe(tf, DATA_DIR)
+dfs = load_for_timeframe(tf, DATA_DIR, SNAPSHOT)
 
 # -------------------------
 # Header (logo centered) + as of date + page title
@@ -391,16 +343,7 @@ with d3:
         count_col = "TickerCount" if "TickerCount" in df_dist.columns else "ticker_count"
         df_dist = df_dist[[score_bin_col, count_col]].copy()
         df_dist.columns = ["Score Bin", "Ticker Count"]
-        table_html = df_dist.to_html(index=False, classes="tbl", escape=False)
-        st.markdown(
-            f"""
-            <div class="card">
-              <h3>{tf_prefix(TITLES[5])}</h3>
-              {table_html}
-            </div>
-            """,
-            unsafe_allow_html=True,
-        )
+        st.markdown(card_html(tf_prefix(TITLES[5]), frame_table_html(df_dist)), unsafe_allow_html=True)
 
 row_spacer(14)
 
@@ -440,16 +383,7 @@ if show_daily_extra:
             df_hist = df_hist[["Classification", score_bin_col, count_col]].copy()
             df_hist.columns = ["Classification", "Score Bin", "Ticker Count"]
 
-            table_html = df_hist.to_html(index=False, classes="tbl", escape=False)
-            st.markdown(
-                f"""
-                <div class="card">
-                  <h3>{tf_prefix(TITLES[8])}</h3>
-                  {table_html}
-                </div>
-                """,
-                unsafe_allow_html=True,
-            )
+            st.markdown(card_html(tf_prefix(TITLES[8]), frame_table_html(df_hist)), unsafe_allow_html=True)
 
 # ========= Market Read (per timeframe) =========
 import os
@@ -471,8 +405,8 @@ MR_DOCX = {
     "Quarterly": "Market_Read_quarterly.docx",
 }
 
-@st.cache_data(show_spinner=False)
-def load_market_read_md(doc_path: str) -> str:
+@shared_cache
+def load_market_read_md(doc_path: str, snapshot: str) -> str:
     if Document is None:
         return "⚠️ **Market Read**: python-docx is not installed (run: `pip install python-docx`)."
     if not os.path.exists(doc_path):
@@ -513,7 +447,7 @@ with st.container():
     """, unsafe_allow_html=True)
 
     docx_path = (DATA_DIR / MR_DOCX[tf]).resolve()
-    mr_md = load_market_read_md(str(docx_path))
+    mr_md = load_market_read_md(str(docx_path), SNAPSHOT)
     mr_md = mr_md.replace("The market is saying:", "<br>The market is saying:", 1)
     mr_md = mr_md.replace("The market is saying (all numbers are WTD % returns):", "<br>The market is saying (all numbers are WTD % returns):", 1)
     mr_md = mr_md.replace("The market is saying (all numbers are MTD % returns):", "<br>The market is saying (all numbers are MTD % returns):", 1)
@@ -4,13 +4,16 @@
 from pathlib import Path
 import base64
 import pandas as pd
-import numpy as np
 import altair as alt
 import streamlit as st
-from urllib.parse import quote_plus
+from markmentum import heatmap
+from markmentum.facts import load_facts
+from markmentum.registry import shared_cache
+from markmentum.snapshot import snapshot_version
+from markmentum.tables import fmt_percent, frame_table_html, ticker_links
+from markmentum.tints import diverging, tint_cells
 
 # ---------- Page ----------
-st.cache_data.clear()
 st.set_page_config(page_title="Performance Heatmap", layout="wide")
 
 
@@ -22,10 +25,11 @@ _here = Path(__file__).resolve().parent
 APP_DIR = _here if _here.name != "pages" else _here.parent
 
 DATA_DIR   = APP_DIR / "data"
+SNAPSHOT = snapshot_version(DATA_DIR)   # data version, part of every cache key
 ASSETS_DIR = APP_DIR / "assets"
 LOGO_PATH  = ASSETS_DIR / "markmentum_logo.png"
 
-CSV_PATH = DATA_DIR / "ticker_data.csv"   # <-- single source file
+# source: ticker_data.csv, read as columns of the latest-snapshot fact table (markmentum.facts)
 
 # -------------------------
 # Header: logo centered
@@ -44,16 +48,7 @@ if LOGO_PATH.exists():
         unsafe_allow_html=True,
     )
 
-# --- Clickable Deep Dive helper & router (same UX as Heatmap)
-def _mk_ticker_link(ticker: str) -> str:
-    t = (ticker or "").strip().upper()
-    if not t:
-        return ""
-    return (
-        f'<a href="?page=Deep%20Dive&ticker={quote_plus(t)}" '
-        f'target="_self" rel="noopener" '
-        f'style="text-decoration:none; font-weight:600;">{t}</a>'
-    )
+# --- Deep Dive link router (same UX as Heatmap)
 qp = st.query_params
 dest = (qp.get("page") or "").strip().lower()
 if dest.replace("%20", " ") == "deep dive":
@@ -67,58 +62,25 @@ if dest.replace("%20", " ") == "deep dive":
 
 
 
-def _fmt_pct(x, nd=2):
-    try:
-        if pd.isna(x): return ""
-        return f"{float(x):,.{nd}f}%"
-    except Exception:
-        return ""
-
-# gradient cell (independent scaling by timeframe; pass per-column vmax)
-def _divergent_tint_html(val: float, vmax: float) -> str:
-    if val is None or pd.isna(val) or vmax is None or vmax <= 0:
-        return ""
-    # scale 0..1 capped, keep near-zero very light
-    s = min(abs(float(val)) / float(vmax), 1.0)
-    alpha = 0.12 + 0.28 * s  # 0.12 → 0.40 opacity
-    if val > 0:
-        bg = f"rgba(16,185,129,{alpha:.3f})"   # green
-    elif val < 0:
-        bg = f"rgba(239,68,68,{alpha:.3f})"   # red
-    else:
-        bg = "transparent"
-    label = _fmt_pct(val, 2)
-    return f'<span style="display:block; background:{bg}; padding:0 4px; border-radius:2px; text-align:right;">{label}</span>'
+# gradient cells (independent scaling by timeframe; pass per-column vmax)
+def _divergent_tint_html(values, vmax: float):
+    # scale 0..1 capped, keep near-zero very light: 0.12 → 0.40 opacity; values are already in %
+    return tint_cells(values, diverging(vmax), fmt_percent(values, scale=1.0), align_right=True)
 
 # ---------- Load source ----------
-@st.cache_data(show_spinner=False)
-def load_perf_csv(p: Path) -> pd.DataFrame:
-    if not p.exists():
-        return pd.DataFrame()
-    df = pd.read_csv(p)
-    # enforce expected schema
-    need = [
-        "Ticker","Ticker_name","Category","Date","Close",
-        "day_pct_change","week_pct_change","month_pct_change","quarter_pct_change"
-    ]
+@shared_cache
+def load_perf(snapshot: str) -> pd.DataFrame:
+    # ticker_data columns of the latest-snapshot fact table (one row per ticker)
+    pct = ["day_pct_change","week_pct_change","month_pct_change","quarter_pct_change"]
+    need = ["Ticker","Ticker_name","Category","Date","Close", *pct]
+    df = load_facts(DATA_DIR, snapshot, need)
     if not all(c in df.columns for c in need):
         return pd.DataFrame()
-    # numeric hygiene
-    for c in ["day_pct_change","week_pct_change","month_pct_change","quarter_pct_change","Close"]:
-        df[c] = pd.to_numeric(df[c], errors="coerce")
+    df = df.dropna(subset=pct, how="all")
     # multiply by 100 to convert to percentage space (locked requirement)
-    for c in ["day_pct_change","week_pct_change","month_pct_change","quarter_pct_change"]:
-        df[c] = df[c] * 100.0
+    df[pct] = df[pct] * 100.0
     return df
 
-# robust symmetric vmax (like original heatmap)
-def _robust_vmax(series, q=0.98, floor=1.0, step=1.0):
-    s = pd.to_numeric(series, errors="coerce").abs().dropna()
-    if s.empty:
-        return floor
-    vmax = float(np.quantile(s, q))
-    return max(floor, np.ceil(vmax / step) * step)
-
 # ---------- Shared CSS (compass-style card + 40ch Name) ----------
 st.markdown("""
 <style>
@@ -182,12 +144,12 @@ st.markdown("""
 
 
 
-perf = load_perf_csv(CSV_PATH)
+perf = load_perf(SNAPSHOT)
 if perf.empty:
     st.info("`ticker_data.csv` missing or columns incomplete.")
 
  
-g = perf.groupby("Category", dropna=True, as_index=False).agg(
+g = perf.groupby("Category", dropna=True, observed=True, as_index=False).agg(
     Daily=("day_pct_change","mean"),
     WTD=("week_pct_change","mean"),
     MTD=("month_pct_change","mean"),
@@ -220,23 +182,15 @@ macro_list = [
     "GLD","UUP","TLT","BTC=F"
 ]
 
-# keep only the latest row per ticker (in case CSV has multiple dates)
-if not perf.empty:
-    perf["_dt"] = pd.to_datetime(perf["Date"], errors="coerce")
-    latest = (
-        perf.sort_values(["Ticker", "_dt"], ascending=[True, False])
-            .drop_duplicates(subset=["Ticker"], keep="first")
-    )
-else:
-    latest = perf.copy()
+latest = perf   # one row per ticker (fact table)
 
 m = latest[latest["Ticker"].isin(macro_list)].copy()
 # preserve the macro_list order
-m["__ord__"] = m["Ticker"].map({t:i for i, t in enumerate(macro_list)})
+m["__ord__"] = m["Ticker"].astype(str).map({t:i for i, t in enumerate(macro_list)})
 m = m.sort_values(["__ord__"], kind="stable")
 
 # build ticker links
-m["Ticker_link"] = m["Ticker"].map(_mk_ticker_link)
+m["Ticker_link"] = ticker_links(m["Ticker"])
 
 # independent scaling by timeframe **within just these macro tickers**
 vmaxM = {
@@ -249,27 +203,14 @@ vmaxM = {
 m_render = pd.DataFrame({
     "Name":   m["Ticker_name"],
     "Ticker": m["Ticker_link"],
-    "Daily":  [ _divergent_tint_html(v, vmaxM["Daily"]) for v in m["day_pct_change"] ],
-    "WTD":    [ _divergent_tint_html(v, vmaxM["WTD"])   for v in m["week_pct_change"] ],
-    "MTD":    [ _divergent_tint_html(v, vmaxM["MTD"])   for v in m["month_pct_change"] ],
-    "QTD":    [ _divergent_tint_html(v, vmaxM["QTD"])   for v in m["quarter_pct_change"] ],
+    "Daily":  _divergent_tint_html(m["day_pct_change"], vmaxM["Daily"]),
+    "WTD":    _divergent_tint_html(m["week_pct_change"], vmaxM["WTD"]),
+    "MTD":    _divergent_tint_html(m["month_pct_change"], vmaxM["MTD"]),
+    "QTD":    _divergent_tint_html(m["quarter_pct_change"], vmaxM["QTD"]),
 })
 
-html_macro = m_render.to_html(index=False, classes="tbl", escape=False, border=0)
-html_macro = html_macro.replace('class="dataframe tbl"', 'class="tbl"')
-
 # Use the SAME column widths as Card 2 (Name wider, Ticker narrow, numerics roomy)
-colgroup_macro = """
-<colgroup>
-  <col class="col-name-wide">  <!-- Name -->
-  <col class="col-ticker-nar"> <!-- Ticker -->
-  <col class="col-num-lg">     <!-- Daily -->
-  <col class="col-num-lg">     <!-- WTD -->
-  <col class="col-num-lg">     <!-- MTD -->
-  <col class="col-num-lg">     <!-- QTD -->
-</colgroup>
-""".strip()
-html_macro = html_macro.replace('<table class="tbl">', f'<table class="tbl">{colgroup_macro}', 1)
+html_macro = frame_table_html(m_render, col_classes=["col-name-wide", "col-ticker-nar"] + ["col-num-lg"] * 4)
 
 st.markdown(
     f"""
@@ -304,7 +245,7 @@ preferred_order = [
     "Materials","Real Estate","Utilities","MR Discretion"
 ]
 order_map = {name: i for i, name in enumerate(preferred_order)}
-g["__ord__"] = g["Category"].map(order_map)
+g["__ord__"] = g["Category"].astype(str).map(order_map)
 g = g.sort_values(["__ord__", "Category"], kind="stable")
 g = g.drop(columns="__ord__")
 
@@ -318,24 +259,13 @@ vmax = {
 
 g_render = pd.DataFrame({
         "Name": g["Category"],
-        "Daily": [ _divergent_tint_html(v, vmax["Daily"]) for v in g["Daily"] ],
-        "WTD":   [ _divergent_tint_html(v, vmax["WTD"])   for v in g["WTD"]   ],
-        "MTD":   [ _divergent_tint_html(v, vmax["MTD"])   for v in g["MTD"]   ],
-        "QTD":   [ _divergent_tint_html(v, vmax["QTD"])   for v in g["QTD"]   ],
+        "Daily": _divergent_tint_html(g["Daily"], vmax["Daily"]),
+        "WTD":   _divergent_tint_html(g["WTD"], vmax["WTD"]),
+        "MTD":   _divergent_tint_html(g["MTD"], vmax["MTD"]),
+        "QTD":   _divergent_tint_html(g["QTD"], vmax["QTD"]),
     })
 
-html_cat = g_render.to_html(index=False, classes="tbl", escape=False, border=0)
-html_cat = html_cat.replace('class="dataframe tbl"', 'class="tbl"')
-colgroup = """
-<colgroup>
-  <col class="col-name">   <!-- Name (40ch) -->
-  <col class="col-num-sm"> <!-- Daily -->
-  <col class="col-num-sm"> <!-- WTD -->
-  <col class="col-num-sm"> <!-- MTD -->
-  <col class="col-num-sm"> <!-- QTD -->
-</colgroup>
-""".strip()
-html_cat = html_cat.replace('<table class="tbl">', f'<table class="tbl">{colgroup}', 1)
+html_cat = frame_table_html(g_render, col_classes=["col-name"] + ["col-num-sm"] * 4)
 
 st.markdown(
         f"""
@@ -355,14 +285,6 @@ st.markdown(
 st.markdown('<div class="vspace-16"></div>', unsafe_allow_html=True)
 
 # ===== Category Averages — Heatmap (single matrix like prior page) =====
-# Long form from the grouped averages 'g'
-glong = g.melt(
-    id_vars=["Category"],
-    value_vars=["Daily", "WTD", "MTD", "QTD"],
-    var_name="Timeframe",
-    value_name="Pct",
-)
-
 # Keep preferred row order
 preferred_order = [
     "Sector & Style ETFs","Indices","Futures","Currencies","Commodities",
@@ -371,40 +293,20 @@ preferred_order = [
     "Energy","Financials","Health Care","Industrials","Information Technology",
     "Materials","Real Estate","Utilities","MR Discretion"
 ]
-glong["Category"] = pd.Categorical(glong["Category"], categories=preferred_order, ordered=True)
-
-vmax = float(glong["Pct"].abs().max())
-
-# Single grid heatmap (shared, centered legend at bottom)
-base_hm = (
-    alt.Chart(glong)
-    .mark_rect(stroke="#2b2f36", strokeWidth=0.6, strokeOpacity=0.95)
-    .encode(
-        x=alt.X(
-            "Timeframe:N",
-            sort=["Daily", "WTD", "MTD", "QTD"],
-            axis=alt.Axis(orient="top",title=None, labelColor="#1a1a1a",labelFontSize=12, labelAngle=0,labelFlush=False,labelPadding=6)
-        ),
-        y=alt.Y(
-            "Category:N",
-            sort=list(glong["Category"].cat.categories),
-            axis=alt.Axis(title=None, labelColor="#1a1a1a",labelFlush=False,labelFontSize=12, labelLimit=240)
-        ),
-        color=alt.Color(
-            "Pct:Q",
-            # diverging blue↔orange with 0 as midpoint (matches your prior style)
-            scale=alt.Scale(scheme="blueorange",domain=[-vmax, vmax], domainMid=0),
-            legend=alt.Legend(orient="bottom", labelExpr="''",title="Avg % Change (per timeframe)")
-        ),
-        tooltip=[
-            alt.Tooltip("Category:N"),
-            alt.Tooltip("Timeframe:N"),
-            alt.Tooltip("Pct:Q", format=".2f", title="%")
-        ],
+
+def _category_spec() -> dict:
+    glong = heatmap.melt(g, ["Category"], ["Daily", "WTD", "MTD", "QTD"], value_name="Pct")
+    vmax = float(glong["Pct"].abs().max()) if glong["Pct"].notna().any() else 1.0
+    # diverging blue↔orange with 0 as midpoint, one shared scale
+    return heatmap.heatmap_spec(
+        glong, y="Category", y_sort=preferred_order, x_sort=["Daily", "WTD", "MTD", "QTD"],
+        color="Pct", domain=(-vmax, vmax), domain_mid=0, x_label_padding=6,
+        legend_title="Avg % Change (per timeframe)",
+        tooltip=[alt.Tooltip("Category:N"), alt.Tooltip("Timeframe:N"), alt.Tooltip("Pct:Q", format=".2f", title="%")],
+        width=450, height=24 * len(preferred_order),
     )
-    .properties(width=450, height=24 * len(preferred_order))
-    .configure_view(strokeWidth=0)
-)
+
+base_hm = heatmap.cached("performance", "categories", SNAPSHOT, _category_spec)
 
 st.markdown('<div class="vspace-16"></div>', unsafe_allow_html=True)
 st.markdown(
@@ -429,7 +331,7 @@ st.markdown(
 
 left, center, right = st.columns([1, .8, 1])
 with center:
-    st.altair_chart(base_hm, use_container_width=False)
+    st.vega_lite_chart(base_hm, use_container_width=False)
 
 # =========================================================
 # Card 3 — Category selector → per-ticker rows
@@ -459,84 +361,34 @@ with col_center:
         label_visibility="visible",
     )
 
-# --- Universe-long df for global scaling (ALL tickers, ALL timeframes)
-tlong_all = perf.melt(
-    id_vars=["Ticker", "Ticker_name", "Category"],
-    value_vars=["day_pct_change", "week_pct_change", "month_pct_change", "quarter_pct_change"],
-    var_name="tf_raw",
-    value_name="Pct"
-)
-# Map raw column names to display timeframes to match pages
-map_tf = {
+# --- Universe-long df (ALL tickers, ALL timeframes), normalised with the universe-wide
+# robust vmax per timeframe; built once per snapshot, shared by every category
+PERF_TF = {
     "day_pct_change": "Daily",
     "week_pct_change": "WTD",
     "month_pct_change": "MTD",
     "quarter_pct_change": "QTD",
 }
-tlong_all["Timeframe"] = tlong_all["tf_raw"].map(map_tf)
-tlong_all.drop(columns=["tf_raw"], inplace=True)
-
-# Universe-wide |Pct| max per timeframe (for scaling columns)
-tf_scale = (
-    tlong_all.groupby("Timeframe", as_index=False)
-             .agg(maxAbs=("Pct", lambda s: s.abs().max()))
-)
-# guard against divide-by-zero
-import numpy as np
-# Universe-wide robust vmax per timeframe (independent columns)
-vmax_univ_tf = (
-    tlong_all.groupby("Timeframe")["Pct"]
-             .apply(lambda s: _robust_vmax(s, q=0.98, floor=1.0, step=1.0))
-             .to_dict()
-)
-
-
-# Global symmetric scale across the entire universe
-vglob = float(tlong_all["Pct"].abs().max())
-
-# Slice for the selected category (for the heatmap rows)
-tlong_sel = tlong_all.loc[tlong_all["Category"] == sel].copy()
-tickers_order = sorted(tlong_sel["Ticker"].dropna().unique().tolist())
-tlong_sel["Ticker"] = pd.Categorical(tlong_sel["Ticker"], categories=tickers_order, ordered=True)
-# Normalize with robust universe-wide vmax per timeframe (to [-1, 1])
-tlong_sel["norm"] = tlong_sel.apply(
-    lambda r: np.clip(
-        r["Pct"] / (vmax_univ_tf.get(r["Timeframe"], 1.0) or 1.0),
-        -1, 1
-    ),
-    axis=1
-)
 
+def _universe_long() -> pd.DataFrame:
+    tlong = heatmap.melt(perf, ["Ticker", "Ticker_name", "Category"], PERF_TF, PERF_TF.values(), value_name="Pct")
+    tlong["norm"] = heatmap.normalize(tlong, heatmap.robust_scales(perf, PERF_TF, PERF_TF.values()), "Pct")
+    return tlong
 
 # --- Per-category matrix heatmap (Ticker vs Timeframe), scaled by UNIVERSE per timeframe
-hm_sel = (
-    alt.Chart(tlong_sel)
-    .mark_rect(stroke="#2b2f36", strokeWidth=0.6, strokeOpacity=0.95)
-    .encode(
-        x=alt.X("Timeframe:N",
-                sort=["Daily","WTD","MTD","QTD"],
-                axis=alt.Axis(orient="top", title=None, labelAngle=0, labelColor="#1a1a1a",labelFlush=False, labelFontSize=12)),
-        y=alt.Y("Ticker:N",
-                sort=tickers_order,
-                axis=alt.Axis(title=None, labelFontSize=12, labelColor="#1a1a1a",labelFlush=False, labelLimit=260)),
-        color=alt.Color("norm:Q",
-                        scale=alt.Scale(scheme="blueorange", domain=[-1, 0, 1]),
-                        legend=alt.Legend(orient="bottom",
-                                          title="% Change (per timeframe)",
-                                          labelExpr="''")),
-        tooltip=[
-            alt.Tooltip("Ticker:N"),
-            alt.Tooltip("Timeframe:N"),
-            alt.Tooltip("Pct:Q", title="% Δ", format=",.2f")
-        ],
+def _category_tickers_spec(category: str) -> dict:
+    tlong_all = heatmap.cached("performance", "universe", SNAPSHOT, _universe_long)
+    tlong_sel = tlong_all.loc[tlong_all["Category"].to_numpy() == category]
+    tickers_order = sorted(tlong_sel["Ticker"].dropna().unique().tolist())
+    return heatmap.heatmap_spec(
+        tlong_sel, y="Ticker", y_sort=tickers_order, x_sort=PERF_TF.values(), label_limit=260,
+        legend_title="% Change (per timeframe)",
+        tooltip=[alt.Tooltip("Ticker:N"), alt.Tooltip("Timeframe:N"), alt.Tooltip("Pct:Q", title="% Δ", format=",.2f")],
+        width=420, height=max(360, 22 * len(tickers_order) + 24),
     )
-    .properties(width=420, height=max(360, 22*len(tickers_order)+24))
-    .configure_view(strokeWidth=0)
-)
-
 
 d = perf.loc[perf["Category"] == sel].copy()
-d["Ticker_link"] = d["Ticker"].map(_mk_ticker_link)
+d["Ticker_link"] = ticker_links(d["Ticker"])
 
     # independent scaling by timeframe **within the selected category**
 vmax2 = {
@@ -549,25 +401,13 @@ vmax2 = {
 d_render = pd.DataFrame({
         "Name":   d["Ticker_name"],
         "Ticker": d["Ticker_link"],
-        "Daily":  [ _divergent_tint_html(v, vmax2["Daily"]) for v in d["day_pct_change"] ],
-        "WTD":    [ _divergent_tint_html(v, vmax2["WTD"])   for v in d["week_pct_change"] ],
-        "MTD":    [ _divergent_tint_html(v, vmax2["MTD"])   for v in d["month_pct_change"] ],
-        "QTD":    [ _divergent_tint_html(v, vmax2["QTD"])   for v in d["quarter_pct_change"] ],
+        "Daily":  _divergent_tint_html(d["day_pct_change"], vmax2["Daily"]),
+        "WTD":    _divergent_tint_html(d["week_pct_change"], vmax2["WTD"]),
+        "MTD":    _divergent_tint_html(d["month_pct_change"], vmax2["MTD"]),
+        "QTD":    _divergent_tint_html(d["quarter_pct_change"], vmax2["QTD"]),
     })
 
-html_detail = d_render.to_html(index=False, classes="tbl", escape=False, border=0)
-html_detail = html_detail.replace('class="dataframe tbl"', 'class="tbl"')
-colgroup2 = """
-<colgroup>
-  <col class="col-name-wide">  <!-- Name wider (48ch) -->
-  <col class="col-ticker-nar"> <!-- Ticker narrower -->
-  <col class="col-num-lg">     <!-- Daily bigger -->
-  <col class="col-num-lg">     <!-- WTD bigger -->
-  <col class="col-num-lg">     <!-- MTD bigger -->
-  <col class="col-num-lg">     <!-- QTD bigger -->
-</colgroup>
-""".strip()
-html_detail = html_detail.replace('<table class="tbl">', f'<table class="tbl">{colgroup2}', 1)
+html_detail = frame_table_html(d_render, col_classes=["col-name-wide", "col-ticker-nar"] + ["col-num-lg"] * 4)
 
 if view_choice in ("Table", "Both"):
     st.markdown(
@@ -604,7 +444,9 @@ if view_choice in ("Heatmap", "Both"):
     # Center the chart
     left, center, right = st.columns([1.4, .8, 1.4])
     with center:
-        st.altair_chart(hm_sel, use_container_width=False)
+        hm_sel = heatmap.cached("performance", ("category", sel), SNAPSHOT,
+                                lambda: _category_tickers_spec(sel))
+        st.vega_lite_chart(hm_sel, use_container_width=False)
 
 # -------------------------
 # Footer disclaimer
@@ -3,9 +3,12 @@ from pathlib import Path
 import base64
 import pandas as pd
 import streamlit as st
-import textwrap
 import streamlit.components.v1 as components
-from urllib.parse import quote_plus
+from markmentum.leaders import board
+from markmentum.registry import shared_cache
+from markmentum.snapshot import snapshot_version
+from markmentum.tables import (Column, card_html, column_values, escape_text, fmt_int, fmt_number,
+                               fmt_percent, pick_column, table_html, ticker_links)
 
 # -------------------------
 # Page setup
@@ -113,6 +116,7 @@ _here = Path(__file__).resolve().parent
 APP_DIR = _here if _here.name != "pages" else _here.parent
 
 DATA_DIR  = APP_DIR / "data"
+SNAPSHOT = snapshot_version(DATA_DIR)   # data version, part of every cache key
 ASSETS_DIR = APP_DIR / "assets"
 LOGO_PATH  = ASSETS_DIR / "markmentum_logo.png"
 
@@ -130,16 +134,6 @@ CSV_FILES = [
 # -------------------------
 # Helpers
 # -------------------------
-def _mk_ticker_link(ticker: str) -> str:
-    t = (ticker or "").strip().upper()
-    if not t:
-        return ""
-    return (
-        f'<a href="?page=Deep%20Dive&ticker={quote_plus(t)}" '
-        f'target="_self" rel="noopener" '
-        f'style="text-decoration:none; font-weight:600;">{t}</a>'
-    )
-
 # Lightweight router: handle links like ?page=Deep%20Dive&ticker=NVDA
 qp = st.query_params
 dest = (qp.get("page") or "").strip().lower()
@@ -154,47 +148,30 @@ if dest.replace("%20", " ") == "deep dive":
 def row_spacer(height_px: int = 14):
     st.markdown(f"<div style='height:{height_px}px'></div>", unsafe_allow_html=True)
 
-def _card_table_html_three(df: pd.DataFrame):
+def _base_columns(df: pd.DataFrame) -> list[Column]:
+    """Company | Ticker | Category columns shared by every card."""
+    tcol = pick_column(df, "ticker")
+    ncol = pick_column(df, "ticker_name", "company")
+    ccol = pick_column(df, "category")
+    return [
+        Column("Company", escape_text(column_values(df, ncol)), td_class="company", th_style="min-width:42ch"),
+        Column("Ticker", ticker_links(column_values(df, tcol)), td_class="center", td_style="width:74px",
+               th_class="col-ticker", th_style="width:74px"),
+        Column("Category", escape_text(column_values(df, ccol)), td_style="min-width:25ch", th_style="min-width:25ch"),
+    ]
+
+def _card_table_html_three(title: str, df: pd.DataFrame):
     """Render a 3-column table: Company | Ticker | category (no value column)."""
     if df.empty:
         return ""
-    cmap = {c.lower(): c for c in df.columns}
-    tcol = cmap.get("ticker") or "Ticker"
-    ncol = cmap.get("ticker_name") or cmap.get("company") or "Company"
-    ccol = cmap.get("category") or cmap.get("category") or "category"
-
-    rows = []
-    for _, r in df.iterrows():
-        rows.append(f"""
-<tr>
-  <td class="company">{r.get(ncol, "")}</td>
-  <td class="center" style="width:74px">{_mk_ticker_link(r.get(tcol, ""))}</td>
-  <td style="min-width:25ch">{r.get(ccol, "")}</td>
-</tr>""")
-    return f"""
-<div class="card">
-  <h3>__TITLE__</h3>
-  <table class="tbl">
-    <thead>
-      <tr>
-        <th style="min-width:42ch">Company</th>
-        <th style="width:74px" class="col-ticker">Ticker</th>
-        <th style="min-width:25ch">Category</th>
-      </tr>
-    </thead>
-    <tbody>
-      {''.join(rows)}
-    </tbody>
-  </table>
-</div>
-"""
+    return card_html(title, table_html(_base_columns(df)))
 
 def _render_card_no_value(slot, title: str, df: pd.DataFrame):
     with slot:
         if df.empty:
             st.info(f"No data for {title}.")
             return
-        html = _card_table_html_three(df).replace("__TITLE__", title)
+        html = _card_table_html_three(title, df)
         st.markdown(html, unsafe_allow_html=True)
 
 def _pick_col(df: pd.DataFrame, candidates):
@@ -214,35 +191,17 @@ def _image_to_base64(path: Path) -> str:
     with open(path, "rb") as f:
         return base64.b64encode(f.read()).decode()
 
-@st.cache_data(show_spinner=False)
-def load_csv(path: Path) -> pd.DataFrame:
-    if not path.exists():
-        return pd.DataFrame()
-    return pd.read_csv(path)
-
-def _fmt_pct(val):
-    try:
-        v = float(val)
-        if abs(v) <= 1.0:
-            v *= 100.0
-        return f"{v:,.2f}%"
-    except:
-        return "—"
-
-def _fmt_millions(val):
-    try:
-        v = float(val)
-        if v > 1000:
-            v = v / 1_000_000.0
-        return f"{v:,.2f} M"
-    except:
-        return "—"
-
-def _fmt_num(val):
-    try:
-        return f"{float(val):,.0f}"
-    except:
-        return "—"
+# column formatters (whole column -> cell strings)
+def _fmt_pct(values):
+    v = pd.to_numeric(pd.Series(values, copy=False), errors="coerce")
+    return fmt_percent(v.where(v.abs() > 1.0, v * 100.0), scale=1.0, na="—")   # fractions -> percent
+
+def _fmt_millions(values):
+    v = pd.to_numeric(pd.Series(values, copy=False), errors="coerce")
+    return fmt_number(v.where(v <= 1000, v / 1_000_000.0), suffix=" M", na="—")   # raw shares -> millions
+
+def _fmt_num(values):
+    return fmt_int(values, na="—")
 
 def _guess_value_col(df: pd.DataFrame):
     if df.empty:
@@ -267,40 +226,9 @@ def _guess_value_col(df: pd.DataFrame):
     return df.columns[-1], "Value", _fmt_num
 
 def _card_table_html(title: str, df: pd.DataFrame, value_col: str, value_label: str, value_fmt):
-    safe = {c.lower(): c for c in df.columns}
-    tcol = safe.get("ticker") or "Ticker"
-    ncol = safe.get("ticker_name") or safe.get("company") or "Company"
-    ccol = safe.get("category") or safe.get("category") or "category"
-
-    rows = []
-    for _, r in df.iterrows():
-        rows.append(f"""
-<tr>
-  <td class="company">{r.get(ncol, '')}</td>
-  <td class="center" style="width:74px">{_mk_ticker_link(r.get(tcol, ""))}</td>
-  <td style="min-width:25ch">{r.get(ccol, '')}</td>
-  <td class="right" style="width:90px">{value_fmt(r.get(value_col))}</td>
-</tr>""")
-
-    html = f"""
-<div class="card">
-  <h3>{title}</h3>
-  <table class="tbl">
-    <thead>
-      <tr>
-        <th style="min-width:42ch">Company</th>
-        <th style="width:74px" class="col-ticker">Ticker</th>
-        <th style="min-width:25ch">Category</th>
-        <th style="width:90px" class="right col-value">{value_label}</th>
-      </tr>
-    </thead>
-    <tbody>
-      {''.join(rows)}
-    </tbody>
-  </table>
-</div>
-"""
-    return textwrap.dedent(html).strip()
+    value = Column(value_label, value_fmt(column_values(df, value_col)), td_class="right", td_style="width:90px",
+                   th_class="right col-value", th_style="width:90px")
+    return card_html(title, table_html(_base_columns(df) + [value]))
 
 def _render_card(slot, title: str, df: pd.DataFrame):
     with slot:
@@ -322,27 +250,27 @@ if LOGO_PATH.exists():
     )
 
 # -------------------------
-# Load data (cache-clearable)
+# Load data (cache keyed by data snapshot)
 # -------------------------
-st.cache_data.clear()
 
-@st.cache_data(show_spinner=False)
-def load_all_csvs(csv_files, data_dir: Path):
+@shared_cache
+def load_all_csvs(csv_files, data_dir: Path, snapshot: str):
     dfs_local = []
     for num, _ in csv_files:
-        dfs_local.append(load_csv(data_dir / f"qry_graph_data_{num}.csv"))
+        dfs_local.append(board(num, data_dir, snapshot))   # 32–35 cut by markmentum.leaders
     return dfs_local
 
-dfs = load_all_csvs(CSV_FILES, DATA_DIR)
+# shared read-only frames: a list of our own, cards 5–6 copied before rescaling
+dfs = list(load_all_csvs(tuple(CSV_FILES), DATA_DIR, SNAPSHOT))
 
 # === Title under logo (date from csv #32) ===
 def _mdy_no_leading_zeros(dt: pd.Timestamp) -> str:
     dt = pd.to_datetime(dt)
     return f"{dt.month}/{dt.day}/{dt.year}"
 
-@st.cache_data(show_spinner=False)
-def _filters_title_date() -> str:
-    df = load_csv(DATA_DIR / "qry_graph_data_32.csv")  # #32
+@shared_cache
+def _filters_title_date(snapshot: str) -> str:
+    df = board(32, DATA_DIR, snapshot)  # #32
     if df.empty:
         return _mdy_no_leading_zeros(pd.Timestamp.today())
     dmax = pd.to_datetime(df.get("Date"), errors="coerce").max()
@@ -353,7 +281,7 @@ def _filters_title_date() -> str:
 st.markdown(
     f"""
     <div style="text-align:center; font-size:18px; font-weight:600; margin:-6px 0 10px;">
-        Filters – {_filters_title_date()}
+        Filters – {_filters_title_date(SNAPSHOT)}
     </div>
     """,
     unsafe_allow_html=True,
@@ -381,10 +309,12 @@ vcol = _pick_col(dfs[3], ["Value", "daily_return_pct", "percent"])
 _render_card_custom(r2c1, titles[3], dfs[3], vcol, "% Change", _fmt_pct)
 
 score_col = _pick_col(dfs[4], ["ChaseScore", "chasescore", "chase_score", "Chase_Score","Score", "score", "model_score"])
+dfs[4] = dfs[4].copy()
 dfs[4][score_col] = dfs[4][score_col] * 100
 _render_card_custom(r2c2, titles[4], dfs[4], score_col, "Chase Score", _fmt_num)
 
 score_col = _pick_col(dfs[5], ["ChaseScore", "chasescore", "chase_score", "Chase_Score","Score", "score", "model_score"])
+dfs[5] = dfs[5].copy()
 dfs[5][score_col] = dfs[5][score_col] * 100
 _render_card_custom(r2c3, titles[5], dfs[5], score_col, "Chase Score", _fmt_num)
 
@@ -4,11 +4,13 @@
 
 from pathlib import Path
 import base64
-import textwrap
 import pandas as pd
 import streamlit as st
 import sys
-from urllib.parse import quote_plus
+from markmentum.store import read_table
+from markmentum.registry import shared_cache
+from markmentum.snapshot import snapshot_version
+from markmentum.tables import Column, card_html, column_values, escape_text, fmt_int, pick_column, table_html, ticker_links
 
 # -------------------------
 # Page & shared style (same as Overview)
@@ -113,6 +115,7 @@ _here = Path(__file__).resolve().parent
 APP_DIR = _here if _here.name != "pages" else _here.parent
 
 DATA_DIR  = APP_DIR / "data"
+SNAPSHOT = snapshot_version(DATA_DIR)   # data version, part of every cache key
 ASSETS_DIR = APP_DIR / "assets"
 LOGO_PATH  = ASSETS_DIR / "markmentum_logo.png"
 
@@ -128,17 +131,6 @@ CSV_FILES = [
 # Helpers (same approach as Overview)
 # -------------------------
 
-#---clickable links helper------
-def _mk_ticker_link(ticker: str) -> str:
-    t = (ticker or "").strip().upper()
-    if not t:
-        return ""
-    return (
-        f'<a href="?page=Deep%20Dive&ticker={quote_plus(t)}" '
-        f'target="_self" rel="noopener" '
-        f'style="text-decoration:none; font-weight:600;">{t}</a>'
-    )
-
 # --- lightweight router: handle links like ?page=Deep%20Dive&ticker=NVDA ---
 qp = st.query_params
 dest = (qp.get("page") or "").strip().lower()
@@ -163,11 +155,11 @@ def _image_to_base64(path: Path) -> str:
     with open(path, "rb") as f:
         return base64.b64encode(f.read()).decode()
 
-@st.cache_data(show_spinner=False)
-def load_csv(path: Path) -> pd.DataFrame:
+@shared_cache
+def load_csv(path: Path, snapshot: str) -> pd.DataFrame:
     if not path.exists():
         return pd.DataFrame()
-    return pd.read_csv(path)
+    return read_table(path)
 
 def _pick(df: pd.DataFrame, candidates: list[str], default: str | None = None):
     """Case-tolerant column picker."""
@@ -179,50 +171,24 @@ def _pick(df: pd.DataFrame, candidates: list[str], default: str | None = None):
                 return col
     return default
 
-def _fmt_1dec(val):
-    try:
-        return f"{float(val):,.0f}"
-    except Exception:
-        return "—"
+# column formatters (whole column -> cell strings)
+def _fmt_1dec(values):
+    return fmt_int(values, na="—")
 
 def _table_html(title: str, df: pd.DataFrame, value_col: str, value_label: str, value_fmt):
     # tolerant mapping for standard names used in your CSVs
-    cmap = {c.lower(): c for c in df.columns}
-    tcol = cmap.get("ticker") or "Ticker"
-    ncol = cmap.get("ticker_name") or cmap.get("company") or "Company"
-    ccol = cmap.get("category") 
-
-    rows = []
-    for _, r in df.iterrows():
-        rows.append(
-            f"""
-<tr>
-  <td class="company">{r.get(ncol, "")}</td>
-  <td class="center" style="width:74px">{_mk_ticker_link(r.get(tcol, ""))}</td>
-  <td style="min-width:25ch">{r.get(ccol, "")}</td>
-  <td class="right" style="width:90px">{value_fmt(r.get(value_col))}</td>
-</tr>"""
-        )
-
-    html = f"""
-<div class="card">
-  <h3>{title}</h3>
-  <table class="tbl">
-    <thead>
-      <tr>
-        <th style="min-width:42ch">Company</th>
-        <th style="width:74px" class="col-ticker">Ticker</th>
-        <th style="min-width:25ch">Category</th>
-        <th style="width:90px" class="right col-value">{value_label}</th>
-      </tr>
-    </thead>
-    <tbody>
-      {''.join(rows)}
-    </tbody>
-  </table>
-</div>
-"""
-    return textwrap.dedent(html).strip()
+    tcol = pick_column(df, "ticker")
+    ncol = pick_column(df, "ticker_name", "company")
+    ccol = pick_column(df, "category")
+    table = table_html([
+        Column("Company", escape_text(column_values(df, ncol)), td_class="company", th_style="min-width:42ch"),
+        Column("Ticker", ticker_links(column_values(df, tcol)), td_class="center", td_style="width:74px",
+               th_class="col-ticker", th_style="width:74px"),
+        Column("Category", escape_text(column_values(df, ccol)), td_style="min-width:25ch", th_style="min-width:25ch"),
+        Column(value_label, value_fmt(column_values(df, value_col)), td_class="right", td_style="width:90px",
+               th_class="right col-value", th_style="width:90px"),
+    ])
+    return card_html(title, table)
 
 def render_card(slot, title: str, df: pd.DataFrame, value_col: str, value_label: str, value_fmt):
     with slot:
@@ -245,17 +211,14 @@ if LOGO_PATH.exists():
     )
 
 # -------------------------
-# Load CSVs (cache-clearable)
+# Load CSVs (cache keyed by data snapshot)
 # -------------------------
 
-# clear cache automatically on each run
-st.cache_data.clear()
-
-@st.cache_data(show_spinner=False)
-def load_all_csvs(csv_files, data_dir: Path):
-    return [load_csv(data_dir / f"qry_graph_data_{num}.csv") for num, _ in csv_files]
+@shared_cache
+def load_all_csvs(csv_files, data_dir: Path, snapshot: str):
+    return [load_csv(data_dir / f"qry_graph_data_{num}.csv", snapshot) for num, _ in csv_files]
 
-dfs = load_all_csvs(CSV_FILES, DATA_DIR)
+dfs = load_all_csvs(tuple(CSV_FILES), DATA_DIR, SNAPSHOT)
 
 # ---- Centered sub-title: "Volatility Spreads – {asof}" (date from CSV #40)
 def _pretty_mdY(ts) -> str:
@@ -269,7 +232,7 @@ def _pretty_mdY(ts) -> str:
 
 asof_text = ""
 try:
-    df40 = load_csv(DATA_DIR / "qry_graph_data_40.csv")
+    df40 = load_csv(DATA_DIR / "qry_graph_data_40.csv", SNAPSHOT)
     date_col = _pick(df40, ["Date", "date", "AsOf", "asof"])
     if date_col:
         # use max in case multiple rows/dates are present
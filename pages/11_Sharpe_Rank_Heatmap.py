@@ -3,13 +3,16 @@
 from pathlib import Path
 import base64
 import pandas as pd
-import numpy as np
 import altair as alt
 import streamlit as st
-from urllib.parse import quote_plus
+from markmentum import heatmap, periods
+from markmentum.facts import load_facts
+from markmentum.registry import shared_cache
+from markmentum.snapshot import snapshot_version
+from markmentum.tables import fmt_int, frame_table_html, ticker_links
+from markmentum.tints import GRAY, GREEN, RED, Band, Banded, diverging, tint_cells
 
 # ---------- Page ----------
-st.cache_data.clear()
 st.set_page_config(page_title="Sharpe Heatmap", layout="wide")
 
 # -------------------------
@@ -19,14 +22,12 @@ _here = Path(__file__).resolve().parent
 APP_DIR = _here if _here.name != "pages" else _here.parent
 
 DATA_DIR   = APP_DIR / "data"
+SNAPSHOT = snapshot_version(DATA_DIR)   # data version, part of every cache key
 ASSETS_DIR = APP_DIR / "assets"
 LOGO_PATH  = ASSETS_DIR / "markmentum_logo.png"
 
-# Sharpe sources (as specified)
-CSV_BASE = DATA_DIR / "qry_graph_data_48.csv"  # Sharpe_Rank + daily change
-CSV_WTD  = DATA_DIR / "qry_graph_data_49.csv"  # Sharpe_Rank_wtd_change
-CSV_MTD  = DATA_DIR / "qry_graph_data_50.csv"  # Sharpe_Rank_mtd_change
-CSV_QTD  = DATA_DIR / "qry_graph_data_51.csv"  # Sharpe_Rank_qtd_change
+# Sharpe sources: qry_graph_data_48 (Rank + daily change) and 49/50/51 (WTD/MTD/QTD
+# change), read as columns of the latest-snapshot fact table (markmentum.facts)
 
 # -------------------------
 # Header: logo centered
@@ -45,17 +46,7 @@ if LOGO_PATH.exists():
         unsafe_allow_html=True,
     )
 
-# --- Clickable Deep Dive helper & router (same UX as Performance/Markmentum pages)
-def _mk_ticker_link(ticker: str) -> str:
-    t = (ticker or "").strip().upper()
-    if not t:
-        return ""
-    return (
-        f'<a href="?page=Deep%20Dive&ticker={quote_plus(t)}" '
-        f'target="_self" rel="noopener" '
-        f'style="text-decoration:none; font-weight:600;">{t}</a>'
-    )
-
+# --- Deep Dive link router (same UX as Performance/Markmentum pages)
 qp = st.query_params
 dest = (qp.get("page") or "").strip().lower()
 if dest.replace("%20", " ") == "deep dive":
@@ -69,99 +60,55 @@ if dest.replace("%20", " ") == "deep dive":
 # -------------------------
 # Helpers
 # -------------------------
-def _robust_vmax(series, q=0.98, floor=1.0, step=1.0):
-    s = pd.to_numeric(series, errors="coerce").abs().dropna()
-    if s.empty:
-        return floor
-    vmax = float(np.quantile(s, q))
-    return max(floor, np.ceil(vmax / step) * step)
-
-def _fmt_num(x, nd=0):
-    try:
-        if pd.isna(x): return ""
-        return f"{float(x):,.{nd}f}"
-    except Exception:
-        return ""
-
-# Rank cell tint: Buy green, Neutral gray, Sell red; stronger beyond ±100
-def _Rank_cell_html(score: float, cap: float = 100.0) -> str:
-    if score is None or pd.isna(score):
-        return ""
-    s = float(np.clip(score, 0, cap))
-
-    if s >= 70:  # High
-        # intensity grows from 70 -> 100
-        rel = (s - 70.0) / 30.0  # 0..1
-        alpha = 0.12 + 0.28 * max(0.0, min(rel, 1.0))
-        bg = f"rgba(16,185,129,{alpha:.3f})"   # green
-        color = "#0b513a"
-    elif s <= 30:  # Low
-        # intensity grows from 30 -> 0
-        rel = (30.0 - s) / 30.0  # 0..1
-        alpha = 0.12 + 0.28 * max(0.0, min(rel, 1.0))
-        bg = f"rgba(239,68,68,{alpha:.3f})"   # red
-        color = "#641515"
-    else:
-        bg = "rgba(156,163,175,0.18)"         # neutral gray
-        color = "#374151"
-
-    label = _fmt_num(s, 0)
-    return f'<span style="display:block; background:{bg}; color:{color}; padding:0 6px; border-radius:2px; text-align:right;">{label}</span>'
+DELTA_COLS = ["ΔDaily", "ΔWTD", "ΔMTD", "ΔQTD"]
+HEAT_COLS = ["Rank"] + DELTA_COLS        # heatmap columns, left to right
+
+# Rank cell tint: High green, Neutral gray, Low red; intensity grows toward 100 / 0
+RANK_SCALE = Banded(
+    edges=(30, 70),
+    upper=(False, True),                                   # ≤30 | 30..70 | ≥70
+    bands=(Band(RED, color="#641515", origin=30.0, width=30.0),
+           Band(GRAY, color="#374151"),
+           Band(GREEN, color="#0b513a", origin=70.0, width=30.0)),
+    clip=(0.0, 100.0),
+)
+
+def _Rank_cell_html(values):
+    label = fmt_int(pd.to_numeric(values, errors="coerce").clip(0, 100))
+    return tint_cells(values, RANK_SCALE, label, pad=6, align_right=True)
+
 # Change column tint (independent scale per timeframe)
-def _delta_cell_html(val: float, vmax: float) -> str:
-    if val is None or pd.isna(val) or vmax is None or vmax <= 0:
-        return ""
-    s = min(abs(float(val)) / float(vmax), 1.0)
-    alpha = 0.12 + 0.28 * s
-    if val > 0:
-        bg = f"rgba(16,185,129,{alpha:.3f})"
-    elif val < 0:
-        bg = f"rgba(239,68,68,{alpha:.3f})"
-    else:
-        bg = "transparent"
-    label = _fmt_num(val, 0)
-    return f'<span style="display:block; background:{bg}; padding:0 6px; border-radius:2px; text-align:right;">{label}</span>'
+def _delta_cell_html(values, vmax: float):
+    return tint_cells(values, diverging(vmax), fmt_int(values), pad=6, align_right=True)
 
 # -------------------------
 # Load sources + assemble Sharpe frame
 # -------------------------
-@st.cache_data(show_spinner=False)
-def load_sharpe_frames():
-    # Base / daily
-    base = pd.read_csv(CSV_BASE) if CSV_BASE.exists() else pd.DataFrame()
-    if not base.empty and "Date" in base.columns:
-        base["_dt"] = pd.to_datetime(base["Date"], errors="coerce")
-        base = (base.sort_values(["Ticker","_dt"], ascending=[True, False])
-                    .drop_duplicates(subset=["Ticker"], keep="first"))
-    for c in ["Sharpe_Rank","previous_Sharpe_Rank","Sharpe_Rank_daily_change"]:
-        if c in base.columns:
-            base[c] = pd.to_numeric(base[c], errors="coerce")
-    if "Sharpe_Rank_daily_change" not in base.columns or base["Sharpe_Rank_daily_change"].isna().all():
-        if "Sharpe_Rank" in base.columns and "previous_Sharpe_Rank" in base.columns:
-            base["Sharpe_Rank_daily_change"] = base["Sharpe_Rank"] - base["previous_Sharpe_Rank"]
-
-    # WTD / MTD / QTD
-    def _load_delta(p, delta_col):
-        if not p.exists():
-            return pd.DataFrame(columns=["Ticker", delta_col])
-        df = pd.read_csv(p)
-        if "Ticker" not in df.columns:
-            return pd.DataFrame(columns=["Ticker", delta_col])
-        df[delta_col] = pd.to_numeric(df.get(delta_col), errors="coerce")
-        df = df[["Ticker", delta_col]].drop_duplicates("Ticker", keep="first")
-        return df
-
-    wtd = _load_delta(CSV_WTD, "Sharpe_Rank_wtd_change")
-    mtd = _load_delta(CSV_MTD, "Sharpe_Rank_mtd_change")
-    qtd = _load_delta(CSV_QTD, "Sharpe_Rank_qtd_change")
-
-    # Merge
-    df = base.copy()
-    for add in (wtd, mtd, qtd):
-        df = df.merge(add, on="Ticker", how="left")
+@shared_cache
+def load_sharpe_frames(snapshot: str):
+    # latest row per ticker (48, daily change) from the fact table; WTD/MTD/QTD from the
+    # Sharpe Rank history (09) by markmentum.periods, 49/50/51 only where the history has a gap
+    period_cols = [f"Sharpe_Rank_{p}_change" for p in periods.PERIODS]
+    df = load_facts(DATA_DIR, snapshot, [
+        "Ticker_name","Category","Date",
+        "Sharpe_Rank","previous_Sharpe_Rank","Sharpe_Rank_daily_change", *period_cols,
+    ])
+    if "Sharpe_Rank" not in df.columns:
+        return pd.DataFrame()
+    df = df.dropna(subset=["Sharpe_Rank"])
+    if "Sharpe_Rank_daily_change" not in df.columns or df["Sharpe_Rank_daily_change"].isna().all():
+        if "previous_Sharpe_Rank" in df.columns:
+            df["Sharpe_Rank_daily_change"] = df["Sharpe_Rank"] - df["previous_Sharpe_Rank"]
+
+    hist = periods.load_history(DATA_DIR, "Sharpe_Rank", snapshot)
+    if hist is not None and "Date" in df.columns:
+        chg = periods.period_changes(hist, df["Ticker"], df["Sharpe_Rank"], df["Date"].max(), prefix="Sharpe_Rank")
+        for c in period_cols:
+            derived = pd.Series(chg[c].to_numpy(), index=df.index).round(1)   # ranks are published to 0.1
+            df[c] = derived.fillna(df[c]) if c in df.columns else derived
 
     # Final schema (rename to common labels)
-    df = df.rename(columns={
+    return df.rename(columns={
         "Ticker_name": "Name",
         "Sharpe_Rank": "Rank",
         "Sharpe_Rank_daily_change": "ΔDaily",
@@ -169,12 +116,8 @@ def load_sharpe_frames():
         "Sharpe_Rank_mtd_change":   "ΔMTD",
         "Sharpe_Rank_qtd_change":   "ΔQTD",
     })
-    for c in ["Rank","ΔDaily","ΔWTD","ΔMTD","ΔQTD"]:
-        if c in df.columns:
-            df[c] = pd.to_numeric(df[c], errors="coerce")
-    return df
 
-Ranks = load_sharpe_frames()
+Ranks = load_sharpe_frames(SNAPSHOT)
 if Ranks.empty:
     st.warning("Sharpe files not found or missing required columns.")
     st.stop()
@@ -253,49 +196,27 @@ macro_list = [
     "XLB","XLC","XLE","XLF","XLI","XLK","XLP","XLRE","XLU","XLV","XLY",
     "GLD","UUP","TLT","BTC=F"
 ]
-Ranks["_dt"] = pd.to_datetime(Ranks["Date"], errors="coerce")
-latest = (
-    Ranks.sort_values(["Ticker","_dt"], ascending=[True, False])
-          .drop_duplicates(subset=["Ticker"], keep="first")
-)
+latest = Ranks   # one row per ticker (fact table)
 
 m = latest[latest["Ticker"].isin(macro_list)].copy()
-m["__ord__"] = m["Ticker"].map({t:i for i,t in enumerate(macro_list)})
+m["__ord__"] = m["Ticker"].astype(str).map({t:i for i,t in enumerate(macro_list)})
 m = m.sort_values(["__ord__"], kind="stable")
-m["Ticker_link"] = m["Ticker"].map(_mk_ticker_link)
+m["Ticker_link"] = ticker_links(m["Ticker"])
 
 # independent scaling for deltas by timeframe (within macro card)
-vmaxM = {
-    "ΔDaily": _robust_vmax(m["ΔDaily"], q=0.98, floor=1.0, step=1.0),
-    "ΔWTD":   _robust_vmax(m["ΔWTD"],   q=0.98, floor=1.0, step=1.0),
-    "ΔMTD":   _robust_vmax(m["ΔMTD"],   q=0.98, floor=1.0, step=1.0),
-    "ΔQTD":   _robust_vmax(m["ΔQTD"],   q=0.98, floor=1.0, step=1.0),
-}
+vmaxM = heatmap.robust_scales(m, DELTA_COLS)
 
 m_render = pd.DataFrame({
     "Name":   m["Name"],
     "Ticker": m["Ticker_link"],
-    "Rank":  [ _Rank_cell_html(v) for v in m["Rank"] ],
-    "Daily":  [ _delta_cell_html(v, vmaxM["ΔDaily"]) for v in m["ΔDaily"] ],
-    "WTD":    [ _delta_cell_html(v, vmaxM["ΔWTD"])   for v in m["ΔWTD"]   ],
-    "MTD":    [ _delta_cell_html(v, vmaxM["ΔMTD"])   for v in m["ΔMTD"]   ],
-    "QTD":    [ _delta_cell_html(v, vmaxM["ΔQTD"])   for v in m["ΔQTD"]   ],
+    "Rank":  _Rank_cell_html(m["Rank"]),
+    "Daily":  _delta_cell_html(m["ΔDaily"], vmaxM["ΔDaily"]),
+    "WTD":    _delta_cell_html(m["ΔWTD"], vmaxM["ΔWTD"]),
+    "MTD":    _delta_cell_html(m["ΔMTD"], vmaxM["ΔMTD"]),
+    "QTD":    _delta_cell_html(m["ΔQTD"], vmaxM["ΔQTD"]),
 })
 
-html_macro = m_render.to_html(index=False, classes="tbl", escape=False, border=0)
-html_macro = html_macro.replace('class="dataframe tbl"', 'class="tbl"')
-colgroup_macro = """
-<colgroup>
-  <col class="col-name-wide">
-  <col class="col-ticker-nar">
-  <col class="col-num">
-  <col class="col-num">
-  <col class="col-num">
-  <col class="col-num">
-  <col class="col-num">
-</colgroup>
-""".strip()
-html_macro = html_macro.replace('<table class="tbl">', f'<table class="tbl">{colgroup_macro}', 1)
+html_macro = frame_table_html(m_render, col_classes=["col-name-wide", "col-ticker-nar"] + ["col-num"] * 5)
 
 st.markdown(
     f"""
@@ -316,7 +237,7 @@ st.markdown('<div class="vspace-16"></div>', unsafe_allow_html=True)
 # -------------------------
 # Category Averages card
 # -------------------------
-grouped = latest.groupby("Category", dropna=True, as_index=False).agg(
+grouped = latest.groupby("Category", dropna=True, observed=True, as_index=False).agg(
     Rank=("Rank","mean"),
     ΔDaily=("ΔDaily","mean"),
     ΔWTD=("ΔWTD","mean"),
@@ -332,38 +253,21 @@ preferred_order = [
     "Materials","Real Estate","Utilities","MR Discretion"
 ]
 order_map = {name: i for i, name in enumerate(preferred_order)}
-grouped["__ord__"] = grouped["Category"].map(order_map)
+grouped["__ord__"] = grouped["Category"].astype(str).map(order_map)
 grouped = grouped.sort_values(["__ord__", "Category"], kind="stable").drop(columns="__ord__")
 
-vmax_cat = {
-    "ΔDaily": _robust_vmax(grouped["ΔDaily"], q=0.98, floor=1.0, step=1.0),
-    "ΔWTD":   _robust_vmax(grouped["ΔWTD"],   q=0.98, floor=1.0, step=1.0),
-    "ΔMTD":   _robust_vmax(grouped["ΔMTD"],   q=0.98, floor=1.0, step=1.0),
-    "ΔQTD":   _robust_vmax(grouped["ΔQTD"],   q=0.98, floor=1.0, step=1.0),
-}
+vmax_cat = heatmap.robust_scales(grouped, DELTA_COLS)
 
 g_render = pd.DataFrame({
     "Name":  grouped["Category"],
-    "Rank": [ _Rank_cell_html(v) for v in grouped["Rank"] ],
-    "Daily": [ _delta_cell_html(v, vmax_cat["ΔDaily"]) for v in grouped["ΔDaily"] ],
-    "WTD":   [ _delta_cell_html(v, vmax_cat["ΔWTD"])   for v in grouped["ΔWTD"]   ],
-    "MTD":   [ _delta_cell_html(v, vmax_cat["ΔMTD"])   for v in grouped["ΔMTD"]   ],
-    "QTD":   [ _delta_cell_html(v, vmax_cat["ΔQTD"])   for v in grouped["ΔQTD"]   ],
+    "Rank": _Rank_cell_html(grouped["Rank"]),
+    "Daily": _delta_cell_html(grouped["ΔDaily"], vmax_cat["ΔDaily"]),
+    "WTD":   _delta_cell_html(grouped["ΔWTD"], vmax_cat["ΔWTD"]),
+    "MTD":   _delta_cell_html(grouped["ΔMTD"], vmax_cat["ΔMTD"]),
+    "QTD":   _delta_cell_html(grouped["ΔQTD"], vmax_cat["ΔQTD"]),
 })
 
-html_cat = g_render.to_html(index=False, classes="tbl", escape=False, border=0)
-html_cat = html_cat.replace('class="dataframe tbl"', 'class="tbl"')
-colgroup = """
-<colgroup>
-  <col class="col-name-wide">
-  <col class="col-num">
-  <col class="col-num">
-  <col class="col-num">
-  <col class="col-num">
-  <col class="col-num">
-</colgroup>
-""".strip()
-html_cat = html_cat.replace('<table class="tbl">', f'<table class="tbl">{colgroup}', 1)
+html_cat = frame_table_html(g_render, col_classes=["col-name-wide"] + ["col-num"] * 5)
 
 st.markdown(
     f"""
@@ -382,56 +286,20 @@ st.markdown(
 st.markdown('<div class="vspace-16"></div>', unsafe_allow_html=True)
 
 # ===== Category Heatmap — ONE matrix (Rank + ΔDaily/ΔWTD/ΔMTD/ΔQTD), all blue↔orange =====
-glong = grouped.melt(
-    id_vars=["Category"],
-    value_vars=["Rank", "ΔDaily", "ΔWTD", "ΔMTD", "ΔQTD"],
-    var_name="Timeframe",
-    value_name="Value",
-)
-glong["Category"] = pd.Categorical(glong["Category"], categories=preferred_order, ordered=True)
-
-# Robust |max| per timeframe INCLUDING Rank; cap Rank's vmax at 105
-vmax_tf = {}
-for tf, sub in glong.groupby("Timeframe"):
-    vmax = _robust_vmax(sub["Value"], q=0.98, floor=1.0, step=1.0)
-    if tf == "Rank":
-        vmax = min(105.0, max(vmax, 1.0))
-    vmax_tf[tf] = vmax
-
-# Normalize each cell by its timeframe-specific vmax → [-1, 1]
-glong["norm"] = glong.apply(
-    lambda r: float(np.clip((r["Value"] or 0.0) / (vmax_tf.get(r["Timeframe"], 1.0) or 1.0), -1, 1)),
-    axis=1
-)
+def _category_spec() -> dict:
+    glong = heatmap.melt(grouped, ["Category"], HEAT_COLS)
+    # Robust |max| per timeframe INCLUDING Rank; cap Rank's vmax at 105
+    scales = heatmap.robust_scales(grouped, HEAT_COLS, caps={"Rank": 105.0})
+    glong["norm"] = heatmap.normalize(glong, scales)
+    return heatmap.heatmap_spec(
+        glong, y="Category", y_sort=preferred_order, x_sort=HEAT_COLS,
+        legend_title="Avg Rank and Change",
+        tooltip=[alt.Tooltip("Category:N"), alt.Tooltip("Timeframe:N"),
+                 alt.Tooltip("Value:Q", title="Rank / Δ", format=",.0f")],
+        width=450, height=24 * len(preferred_order),
+    )
 
-timeframe_order = ["Rank", "ΔDaily", "ΔWTD", "ΔMTD", "ΔQTD"]
-
-cat_hm = (
-    alt.Chart(glong)
-      .mark_rect(stroke="#2b2f36", strokeWidth=0.6, strokeOpacity=0.95)
-      .encode(
-          x=alt.X("Timeframe:N",
-                  sort=timeframe_order,
-                  axis=alt.Axis(orient="top", title=None, labelAngle=0,
-                                labelColor="#1a1a1a", labelFontSize=12, labelFlush=False)),
-          y=alt.Y("Category:N",
-                  sort=list(glong["Category"].cat.categories),
-                  axis=alt.Axis(title=None, labelColor="#1a1a1a",
-                                labelFlush=False, labelFontSize=12, labelLimit=240)),
-          color=alt.Color("norm:Q",
-                          scale=alt.Scale(scheme="blueorange", domain=[-1, 0, 1]),
-                          legend=alt.Legend(orient="bottom",
-                                            title="Avg Rank and Change",
-                                            labelExpr="''")),
-          tooltip=[
-              alt.Tooltip("Category:N"),
-              alt.Tooltip("Timeframe:N"),
-              alt.Tooltip("Value:Q", title="Rank / Δ", format=",.0f"),
-          ],
-      )
-      .properties(width=450, height=24 * len(preferred_order))
-      .configure_view(strokeWidth=0)
-)
+cat_hm = heatmap.cached("sharpe_rank", "categories", SNAPSHOT, _category_spec)
 
 st.markdown('<div class="vspace-16"></div>', unsafe_allow_html=True)
 st.markdown(
@@ -449,7 +317,7 @@ st.markdown(
 )
 left, center, right = st.columns([1, .8, 1])
 with center:
-    st.altair_chart(cat_hm, use_container_width=False)
+    st.vega_lite_chart(cat_hm, use_container_width=False)
 
 # -------------------------
 # Category selector — Table / Heatmap / Both
@@ -472,39 +340,21 @@ with col_center:
     )
 
 d = latest.loc[latest["Category"] == sel].copy()
-d["Ticker_link"] = d["Ticker"].map(_mk_ticker_link)
+d["Ticker_link"] = ticker_links(d["Ticker"])
 
-vmax_sel = {
-    "ΔDaily": _robust_vmax(d["ΔDaily"], q=0.98, floor=1.0, step=1.0),
-    "ΔWTD":   _robust_vmax(d["ΔWTD"],   q=0.98, floor=1.0, step=1.0),
-    "ΔMTD":   _robust_vmax(d["ΔMTD"],   q=0.98, floor=1.0, step=1.0),
-    "ΔQTD":   _robust_vmax(d["ΔQTD"],   q=0.98, floor=1.0, step=1.0),
-}
+vmax_sel = heatmap.robust_scales(d, DELTA_COLS)
 
 d_render = pd.DataFrame({
     "Name":   d["Name"],
     "Ticker": d["Ticker_link"],
-    "Rank":  [ _Rank_cell_html(v) for v in d["Rank"] ],
-    "Daily":  [ _delta_cell_html(v, vmax_sel["ΔDaily"]) for v in d["ΔDaily"] ],
-    "WTD":    [ _delta_cell_html(v, vmax_sel["ΔWTD"])   for v in d["ΔWTD"]   ],
-    "MTD":    [ _delta_cell_html(v, vmax_sel["ΔMTD"])   for v in d["ΔMTD"]   ],
-    "QTD":    [ _delta_cell_html(v, vmax_sel["ΔQTD"])   for v in d["ΔQTD"]   ],
+    "Rank":  _Rank_cell_html(d["Rank"]),
+    "Daily":  _delta_cell_html(d["ΔDaily"], vmax_sel["ΔDaily"]),
+    "WTD":    _delta_cell_html(d["ΔWTD"], vmax_sel["ΔWTD"]),
+    "MTD":    _delta_cell_html(d["ΔMTD"], vmax_sel["ΔMTD"]),
+    "QTD":    _delta_cell_html(d["ΔQTD"], vmax_sel["ΔQTD"]),
 })
 
-html_detail = d_render.to_html(index=False, classes="tbl", escape=False, border=0)
-html_detail = html_detail.replace('class="dataframe tbl"', 'class="tbl"')
-colgroup2 = """
-<colgroup>
-  <col class="col-name-wide">
-  <col class="col-ticker-nar">
-  <col class="col-num">
-  <col class="col-num">
-  <col class="col-num">
-  <col class="col-num">
-  <col class="col-num">
-</colgroup>
-""".strip()
-html_detail = html_detail.replace('<table class="tbl">', f'<table class="tbl">{colgroup2}', 1)
+html_detail = frame_table_html(d_render, col_classes=["col-name-wide", "col-ticker-nar"] + ["col-num"] * 5)
 
 if view_choice in ("Table","Both"):
     st.markdown(
@@ -525,60 +375,24 @@ if view_choice in ("Table","Both"):
 # Per-ticker heatmap (Rank + Δ columns, independent scale per timeframe, universe-wide)
 # -------------------------
 # Long frame across entire universe, INCLUDING Rank
-tlong_all = latest.melt(
-    id_vars=["Ticker","Name","Category"],
-    value_vars=["Rank","ΔDaily","ΔWTD","ΔMTD","ΔQTD"],
-    var_name="Timeframe",
-    value_name="Value"
-)
-
-# Universe-wide robust vmax per timeframe; cap Rank at 105
-vmax_univ_tf = {}
-for tf, sub in tlong_all.groupby("Timeframe"):
-    vmax = _robust_vmax(sub["Value"], q=0.98, floor=1.0, step=1.0)
-    if tf == "Rank":
-        vmax = min(105.0, max(vmax, 1.0))
-    vmax_univ_tf[tf] = vmax
-
-# Selected category long
-tlong_sel = tlong_all.loc[tlong_all["Category"] == sel].copy()
-tickers_order = sorted(tlong_sel["Ticker"].dropna().unique().tolist())
-
-# Normalize each cell by the universe max for its timeframe → [-1, 1]
-tlong_sel["norm"] = tlong_sel.apply(
-    lambda r: np.clip(
-        (r["Value"] or 0.0) / (vmax_univ_tf.get(r["Timeframe"], 1.0) or 1.0),
-        -1, 1
-    ),
-    axis=1
-)
-
-hm_sel = (
-    alt.Chart(tlong_sel)
-      .mark_rect(stroke="#2b2f36", strokeWidth=0.6, strokeOpacity=0.95)
-      .encode(
-          x=alt.X("Timeframe:N",
-                  sort=["Rank","ΔDaily","ΔWTD","ΔMTD","ΔQTD"],
-                  axis=alt.Axis(orient="top", title=None, labelAngle=0,
-                                labelColor="#1a1a1a", labelFlush=False, labelFontSize=12)),
-          y=alt.Y("Ticker:N",
-                  sort=tickers_order,
-                  axis=alt.Axis(title=None, labelFontSize=12, labelColor="#1a1a1a",
-                                labelFlush=False, labelLimit=260)),
-          color=alt.Color("norm:Q",
-                          scale=alt.Scale(scheme="blueorange", domain=[-1, 0, 1]),
-                          legend=alt.Legend(orient="bottom",
-                                            title="Rank and Change",
-                                            labelExpr="''")),
-          tooltip=[
-              alt.Tooltip("Ticker:N"),
-              alt.Tooltip("Timeframe:N", title="Timeframe"),
-              alt.Tooltip("Value:Q", title="Rank / Δ", format=",.0f"),
-          ],
-      )
-      .properties(width=400, height=max(360, 22*len(tickers_order)+24))
-      .configure_view(strokeWidth=0)
-)
+# Long frame across entire universe, INCLUDING Rank, normalised by the universe-wide robust
+# vmax per timeframe (Rank capped at 105); built once per snapshot, shared by every category
+def _universe_long() -> pd.DataFrame:
+    tlong = heatmap.melt(latest, ["Ticker", "Name", "Category"], HEAT_COLS)
+    tlong["norm"] = heatmap.normalize(tlong, heatmap.robust_scales(latest, HEAT_COLS, caps={"Rank": 105.0}))
+    return tlong
+
+def _category_tickers_spec(category: str) -> dict:
+    tlong_all = heatmap.cached("sharpe_rank", "universe", SNAPSHOT, _universe_long)
+    tlong_sel = tlong_all.loc[tlong_all["Category"].to_numpy() == category]
+    tickers_order = sorted(tlong_sel["Ticker"].dropna().unique().tolist())
+    return heatmap.heatmap_spec(
+        tlong_sel, y="Ticker", y_sort=tickers_order, x_sort=HEAT_COLS, label_limit=260,
+        legend_title="Rank and Change",
+        tooltip=[alt.Tooltip("Ticker:N"), alt.Tooltip("Timeframe:N", title="Timeframe"),
+                 alt.Tooltip("Value:Q", title="Rank / Δ", format=",.0f")],
+        width=400, height=max(360, 22 * len(tickers_order) + 24),
+    )
 
 if view_choice in ("Heatmap","Both"):
     st.markdown('<div class="vspace-16"></div>', unsafe_allow_html=True)
@@ -597,7 +411,9 @@ if view_choice in ("Heatmap","Both"):
     )
     left, center, right = st.columns([1.4, .8, 1.4])
     with center:
-        st.altair_chart(hm_sel, use_container_width=False)
+        hm_sel = heatmap.cached("sharpe_rank", ("category", sel), SNAPSHOT,
+                                lambda: _category_tickers_spec(sel))
+        st.vega_lite_chart(hm_sel, use_container_width=False)
 
 # -------------------------
 # Footer disclaimer
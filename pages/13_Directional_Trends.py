@@ -6,10 +6,14 @@ import base64
 import pandas as pd
 import numpy as np
 import streamlit as st
-from urllib.parse import quote_plus
+from markmentum.facts import load_facts
+from markmentum.regimes import regime_labels
+from markmentum.registry import shared_cache
+from markmentum.snapshot import snapshot_version
+from markmentum.tables import fmt_percent, frame_table_html, ticker_links
+from markmentum.tints import diverging, tint_cells
 
 # ---------- Page ----------
-st.cache_data.clear()
 st.set_page_config(page_title="Trends & Changes", layout="wide")
 
 # -------------------------
@@ -19,10 +23,11 @@ _here = Path(__file__).resolve().parent
 APP_DIR = _here if _here.name != "pages" else _here.parent
 
 DATA_DIR   = APP_DIR / "data"
+SNAPSHOT = snapshot_version(DATA_DIR)   # data version, part of every cache key
 ASSETS_DIR = APP_DIR / "assets"
 LOGO_PATH  = ASSETS_DIR / "markmentum_logo.png"
 
-CSV_PATH = DATA_DIR / "qry_graph_data_88.csv"   # <-- single source file for this page
+# source: qry_graph_data_88.csv, read as columns of the latest-snapshot fact table (markmentum.facts)
 
 # -------------------------
 # Header: logo centered
@@ -41,17 +46,7 @@ if LOGO_PATH.exists():
         unsafe_allow_html=True,
     )
 
-# --- Clickable Deep Dive helper & router (same UX as Performance page)
-def _mk_ticker_link(ticker: str) -> str:
-    t = (ticker or "").strip().upper()
-    if not t:
-        return ""
-    return (
-        f'<a href="?page=Deep%20Dive&ticker={quote_plus(t)}" '
-        f'target="_self" rel="noopener" '
-        f'style="text-decoration:none; font-weight:600;">{t}</a>'
-    )
-
+# --- Deep Dive link router (same UX as Performance page)
 qp = st.query_params
 dest = (qp.get("page") or "").strip().lower()
 if dest.replace("%20", " ") == "deep dive":
@@ -74,59 +69,30 @@ def fmt_pct_1(x):
     except Exception:
         return ""
 
-def tint_cell(val, cap=0.03, neutral=0.0005):
+def tint_cell(values, cap=0.03, neutral=0.0005):
     """
-    val: decimal (e.g., 0.012 = 1.2%)
+    values: decimals (e.g., 0.012 = 1.2%)
     cap: magnitude where tint reaches full strength (default 3%)
     neutral: +/- band rendered as no tint (default 0.05%)
     """
-    if val is None or pd.isna(val):
-        return ""
-    try:
-        v = float(val)
-    except Exception:
-        return ""
-
-    # Neutral band (very small values look untinted)
-    if -neutral <= v <= neutral:
-        bg = "transparent"
-    else:
-        # Scale opacity by magnitude, capped
-        strength = min(abs(v) / cap, 1.0)     # 0..1
-        alpha = 0.15 + 0.35 * strength        # 0.15..0.50
-        if v > 0:
-            bg = f"rgba(16,185,129,{alpha:.2f})"   # green
-        else:
-            bg = f"rgba(239,68,68,{alpha:.2f})"    # red
-
-    return (
-        f'<span style="display:block; background:{bg}; '
-        f'padding:0 6px; border-radius:3px; text-align:right;">{v*100:,.1f}%</span>'
-    )
+    scale = diverging(cap, base=0.15, span=0.35, neutral=neutral, digits=2)   # 0.15..0.50 opacity
+    return tint_cells(values, scale, fmt_percent(values, 1), pad=6, radius=3, align_right=True)
 
 # -------------------------
 # Load source
 # -------------------------
-@st.cache_data(show_spinner=False)
-def load_csv(p: Path) -> pd.DataFrame:
-    if not p.exists():
-        return pd.DataFrame()
-    df = pd.read_csv(p)
-    required = [
-        "Date","Ticker","Ticker_name","Category",
-        "st_trend","mt_trend","lt_trend",
-        "st_trend_change","mt_trend_change","lt_trend_change",
-    ]
+@shared_cache
+def load_trends(snapshot: str) -> pd.DataFrame:
+    # qry_graph_data_88 columns of the latest-snapshot fact table (one row per ticker)
+    trend_cols = ["st_trend","mt_trend","lt_trend",
+                  "st_trend_change","mt_trend_change","lt_trend_change"]
+    required = ["Date","Ticker","Ticker_name","Category", *trend_cols]
+    df = load_facts(DATA_DIR, snapshot, required)
     if not all(c in df.columns for c in required):
         return pd.DataFrame()
+    return df.dropna(subset=trend_cols, how="all")
 
-    # numeric hygiene
-    for c in ["st_trend","mt_trend","lt_trend",
-              "st_trend_change","mt_trend_change","lt_trend_change"]:
-        df[c] = pd.to_numeric(df[c], errors="coerce")
-    return df
-
-df = load_csv(CSV_PATH)
+df = load_trends(SNAPSHOT)
 
 # ---- Page title (under logo) pulled from source Date ----
 date_str = ""
@@ -145,26 +111,6 @@ st.markdown(
     unsafe_allow_html=True,
 )
 
-# --- Module 2 comment label (ST/MT/LT alignment + changes)
-def m2_label(st, mt, lt, stc, mtc):
-    vals = [st, mt, lt, stc, mtc]
-    if any(pd.isna(v) for v in vals):
-        return "Insufficient data"
-    try:
-        st, mt, lt, stc, mtc = map(float, vals)
-    except Exception:
-        return "Insufficient data"
-
-    if st < mt < lt and stc > 0 and mtc > 0:
-        return "Bullish Alignment · Improving"
-    if st > mt > lt:
-        return "Bearish Alignment"
-    if st < mt < lt and (stc <= 0 or mtc <= 0):
-        return "Bullish Alignment · Waiting"
-    return "Converging / Mixed"
-
-
-
 # ---------- Shared CSS (compass-style card) ----------
 st.markdown("""
 <style>
@@ -217,49 +163,28 @@ macro_list = [
 if df.empty:
     st.info("`qry_graph_data_88.csv` missing or columns incomplete.")
 else:
-    # keep only the latest row per ticker (in case CSV has multiple dates)
-    df["_dt"] = pd.to_datetime(df["Date"], errors="coerce")
-    latest = (
-        df.sort_values(["Ticker", "_dt"], ascending=[True, False])
-          .drop_duplicates(subset=["Ticker"], keep="first")
-    )
+    latest = df   # one row per ticker (fact table)
 
     m = latest[latest["Ticker"].isin(macro_list)].copy()
-    m["__ord__"] = m["Ticker"].map({t:i for i, t in enumerate(macro_list)})
+    m["__ord__"] = m["Ticker"].astype(str).map({t:i for i, t in enumerate(macro_list)})
     m = m.sort_values("__ord__", kind="stable")
 
-    m["Ticker_link"] = m["Ticker"].map(_mk_ticker_link)
+    m["Ticker_link"] = ticker_links(m["Ticker"])
 
     macro_tbl = pd.DataFrame({
         "Name":        m["Ticker_name"],
         "Ticker":      m["Ticker_link"],
-        "ST":          [tint_cell(v) for v in m["st_trend"]],
-        "MT":          [tint_cell(v) for v in m["mt_trend"]],
-        "LT":          [tint_cell(v) for v in m["lt_trend"]],
-        "ST Change":   [tint_cell(v) for v in m["st_trend_change"]],
-        "MT Change":   [tint_cell(v) for v in m["mt_trend_change"]],
-        "LT Change":   [tint_cell(v) for v in m["lt_trend_change"]],
-        "Comment":     [m2_label(st, mt, lt, stc, mtc) for st, mt, lt, stc, mtc in
-                    zip(m["st_trend"], m["mt_trend"], m["lt_trend"],
-                        m["st_trend_change"], m["mt_trend_change"])],
+        "ST":          tint_cell(m["st_trend"]),
+        "MT":          tint_cell(m["mt_trend"]),
+        "LT":          tint_cell(m["lt_trend"]),
+        "ST Change":   tint_cell(m["st_trend_change"]),
+        "MT Change":   tint_cell(m["mt_trend_change"]),
+        "LT Change":   tint_cell(m["lt_trend_change"]),
+        "Comment":     regime_labels(m["st_trend"], m["mt_trend"], m["lt_trend"],
+                                     m["st_trend_change"], m["mt_trend_change"]),
     })
 
-    html_macro = macro_tbl.to_html(index=False, classes="tbl", escape=False, border=0)
-    html_macro = html_macro.replace('class="dataframe tbl"', 'class="tbl"')
-    colgroup_macro = """
-    <colgroup>
-      <col class="col-name">   <!-- Name -->
-      <col class="col-ticker"> <!-- Ticker -->
-      <col class="col-num">    <!-- ST -->
-      <col class="col-num">    <!-- MT -->
-      <col class="col-num">    <!-- LT -->
-      <col class="col-num">    <!-- ST Chg -->
-      <col class="col-num">    <!-- MT Chg -->
-      <col class="col-num">    <!-- LT Chg -->
-      <col class="col-comment"> <!-- Comment -->
-    </colgroup>
-    """.strip()
-    html_macro = html_macro.replace('<table class="tbl">', f'<table class="tbl">{colgroup_macro}', 1)
+    html_macro = frame_table_html(macro_tbl, col_classes=["col-name", "col-ticker"] + ["col-num"] * 6 + ["col-comment"])
 
     st.markdown(
         f"""
@@ -284,7 +209,7 @@ st.markdown('<div class="vspace-16"></div>', unsafe_allow_html=True)
 # Card 2 — Category Averages (Trends & Changes)
 # =========================================================
 if not df.empty:
-    g = df.groupby("Category", dropna=True, as_index=False).agg(
+    g = df.groupby("Category", dropna=True, observed=True, as_index=False).agg(
         ST=("st_trend","mean"),
         MT=("mt_trend","mean"),
         LT=("lt_trend","mean"),
@@ -302,36 +227,21 @@ if not df.empty:
         "Materials","Real Estate","Utilities","MR Discretion"
     ]
     order_map = {name: i for i, name in enumerate(preferred_order)}
-    g["__ord__"] = g["Category"].map(order_map)
+    g["__ord__"] = g["Category"].astype(str).map(order_map)
     g = g.sort_values(["__ord__", "Category"], kind="stable").drop(columns="__ord__")
 
     cat_tbl = pd.DataFrame({
         "Name":       g["Category"],
-        "ST":         [tint_cell(v) for v in g["ST"]],
-        "MT":         [tint_cell(v) for v in g["MT"]],
-        "LT":         [tint_cell(v) for v in g["LT"]],
-        "ST Change":  [tint_cell(v) for v in g["ST_Change"]],
-        "MT Change":  [tint_cell(v) for v in g["MT_Change"]],
-        "LT Change":  [tint_cell(v) for v in g["LT_Change"]],
-        "Comment":    [m2_label(st, mt, lt, stc, mtc) for st, mt, lt, stc, mtc in
-                   zip(g["ST"], g["MT"], g["LT"], g["ST_Change"], g["MT_Change"])],
+        "ST":         tint_cell(g["ST"]),
+        "MT":         tint_cell(g["MT"]),
+        "LT":         tint_cell(g["LT"]),
+        "ST Change":  tint_cell(g["ST_Change"]),
+        "MT Change":  tint_cell(g["MT_Change"]),
+        "LT Change":  tint_cell(g["LT_Change"]),
+        "Comment":    regime_labels(g["ST"], g["MT"], g["LT"], g["ST_Change"], g["MT_Change"]),
     })
 
-    html_cat = cat_tbl.to_html(index=False, classes="tbl", escape=False, border=0)
-    html_cat = html_cat.replace('class="dataframe tbl"', 'class="tbl"')
-    colgroup_cat = """
-    <colgroup>
-      <col class="col-name">   <!-- Name -->
-      <col class="col-num">    <!-- ST -->
-      <col class="col-num">    <!-- MT -->
-      <col class="col-num">    <!-- LT -->
-      <col class="col-num">    <!-- ST Chg -->
-      <col class="col-num">    <!-- MT Chg -->
-      <col class="col-num">    <!-- LT Chg -->
-      <col class="col-comment"> <!-- Comment -->
-    </colgroup>
-    """.strip()
-    html_cat = html_cat.replace('<table class="tbl">', f'<table class="tbl">{colgroup_cat}', 1)
+    html_cat = frame_table_html(cat_tbl, col_classes=["col-name"] + ["col-num"] * 6 + ["col-comment"])
 
     st.markdown(
         f"""
@@ -363,44 +273,22 @@ if not df.empty:
         sel = st.selectbox("Category", cats_present, index=(cats_present.index(default_cat) if default_cat else 0))
 
     d = df.loc[df["Category"] == sel].copy()
-    # latest per ticker (if multiple dates)
-    d = (
-        d.sort_values(["Ticker", "_dt"], ascending=[True, False])
-         .drop_duplicates(subset=["Ticker"], keep="first")
-         if "_dt" in d.columns else d
-    )
-    d["Ticker_link"] = d["Ticker"].map(_mk_ticker_link)
+    d["Ticker_link"] = ticker_links(d["Ticker"])
 
     per_tbl = pd.DataFrame({
         "Name":        d["Ticker_name"],
         "Ticker":      d["Ticker_link"],
-        "ST":          [tint_cell(v) for v in d["st_trend"]],
-        "MT":          [tint_cell(v) for v in d["mt_trend"]],
-        "LT":          [tint_cell(v) for v in d["lt_trend"]],
-        "ST Change":   [tint_cell(v) for v in d["st_trend_change"]],
-        "MT Change":   [tint_cell(v) for v in d["mt_trend_change"]],
-        "LT Change":   [tint_cell(v) for v in d["lt_trend_change"]],
-        "Comment":     [m2_label(st, mt, lt, stc, mtc) for st, mt, lt, stc, mtc in
-                    zip(d["st_trend"], d["mt_trend"], d["lt_trend"],
-                        d["st_trend_change"], d["mt_trend_change"])],
+        "ST":          tint_cell(d["st_trend"]),
+        "MT":          tint_cell(d["mt_trend"]),
+        "LT":          tint_cell(d["lt_trend"]),
+        "ST Change":   tint_cell(d["st_trend_change"]),
+        "MT Change":   tint_cell(d["mt_trend_change"]),
+        "LT Change":   tint_cell(d["lt_trend_change"]),
+        "Comment":     regime_labels(d["st_trend"], d["mt_trend"], d["lt_trend"],
+                                     d["st_trend_change"], d["mt_trend_change"]),
     })
 
-    html_per = per_tbl.to_html(index=False, classes="tbl", escape=False, border=0)
-    html_per = html_per.replace('class="dataframe tbl"', 'class="tbl"')
-    colgroup_per = """
-    <colgroup>
-      <col class="col-name">   <!-- Name -->
-      <col class="col-ticker"> <!-- Ticker -->
-      <col class="col-num">    <!-- ST -->
-      <col class="col-num">    <!-- MT -->
-      <col class="col-num">    <!-- LT -->
-      <col class="col-num">    <!-- ST Chg -->
-      <col class="col-num">    <!-- MT Chg -->
-      <col class="col-num">    <!-- LT Chg -->
-      <col class="col-comment"> <!-- Comment -->
-    </colgroup>
-    """.strip()
-    html_per = html_per.replace('<table class="tbl">', f'<table class="tbl">{colgroup_per}', 1)
+    html_per = frame_table_html(per_tbl, col_classes=["col-name", "col-ticker"] + ["col-num"] * 6 + ["col-comment"])
 
     st.markdown(
         f"""
@@ -10,10 +10,12 @@ import streamlit as st
 import sys
 import numpy as np
 from urllib.parse import quote_plus
+from markmentum.store import read_table
+from markmentum.registry import shared_cache
+from markmentum.snapshot import snapshot_version
+from markmentum.search import TickerSearch
 import os
 
-st.cache_data.clear()
-
 # -------------------------
 # Page & shared style
 # -------------------------
@@ -56,6 +58,7 @@ _here = Path(__file__).resolve().parent
 APP_DIR = _here if _here.name != "pages" else _here.parent
 
 DATA_DIR  = APP_DIR / "data"
+SNAPSHOT = snapshot_version(DATA_DIR)   # data version, part of every cache key
 ASSETS_DIR = APP_DIR / "assets"
 LOGO_PATH  = ASSETS_DIR / "markmentum_logo.png"
 
@@ -78,13 +81,13 @@ if LOGO_PATH.exists():
 
 # === Universe – All Instruments (index hidden + fixed % formatting) ===
 
-@st.cache_data(ttl=600)
-def load_universe(csv_path: Path) -> pd.DataFrame:
+@shared_cache
+def load_universe(csv_path: Path, snapshot: str) -> pd.DataFrame:
     if not csv_path.exists():
         st.error("Could not find ticker_data.csv. Place it in ./data or the working directory.")
         st.stop()
 
-    df = pd.read_csv(csv_path)
+    df = read_table(csv_path)
 
     expected = [
         "Ticker", "Ticker_name", "Category", "Date", "Close",
@@ -115,7 +118,12 @@ def load_universe(csv_path: Path) -> pd.DataFrame:
     # stable ordering
     return df.sort_values(["Category", "Ticker"], kind="mergesort").reset_index(drop=True)
 
-df = load_universe(CSV_PATH)
+@st.cache_resource(show_spinner=False, max_entries=1)
+def load_universe_search(csv_path: Path, snapshot: str) -> TickerSearch:
+    # row positions line up with load_universe's (deterministic) ordering; current snapshot only
+    return TickerSearch.from_frame(load_universe(csv_path, snapshot), "Ticker", "Name")
+
+df = load_universe(CSV_PATH, SNAPSHOT)
 
 st.markdown(
     '<h2 style="text-align:center; margin:0.25rem 0 0.5rem;">Universe – All Instruments</h2>',
@@ -140,13 +148,10 @@ with center:
         else:
             st.caption("Last updated: —")
 
-    # Filter the view based on the query
-    if q:
-        ql = q.strip().lower()
-        view = df[
-            df["Ticker"].str.lower().str.contains(ql, na=False)
-            | df["Name"].str.lower().str.contains(ql, na=False)
-        ].copy()
+    # Filter the view based on the query, best matches first
+    # (exact > prefix > substring > fuzzy, see markmentum.search)
+    if q and q.strip():
+        view = df.iloc[load_universe_search(CSV_PATH, SNAPSHOT).search(q)].copy()
     else:
         view = df.copy()
 
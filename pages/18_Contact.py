@@ -12,7 +12,6 @@ import numpy as np
 from urllib.parse import quote_plus
 import os
 
-st.cache_data.clear()
 # 13_Contact.py (or wherever your Contact page lives)
 #import streamlit as st
 import requests